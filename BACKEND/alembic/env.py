@@ -7,7 +7,7 @@ from alembic import context
 from app.models import (
     Base, Users, Files, ProjectNote,
     Asset, ConditionEntry, Unit, AssetEquipment, AssetDocument, CostEvent,
-    ActivityLog,
+    ActivityLog, DocumentText,
 )
 from app.database import engine
 import os
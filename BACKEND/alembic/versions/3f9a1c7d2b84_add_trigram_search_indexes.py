@@ -0,0 +1,51 @@
+"""add trigram search indexes
+
+Revision ID: 3f9a1c7d2b84
+Revises: ec5288bb099b
+Create Date: 2026-10-19 09:12:41.530218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7d2b84'
+down_revision: Union[str, None] = 'ec5288bb099b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, column) backing the typeahead lookups
+TRIGRAM_INDEXES = [
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_users_fullname_trgm', 'users', 'fullname'),
+    ('ix_assets_name_trgm', 'assets', 'name'),
+    ('ix_assets_registry_number_trgm', 'assets', 'registry_number'),
+]
+
+
+def upgrade() -> None:
+    # Trigram indexes are PostgreSQL-only; other engines use the in-process
+    # prefix index in app/services/typeahead.py.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, table, _ in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
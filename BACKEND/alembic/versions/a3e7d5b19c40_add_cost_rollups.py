@@ -0,0 +1,70 @@
+"""add cost rollups
+
+Revision ID: a3e7d5b19c40
+Revises: f4a9c2d8e613
+Create Date: 2026-10-19 19:21:08.447615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7d5b19c40'
+down_revision: Union[str, None] = 'f4a9c2d8e613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTH_EXPRESSIONS = {
+    'postgresql': "date_trunc('month', date)::date",
+    'sqlite': "date(date, 'start of month')",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Reuse the enum type created for cost_events
+        category = postgresql.ENUM(name='costcategory', create_type=False)
+    else:
+        category = sa.Enum(
+            'PROPERTY_TAX', 'MAINTENANCE_AND_REPAIR', 'RENOVATION', 'INSURANCE_PREMIUM', 'OTHER',
+            name='costcategory',
+        )
+
+    # The app also creates the table from the model at startup
+    op.create_table(
+        'cost_rollups',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('asset_id', sa.Integer(), sa.ForeignKey('assets.id'), nullable=False),
+        sa.Column('category', category, nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('total', sa.Numeric(15, 2), nullable=False),
+        sa.Column('event_count', sa.Integer(), nullable=False),
+        sa.UniqueConstraint('asset_id', 'category', 'month'),
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_cost_rollups_month_category', 'cost_rollups', ['month', 'category'],
+        if_not_exists=True,
+    )
+
+    # Backfill from the existing events; a full recompute, so rerunning is safe
+    month = MONTH_EXPRESSIONS.get(bind.dialect.name)
+    if month is None:
+        return
+    op.execute("DELETE FROM cost_rollups")
+    op.execute(
+        "INSERT INTO cost_rollups (asset_id, category, month, total, event_count) "
+        f"SELECT asset_id, category, {month}, sum(amount), count(id) "
+        f"FROM cost_events GROUP BY asset_id, category, {month}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cost_rollups_month_category', table_name='cost_rollups', if_exists=True)
+    op.drop_table('cost_rollups', if_exists=True)
@@ -0,0 +1,88 @@
+"""add asset summary columns
+
+Revision ID: a5c1e8d4b7f2
+Revises: e7b3d9a2f184
+Create Date: 2026-10-19 23:31:52.118406
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c1e8d4b7f2'
+down_revision: Union[str, None] = 'e7b3d9a2f184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNT_COLUMNS = ('unit_count', 'occupied_unit_count', 'equipment_count', 'document_count')
+
+INDEXES = {
+    'ix_assets_unit_count_id': ['unit_count', 'id'],
+    'ix_assets_occupied_unit_count_id': ['occupied_unit_count', 'id'],
+    'ix_assets_document_count_id': ['document_count', 'id'],
+    'ix_assets_costs_ytd_id': ['costs_ytd', 'id'],
+    'ix_assets_latest_condition_created_at_id': ['latest_condition', 'created_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Reuse the enum type created for condition_entries
+        rating = postgresql.ENUM(name='conditionrating', create_type=False)
+    else:
+        rating = sa.Enum('GOOD', 'FAIR', 'POOR', 'CRITICAL', name='conditionrating')
+
+    # The app's create_all already adds the columns to a fresh database
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('assets')}
+    new_columns = [
+        *(sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in COUNT_COLUMNS),
+        sa.Column('latest_condition', rating, nullable=True),
+        sa.Column('latest_condition_date', sa.Date(), nullable=True),
+        sa.Column('costs_ytd', sa.Numeric(15, 2), nullable=False, server_default='0'),
+        sa.Column('costs_ytd_year', sa.Integer(), nullable=True),
+    ]
+    for column in new_columns:
+        if column.name not in columns:
+            op.add_column('assets', column)
+
+    for name, index_columns in INDEXES.items():
+        op.create_index(name, 'assets', index_columns, if_not_exists=True)
+    op.create_index(
+        'ix_condition_entries_asset_id_date_id', 'condition_entries', ['asset_id', 'date', 'id'],
+        if_not_exists=True,
+    )
+
+    # Backfill from the child tables; a full recompute, so rerunning is safe
+    year = datetime.utcnow().year
+    latest = (
+        "(SELECT c.{column} FROM condition_entries c WHERE c.asset_id = assets.id "
+        "ORDER BY c.date DESC, c.id DESC LIMIT 1)"
+    )
+    op.execute(
+        "UPDATE assets SET "
+        "unit_count = (SELECT count(*) FROM units u WHERE u.asset_id = assets.id), "
+        "occupied_unit_count = (SELECT count(*) FROM units u "
+        "WHERE u.asset_id = assets.id AND u.status = 'TENANTED'), "
+        "equipment_count = (SELECT count(*) FROM asset_equipment e WHERE e.asset_id = assets.id), "
+        "document_count = (SELECT count(*) FROM asset_documents d WHERE d.asset_id = assets.id), "
+        f"latest_condition = {latest.format(column='rating')}, "
+        f"latest_condition_date = {latest.format(column='date')}, "
+        "costs_ytd = COALESCE((SELECT sum(e.amount) FROM cost_events e WHERE e.asset_id = assets.id "
+        f"AND e.date >= '{year}-01-01' AND e.date < '{year + 1}-01-01'), 0), "
+        f"costs_ytd_year = {year}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_condition_entries_asset_id_date_id', table_name='condition_entries', if_exists=True)
+    for name in INDEXES:
+        op.drop_index(name, table_name='assets', if_exists=True)
+    for name in (*COUNT_COLUMNS, 'latest_condition', 'latest_condition_date', 'costs_ytd', 'costs_ytd_year'):
+        op.drop_column('assets', name)
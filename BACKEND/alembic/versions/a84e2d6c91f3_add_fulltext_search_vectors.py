@@ -0,0 +1,70 @@
+"""add full-text search vectors
+
+Revision ID: a84e2d6c91f3
+Revises: 3f9a1c7d2b84
+Create Date: 2026-10-19 10:03:17.482951
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a84e2d6c91f3'
+down_revision: Union[str, None] = '3f9a1c7d2b84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _weighted(weight: str, *columns: str) -> str:
+    joined = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+    return f"setweight(to_tsvector('english', {joined}), '{weight}')"
+
+
+# Generated columns keep the vectors in step with every write. The column lists
+# match SearchEntity.text_columns in app/services/fulltext.py.
+SEARCH_VECTORS = {
+    'assets': " || ".join([
+        _weighted('A', 'name', 'registry_number'),
+        _weighted('B', 'street', 'parish', 'owner_name'),
+        _weighted('C', 'comments'),
+    ]),
+    'project_notes': " || ".join([
+        _weighted('A', 'title'),
+        _weighted('B', 'description'),
+    ]),
+    'files': " || ".join([
+        _weighted('A', 'filename'),
+        _weighted('B', 'document_type'),
+    ]),
+    'asset_documents': _weighted('A', 'name'),
+    'cost_events': _weighted('A', 'description'),
+}
+
+
+def upgrade() -> None:
+    # tsvector is PostgreSQL-only; other engines use the ILIKE fallback.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'],
+            postgresql_using='gin',
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table in SEARCH_VECTORS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table, if_exists=True)
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,35 @@
+"""add asset detail docs
+
+Revision ID: b6d2f9e3a518
+Revises: a5c1e8d4b7f2
+Create Date: 2026-10-20 00:12:37.640915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d2f9e3a518'
+down_revision: Union[str, None] = 'a5c1e8d4b7f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app also creates the table from the model at startup. Documents are
+    # built by the app (scripts/rebuild_asset_details.py); until an asset has
+    # one, its detail view is built per request.
+    op.create_table(
+        'asset_detail_docs',
+        sa.Column('asset_id', sa.Integer(), sa.ForeignKey('assets.id'), primary_key=True),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('built_at', sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('asset_detail_docs', if_exists=True)
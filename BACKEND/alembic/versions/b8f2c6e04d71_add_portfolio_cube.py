@@ -0,0 +1,72 @@
+"""add portfolio cube
+
+Revision ID: b8f2c6e04d71
+Revises: a3e7d5b19c40
+Create Date: 2026-10-19 20:37:55.106283
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f2c6e04d71'
+down_revision: Union[str, None] = 'a3e7d5b19c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ASSET_TYPES = (
+    'RESIDENTIAL', 'COMMERCIAL', 'INDUSTRIAL', 'LAND', 'MIXED_USE', 'VEHICLE',
+    'EQUIPMENT_ASSET', 'OTHER',
+)
+ASSET_STATUSES = (
+    'OWNED', 'MORTGAGED', 'TENANTED', 'VACANT', 'UNDER_RENOVATION', 'LISTED_FOR_SALE',
+    'DISPOSED', 'ACTIVE', 'IN_MAINTENANCE',
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Reuse the enum types created for assets
+        asset_type = postgresql.ENUM(name='assettype', create_type=False)
+        asset_status = postgresql.ENUM(name='assetstatus', create_type=False)
+    else:
+        asset_type = sa.Enum(*ASSET_TYPES, name='assettype')
+        asset_status = sa.Enum(*ASSET_STATUSES, name='assetstatus')
+
+    # The app also creates the table from the model at startup
+    op.create_table(
+        'portfolio_cube',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('parish', sa.String(), nullable=False),
+        sa.Column('type', asset_type, nullable=False),
+        sa.Column('status', asset_status, nullable=False),
+        sa.Column('owner', sa.String(), nullable=False),
+        sa.Column('asset_count', sa.Integer(), nullable=False),
+        sa.Column('portfolio_value', sa.Numeric(18, 2), nullable=False),
+        sa.Column('mortgage_balance', sa.Numeric(18, 2), nullable=False),
+        sa.Column('rental_income', sa.Numeric(18, 2), nullable=False),
+        sa.UniqueConstraint('parish', 'type', 'status', 'owner'),
+        if_not_exists=True,
+    )
+
+    # Backfill from the existing assets; a full recompute, so rerunning is safe
+    op.execute("DELETE FROM portfolio_cube")
+    op.execute(
+        "INSERT INTO portfolio_cube (parish, type, status, owner, asset_count, "
+        "portfolio_value, mortgage_balance, rental_income) "
+        "SELECT parish, type, status, coalesce(owner_name, ''), count(id), "
+        "coalesce(sum(purchase_price), 0), "
+        "coalesce(sum(CASE WHEN has_mortgage THEN mortgage_balance END), 0), "
+        "coalesce(sum(CASE WHEN has_rental THEN rental_monthly_income END), 0) "
+        "FROM assets GROUP BY parish, type, status, coalesce(owner_name, '')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('portfolio_cube', if_exists=True)
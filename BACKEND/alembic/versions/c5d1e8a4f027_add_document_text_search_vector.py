@@ -0,0 +1,43 @@
+"""add document text search vector
+
+Revision ID: c5d1e8a4f027
+Revises: a84e2d6c91f3
+Create Date: 2026-10-19 11:26:52.901374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d1e8a4f027'
+down_revision: Union[str, None] = 'a84e2d6c91f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The document_texts table itself is created from the model; this adds the
+    # PostgreSQL-only search vector used by app/services/fulltext.py.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        "ALTER TABLE document_texts ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED"
+    )
+    op.create_index(
+        'ix_document_texts_search_vector', 'document_texts', ['search_vector'],
+        postgresql_using='gin',
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_document_texts_search_vector', table_name='document_texts', if_exists=True)
+    op.execute("ALTER TABLE document_texts DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,30 @@
+"""add mortgage interest rate
+
+Revision ID: c9e4a1f7b352
+Revises: b8f2c6e04d71
+Create Date: 2026-10-19 21:14:08.530927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a1f7b352'
+down_revision: Union[str, None] = 'b8f2c6e04d71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's create_all already adds the column to a fresh database
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('assets')}
+    if 'mortgage_interest_rate' not in columns:
+        # Annual rate in percent; NULL falls back to the portfolio default
+        op.add_column('assets', sa.Column('mortgage_interest_rate', sa.Numeric(7, 4), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('assets', 'mortgage_interest_rate')
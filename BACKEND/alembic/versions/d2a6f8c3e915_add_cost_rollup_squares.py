@@ -0,0 +1,50 @@
+"""add cost rollup squares
+
+Revision ID: d2a6f8c3e915
+Revises: c9e4a1f7b352
+Create Date: 2026-10-19 22:02:41.376518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6f8c3e915'
+down_revision: Union[str, None] = 'c9e4a1f7b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MONTH_EXPRESSIONS = {
+    'postgresql': "date_trunc('month', e.date)::date",
+    'sqlite': "date(e.date, 'start of month')",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # The app's create_all already adds the column to a fresh database
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('cost_rollups')}
+    if 'total_squares' not in columns:
+        op.add_column(
+            'cost_rollups',
+            sa.Column('total_squares', sa.Numeric(30, 4), nullable=False, server_default='0'),
+        )
+
+    # Backfill from the existing events
+    month = MONTH_EXPRESSIONS.get(bind.dialect.name)
+    if month is None:
+        return
+    op.execute(
+        "UPDATE cost_rollups SET total_squares = COALESCE(("
+        "SELECT sum(e.amount * e.amount) FROM cost_events e "
+        "WHERE e.asset_id = cost_rollups.asset_id AND e.category = cost_rollups.category "
+        f"AND {month} = cost_rollups.month), 0)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('cost_rollups', 'total_squares')
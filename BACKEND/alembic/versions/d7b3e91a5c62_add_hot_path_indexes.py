@@ -0,0 +1,73 @@
+"""add hot path indexes
+
+Revision ID: d7b3e91a5c62
+Revises: c5d1e8a4f027
+Create Date: 2026-10-19 14:02:17.530118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3e91a5c62'
+down_revision: Union[str, None] = 'c5d1e8a4f027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) for the listing and lookup queries
+INDEXES = [
+    ('ix_files_user_id_created_at', 'files', ['user_id', 'created_at']),
+    ('ix_files_created_at', 'files', ['created_at']),
+    ('ix_files_filename_user_id', 'files', ['filename', 'user_id']),
+    ('ix_activity_log_created_at', 'activity_log', ['created_at']),
+    ('ix_activity_log_event_type_created_at', 'activity_log', ['event_type', 'created_at']),
+    ('ix_cost_events_asset_id_date', 'cost_events', ['asset_id', 'date']),
+    ('ix_cost_events_date', 'cost_events', ['date']),
+]
+
+# Written on every insert but never used to look anything up
+UNUSED_USER_INDEXES = [
+    ('ix_users_password', ['password']),
+    ('ix_users_fullname', ['fullname']),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    duplicates = bind.execute(sa.text(
+        "SELECT email FROM users GROUP BY email HAVING count(*) > 1"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "Cannot make users.email unique; resolve duplicate accounts first: "
+            + ", ".join(duplicates)
+        )
+
+    # The table may already carry the unique index if it was created from the
+    # models, so only swap it when the existing one is not unique.
+    existing = {ix['name']: ix for ix in sa.inspect(bind).get_indexes('users')}
+    if not existing.get('ix_users_email', {}).get('unique'):
+        op.drop_index('ix_users_email', table_name='users', if_exists=True)
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    for name, _ in UNUSED_USER_INDEXES:
+        op.drop_index(name, table_name='users', if_exists=True)
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    for name, columns in UNUSED_USER_INDEXES:
+        op.create_index(name, 'users', columns, if_not_exists=True)
+
+    op.drop_index('ix_users_email', table_name='users', if_exists=True)
+    op.create_index('ix_users_email', 'users', ['email'])
@@ -0,0 +1,48 @@
+"""add keyset pagination indexes
+
+Revision ID: e2c8f4a67d19
+Revises: d7b3e91a5c62
+Create Date: 2026-10-19 15:48:03.214507
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c8f4a67d19'
+down_revision: Union[str, None] = 'd7b3e91a5c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Sort-key indexes gain a trailing id so a cursor page is one range scan:
+# (table, old name, old columns, new name, new columns)
+REPLACEMENTS = [
+    ('files', 'ix_files_user_id_created_at', ['user_id', 'created_at'],
+     'ix_files_user_id_created_at_id', ['user_id', 'created_at', 'id']),
+    ('files', 'ix_files_created_at', ['created_at'],
+     'ix_files_created_at_id', ['created_at', 'id']),
+    ('activity_log', 'ix_activity_log_created_at', ['created_at'],
+     'ix_activity_log_created_at_id', ['created_at', 'id']),
+    ('activity_log', 'ix_activity_log_event_type_created_at', ['event_type', 'created_at'],
+     'ix_activity_log_event_type_created_at_id', ['event_type', 'created_at', 'id']),
+    ('cost_events', 'ix_cost_events_asset_id_date', ['asset_id', 'date'],
+     'ix_cost_events_asset_id_date_id', ['asset_id', 'date', 'id']),
+    ('cost_events', 'ix_cost_events_date', ['date'],
+     'ix_cost_events_date_id', ['date', 'id']),
+]
+
+
+def upgrade() -> None:
+    for table, old_name, _, new_name, new_columns in REPLACEMENTS:
+        op.create_index(new_name, table, new_columns, if_not_exists=True)
+        op.drop_index(old_name, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    for table, old_name, old_columns, new_name, _ in REPLACEMENTS:
+        op.create_index(old_name, table, old_columns, if_not_exists=True)
+        op.drop_index(new_name, table_name=table, if_exists=True)
@@ -0,0 +1,34 @@
+"""add upcoming event indexes
+
+Revision ID: e7b3d9a2f184
+Revises: d2a6f8c3e915
+Create Date: 2026-10-19 22:48:17.204631
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3d9a2f184'
+down_revision: Union[str, None] = 'd2a6f8c3e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_assets_rental_lease_end_id', 'assets', ['rental_lease_end', 'id'],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_asset_equipment_next_service_due_id', 'asset_equipment', ['next_service_due', 'id'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_asset_equipment_next_service_due_id', table_name='asset_equipment', if_exists=True)
+    op.drop_index('ix_assets_rental_lease_end_id', table_name='assets', if_exists=True)
@@ -0,0 +1,40 @@
+"""add asset listing indexes
+
+Revision ID: f4a9c2d8e613
+Revises: e2c8f4a67d19
+Create Date: 2026-10-19 18:06:41.820394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9c2d8e613'
+down_revision: Union[str, None] = 'e2c8f4a67d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, columns) on assets for the listing's sort orders and filters
+INDEXES = [
+    ('ix_assets_created_at_id', ['created_at', 'id']),
+    ('ix_assets_updated_at_id', ['updated_at', 'id']),
+    ('ix_assets_name_id', ['name', 'id']),
+    ('ix_assets_type_created_at_id', ['type', 'created_at', 'id']),
+    ('ix_assets_status_created_at_id', ['status', 'created_at', 'id']),
+    ('ix_assets_parish_created_at_id', ['parish', 'created_at', 'id']),
+    ('ix_assets_owner_name_created_at_id', ['owner_name', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, 'assets', columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='assets', if_exists=True)
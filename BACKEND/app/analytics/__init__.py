@@ -0,0 +1,8 @@
+"""
+Portfolio analytics computed with NumPy over whole-portfolio arrays.
+
+Each module loads the columns it needs in a few bulk queries, lines rows up
+by asset with ``AssetIndex`` and does the arithmetic on arrays, so the cost
+of a computation grows with the number of rows rather than the number of
+queries.
+"""
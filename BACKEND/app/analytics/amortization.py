@@ -0,0 +1,212 @@
+"""
+Mortgage amortization forecasts for every mortgaged asset at once.
+
+Balances follow the closed-form annuity recurrence
+
+    B_k = B_0 (1 + r)^k - P ((1 + r)^k - 1) / r
+
+evaluated for every asset at once, so payoff months and total interest are
+a handful of array operations rather than a loop per asset and month. The
+portfolio debt curve steps all assets forward together one month at a
+time. An asset whose payment does not cover its interest never pays off
+and reports no payoff date.
+
+Rates are annual percentages from ``Asset.mortgage_interest_rate``, falling
+back to a portfolio default. Results are cached per (default rate, horizon,
+month) until an asset route changes a mortgage field; the TTL bounds how
+long changes made through another worker go unseen. Cached results are
+computed from the primary only, never from a possibly lagging replica.
+"""
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.analytics.arrays import column, money, ratio
+from app.core.cache import ExpiringCache
+from app.models.asset import Asset
+
+# Annual percentage rate for mortgages without their own
+MORTGAGE_DEFAULT_RATE = float(os.getenv("MORTGAGE_DEFAULT_RATE", "8.0"))
+MORTGAGE_FORECAST_TTL_SECONDS = float(os.getenv("MORTGAGE_FORECAST_TTL_SECONDS", "3600"))
+
+# Longest debt curve returned, in months
+MAX_HORIZON_MONTHS = 600
+
+forecast_cache = ExpiringCache(ttl=MORTGAGE_FORECAST_TTL_SECONDS, maxsize=64)
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def invalidate():
+    global _generation
+    with _generation_lock:
+        _generation += 1
+    forecast_cache.invalidate()
+
+
+def mortgage_terms(asset: Asset) -> Tuple:
+    """The fields a forecast depends on; routes invalidate when these change."""
+    return (
+        asset.has_mortgage, asset.mortgage_balance,
+        asset.mortgage_monthly_payment, asset.mortgage_interest_rate,
+    )
+
+
+def _months_to_payoff(balance, payment, rate):
+    """Payments until the balance reaches zero; inf when it never does."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covers = payment > balance * rate
+        exact = np.where(
+            rate > 0,
+            -np.log1p(-balance * rate / payment) / np.log1p(rate),
+            balance / payment,
+        )
+        # Guard against 59.9999999 becoming 60 payments plus a zero one
+        return np.where(covers, np.ceil(exact - 1e-9), np.inf)
+
+
+def _balance_after(balance, payment, rate, months):
+    """Balance after ``months`` full payments, elementwise or broadcast."""
+    growth = (1 + rate) ** months
+    # (growth - 1) / rate, with its limit ``months`` at a zero rate
+    safe_rate = np.where(rate > 0, rate, 1.0)
+    annuity = np.where(rate > 0, (growth - 1) / safe_rate, months)
+    return balance * growth - payment * annuity
+
+
+def _debt_curve(balance, payment, rate, horizon):
+    """Portfolio balance, interest and principal for months 0..horizon.
+
+    Steps every asset forward one month per iteration: ``horizon`` array
+    operations over all assets, with no (assets x months) intermediates.
+    """
+    balances = np.empty(horizon + 1)
+    interest = np.empty(horizon)
+    current = balance.copy()
+    growth = 1 + rate
+    balances[0] = current.sum()
+    for k in range(horizon):
+        # Each payment first covers interest on the balance it starts from
+        interest[k] = (current * rate).sum()
+        current = np.maximum(current * growth - payment, 0.0)
+        balances[k + 1] = current.sum()
+    principal = balances[:-1] - balances[1:]
+    return balances, interest, principal
+
+
+def _add_months(day: date, months: np.ndarray) -> np.ndarray:
+    return (np.datetime64(day.replace(day=1), "M") + months.astype(np.int64)).astype("datetime64[D]")
+
+
+def forecast(
+    db: Session,
+    default_rate: float = MORTGAGE_DEFAULT_RATE,
+    horizon_months: int = 360,
+    today: Optional[date] = None,
+) -> Dict:
+    """Payoff dates, total interest and the portfolio debt curve.
+
+    Month 0 is the current month; payment ``k`` falls in month ``k``.
+    """
+    started = time.perf_counter()
+    today = today or datetime.utcnow().date()
+    rows = db.connection().execute(
+        select(
+            Asset.id, Asset.name, Asset.mortgage_balance,
+            Asset.mortgage_monthly_payment, Asset.mortgage_interest_rate,
+        )
+        .where(Asset.has_mortgage.is_(True), Asset.mortgage_balance > 0)
+        .order_by(Asset.id)
+    ).all()
+
+    balance = column(rows, 2)
+    payment = np.nan_to_num(column(rows, 3))
+    own_rate = column(rows, 4)
+    annual_rate = np.where(np.isnan(own_rate), default_rate, own_rate)
+    rate = annual_rate / 1200
+
+    months = _months_to_payoff(balance, payment, rate)
+    pays_off = np.isfinite(months)
+    finite_months = np.where(pays_off, months, 1.0)
+    # Full payments up to the last one, which clears what is left plus its interest
+    last_payment = _balance_after(balance, payment, rate, finite_months - 1) * (1 + rate)
+    total_interest = np.where(pays_off, payment * (finite_months - 1) + last_payment - balance, np.nan)
+    payoff_dates = _add_months(today, finite_months)
+
+    balances, interest, principal = _debt_curve(balance, payment, rate, horizon_months)
+    curve_dates = _add_months(today, np.arange(horizon_months + 1)).tolist()
+
+    payoff = [d if ok else None for d, ok in zip(payoff_dates.tolist(), pays_off)]
+    columns = {
+        "asset_id": column(rows, 0, np.int64).tolist(),
+        "name": [row.name for row in rows],
+        "balance": money(balance),
+        "monthly_payment": money(payment),
+        "interest_rate": np.round(annual_rate, 4).tolist(),
+        "rate_is_default": np.isnan(own_rate).tolist(),
+        "months_remaining": [int(m) if ok else None for m, ok in zip(months.tolist(), pays_off)],
+        "payoff_date": payoff,
+        "total_interest": ratio(total_interest, 2),
+    }
+    assets = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    curve = [
+        {
+            "month": curve_dates[k],
+            "balance": round(float(balances[k]), 2),
+            "interest": round(float(interest[k - 1]), 2) if k else 0.0,
+            "principal": round(float(principal[k - 1]), 2) if k else 0.0,
+        }
+        for k in range(horizon_months + 1)
+    ]
+    return {
+        "as_of": curve_dates[0],
+        "default_rate": default_rate,
+        "horizon_months": horizon_months,
+        "portfolio": {
+            "mortgages": len(rows),
+            "balance": round(float(balance.sum()), 2),
+            "monthly_payment": round(float(payment.sum()), 2),
+            "total_interest": round(float(np.nansum(total_interest)), 2),
+            "never_paid_off": int((~pays_off).sum()),
+            "final_payoff_date": max((d for d in payoff if d is not None), default=None),
+        },
+        "assets": assets,
+        "debt_curve": curve,
+        "compute_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+async def get_forecast(
+    db: AsyncSession,
+    default_rate: float = MORTGAGE_DEFAULT_RATE,
+    horizon_months: int = 360,
+    pinned: bool = False,
+) -> Dict:
+    """``forecast``, cached; ``db`` and ``pinned`` as for ``dashboard.get_stats``."""
+    today = datetime.utcnow().date()
+    cache_key = (default_rate, horizon_months, today.replace(day=1))
+    result = None if pinned else forecast_cache.get(cache_key)
+    if result is not None:
+        return result
+
+    generation = _generation
+    result = await db.run_sync(forecast, default_rate, horizon_months, today)
+    with _generation_lock:
+        if generation == _generation:
+            forecast_cache.set(cache_key, result)
+    return result
+
+
+__all__ = [
+    "MORTGAGE_DEFAULT_RATE", "MORTGAGE_FORECAST_TTL_SECONDS", "MAX_HORIZON_MONTHS",
+    "forecast_cache", "invalidate", "mortgage_terms", "forecast", "get_forecast",
+]
@@ -0,0 +1,229 @@
+"""
+Cost anomaly detection per asset and category.
+
+An event is scored against the events of the same asset and category in
+the trailing ``COST_ANOMALY_WINDOW_MONTHS`` months: its z-score is the
+distance from their mean in standard deviations, with the spread floored
+at a share of the mean so a history of identical bills still flags a
+spike. Events with too little history are never flagged.
+
+Both modes score an event against the events ordered before it by (date,
+id) from the first day of the window's first month, so they flag the same
+events for the same history. On insert the window's count, sum and sum of
+squares for the earlier months come from the maintained ``cost_rollups``
+rows (at most one per month) and the event's own month is summed from its
+events up to the event, so scoring costs two small indexed queries.
+``rescore`` re-scores history in bulk with cumulative sums over events
+sorted by asset, category, date and id: each event's window is a slice
+found with ``np.searchsorted``.
+"""
+import math
+import os
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.analytics.arrays import column
+from app.models.activity_log import ActivityEventType, ActivityLog, ActivityStatus
+from app.models.asset import Asset, CostCategory, CostEvent
+from app.models.cost_rollup import CostRollup
+from app.services.cost_rollups import month_start
+
+COST_ANOMALY_WINDOW_MONTHS = int(os.getenv("COST_ANOMALY_WINDOW_MONTHS", "12"))
+COST_ANOMALY_MIN_EVENTS = int(os.getenv("COST_ANOMALY_MIN_EVENTS", "5"))
+COST_ANOMALY_Z = float(os.getenv("COST_ANOMALY_Z", "3.0"))
+# Smallest spread used, as a share of the mean
+COST_ANOMALY_MIN_SPREAD = float(os.getenv("COST_ANOMALY_MIN_SPREAD", "0.1"))
+
+
+class Score(NamedTuple):
+    events: int
+    mean: float
+    z: float
+
+    @property
+    def is_anomaly(self) -> bool:
+        return self.events >= COST_ANOMALY_MIN_EVENTS and self.z >= COST_ANOMALY_Z
+
+
+def _months_back(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _z(amount: float, events, total, squares):
+    """z-scores from window counts, sums and sums of squares (scalars or arrays).
+
+    The z-score is NaN (never anomalous) for an empty window or one with no
+    spread at all, e.g. a history of zero-amount events.
+    """
+    # As an array so an empty window divides to NaN rather than raising
+    events = np.asarray(events, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / events
+        variance = np.maximum(squares / events - mean * mean, 0.0)
+        spread = np.maximum(np.sqrt(variance), np.abs(mean) * COST_ANOMALY_MIN_SPREAD)
+        return mean, np.where(spread > 0, (amount - mean) / spread, np.nan)
+
+
+def score_cost(
+    db: Session,
+    asset_id: int,
+    category: CostCategory,
+    day: date,
+    amount: Decimal,
+    event_id: Optional[int] = None,
+) -> Score:
+    """Score an event against its window; call before recording it in the rollups.
+
+    Pass ``event_id`` once the event is flushed, so only the events ordered
+    before it in its month count, as in ``rescore``; without it every event
+    of the month dated up to ``day`` does.
+    """
+    since = _months_back(day, COST_ANOMALY_WINDOW_MONTHS - 1)
+    earlier = db.execute(
+        select(
+            func.coalesce(func.sum(CostRollup.event_count), 0),
+            func.coalesce(func.sum(CostRollup.total), 0),
+            func.coalesce(func.sum(CostRollup.total_squares), 0),
+        ).where(
+            CostRollup.asset_id == asset_id,
+            CostRollup.category == category,
+            CostRollup.month >= since,
+            CostRollup.month < month_start(day),
+        )
+    ).one()
+    # The rollup for the event's own month also holds events dated after it
+    before = CostEvent.date <= day
+    if event_id is not None:
+        before = or_(CostEvent.date < day, and_(CostEvent.date == day, CostEvent.id < event_id))
+    current = db.execute(
+        select(
+            func.count(CostEvent.id),
+            func.coalesce(func.sum(CostEvent.amount), 0),
+            func.coalesce(func.sum(CostEvent.amount * CostEvent.amount), 0),
+        ).where(
+            CostEvent.asset_id == asset_id,
+            CostEvent.category == category,
+            CostEvent.date >= month_start(day),
+            before,
+        )
+    ).one()
+    events, total, squares = (float(a) + float(b) for a, b in zip(earlier, current))
+    if not events:
+        return Score(0, math.nan, math.nan)
+    mean, z = _z(float(amount), events, total, squares)
+    return Score(int(events), float(mean), float(z))
+
+
+def alert_entry(
+    asset_id: int,
+    asset_name: str,
+    category: CostCategory,
+    amount,
+    score: Score,
+    window_months: int = COST_ANOMALY_WINDOW_MONTHS,
+) -> ActivityLog:
+    """The SYSTEM_ALERT activity entry for an anomalous event."""
+    return ActivityLog(
+        event_type=ActivityEventType.SYSTEM_ALERT,
+        action=(
+            f"Unusual {category.value} cost: {amount} against the {window_months}-month "
+            f"average of {score.mean:.2f} ({score.z:.1f} standard deviations above)"
+        ),
+        target=asset_name,
+        asset_id=asset_id,
+        status=ActivityStatus.WARNING,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Batch re-scoring
+# ---------------------------------------------------------------------------
+
+def rescore(
+    db: Session,
+    asset_id: Optional[int] = None,
+    category: Optional[CostCategory] = None,
+    since: Optional[date] = None,
+    window_months: int = COST_ANOMALY_WINDOW_MONTHS,
+    z_threshold: float = COST_ANOMALY_Z,
+) -> Dict:
+    """Score every event against the events dated before it in its window.
+
+    Returns the anomalous events dated on or after ``since``, largest z first.
+    """
+    stmt = (
+        select(
+            CostEvent.id, CostEvent.asset_id, CostEvent.category, CostEvent.date,
+            CostEvent.amount, Asset.name,
+        )
+        .join(Asset, CostEvent.asset_id == Asset.id)
+        .order_by(CostEvent.asset_id, CostEvent.category, CostEvent.date, CostEvent.id)
+    )
+    if asset_id is not None:
+        stmt = stmt.where(CostEvent.asset_id == asset_id)
+    if category is not None:
+        stmt = stmt.where(CostEvent.category == category)
+    rows = db.connection().execute(stmt).all()
+    if not rows:
+        return {"window_months": window_months, "z_threshold": z_threshold, "scored": 0, "anomalies": []}
+
+    assets = column(rows, 1, np.int64)
+    categories = np.array([row.category.value for row in rows])
+    amounts = column(rows, 4)
+    months = np.array([row.date.year * 12 + row.date.month - 1 for row in rows], dtype=np.int64)
+
+    # Rows arrive sorted by group, so group ids increase along the array
+    new_group = np.ones(len(rows), dtype=bool)
+    new_group[1:] = (assets[1:] != assets[:-1]) | (categories[1:] != categories[:-1])
+    group = np.cumsum(new_group) - 1
+
+    # (group, month) as one sortable key; each window starts at the first
+    # event of its group in the window's first month
+    span = int(months.max() - months.min()) + window_months + 1
+    key = group * span + (months - months.min() + window_months)
+    position = np.arange(len(rows))
+    start = np.searchsorted(key, key - (window_months - 1), side="left")
+
+    sums = np.concatenate(([0.0], np.cumsum(amounts)))
+    squares = np.concatenate(([0.0], np.cumsum(amounts * amounts)))
+    events = position - start
+    mean, z = _z(amounts, events, sums[position] - sums[start], squares[position] - squares[start])
+
+    flagged = (events >= COST_ANOMALY_MIN_EVENTS) & (z >= z_threshold)
+    if since is not None:
+        flagged &= np.array([row.date >= since for row in rows])
+    hits = np.flatnonzero(flagged)
+    hits = hits[np.argsort(-z[hits], kind="stable")]
+
+    anomalies: List[Dict] = [
+        {
+            "cost_event_id": rows[i].id,
+            "asset_id": rows[i].asset_id,
+            "asset_name": rows[i].name,
+            "category": rows[i].category,
+            "date": rows[i].date,
+            "amount": rows[i].amount,
+            "window_events": int(events[i]),
+            "window_mean": round(float(mean[i]), 2),
+            "z": round(float(z[i]), 2),
+        }
+        for i in hits
+    ]
+    return {
+        "window_months": window_months,
+        "z_threshold": z_threshold,
+        "scored": len(rows),
+        "anomalies": anomalies,
+    }
+
+
+__all__ = [
+    "COST_ANOMALY_WINDOW_MONTHS", "COST_ANOMALY_MIN_EVENTS", "COST_ANOMALY_Z",
+    "COST_ANOMALY_MIN_SPREAD", "Score", "score_cost", "alert_entry", "rescore",
+]
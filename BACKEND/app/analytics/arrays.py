@@ -0,0 +1,63 @@
+"""
+Helpers for turning query rows into NumPy arrays aligned by asset.
+"""
+from typing import Sequence
+
+import numpy as np
+
+
+def column(rows: Sequence, index: int, dtype=np.float64) -> np.ndarray:
+    """One column of ``rows`` as an array; NULLs become NaN (floats) or 0."""
+    values = [row[index] for row in rows]
+    if np.dtype(dtype).kind == "f":
+        # NumPy converts None to NaN and Decimal through __float__
+        return np.array(values, dtype=dtype).reshape(len(rows))
+    return np.array([0 if v is None else v for v in values], dtype=dtype).reshape(len(rows))
+
+
+class AssetIndex:
+    """Maps asset ids to positions 0..n-1 so per-row values can be summed per asset."""
+
+    def __init__(self, asset_ids: np.ndarray):
+        self.ids = np.asarray(asset_ids, dtype=np.int64)
+        self._order = np.argsort(self.ids, kind="stable")
+        self._sorted = self.ids[self._order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def positions(self, asset_ids: np.ndarray) -> np.ndarray:
+        """Position of each id in ``asset_ids``; -1 for ids not in the index."""
+        asset_ids = np.asarray(asset_ids, dtype=np.int64)
+        if not len(self._sorted):
+            return np.full(len(asset_ids), -1, dtype=np.int64)
+        found = np.searchsorted(self._sorted, asset_ids)
+        found = np.clip(found, 0, len(self._sorted) - 1)
+        hit = self._sorted[found] == asset_ids
+        return np.where(hit, self._order[found], -1)
+
+    def sum(self, asset_ids: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Sum ``weights`` per asset; NaN weights count as zero."""
+        positions = self.positions(asset_ids)
+        keep = positions >= 0
+        weights = np.nan_to_num(np.asarray(weights, dtype=np.float64)[keep])
+        return np.bincount(positions[keep], weights=weights, minlength=len(self))
+
+    def count(self, asset_ids: np.ndarray, mask: np.ndarray = None) -> np.ndarray:
+        positions = self.positions(asset_ids)
+        keep = positions >= 0 if mask is None else (positions >= 0) & mask
+        return np.bincount(positions[keep], minlength=len(self))
+
+
+def money(values: np.ndarray) -> list:
+    """Round to cents for output."""
+    return np.round(values, 2).tolist()
+
+
+def ratio(values: np.ndarray, decimals: int = 4) -> list:
+    """Round for output, turning NaN (undefined ratios) into None."""
+    rounded = np.round(values, decimals)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+__all__ = ["column", "AssetIndex", "money", "ratio"]
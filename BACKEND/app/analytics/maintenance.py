@@ -0,0 +1,281 @@
+"""
+Maintenance forecasts from condition ratings and equipment service dates.
+
+Condition ratings map to scores (Good 3 down to Critical 0). Each asset's
+trend is the least-squares slope of score against time over its condition
+log, computed for every asset at once from per-asset sums; a falling
+trend, projected from the latest rating, gives the dates the asset
+reaches Poor and Critical.
+
+Equipment is due for service on its ``next_service_due`` date, or one
+service interval after its last service (or install). It is due for
+replacement at the end of an expected lifespan shortened by its current
+condition.
+
+Forecasts hold dates only, so they stay valid from day to day. They are
+cached per asset and dropped when the asset's condition log or equipment
+changes; the TTL bounds how long changes made through another worker go
+unseen.
+"""
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.analytics.arrays import AssetIndex, column
+from app.core.cache import ExpiringCache
+from app.models.asset import Asset, AssetEquipment, ConditionEntry, ConditionRating
+
+MAINTENANCE_FORECAST_TTL_SECONDS = float(os.getenv("MAINTENANCE_FORECAST_TTL_SECONDS", "3600"))
+SERVICE_INTERVAL_DAYS = int(os.getenv("SERVICE_INTERVAL_DAYS", "365"))
+EQUIPMENT_LIFESPAN_YEARS = float(os.getenv("EQUIPMENT_LIFESPAN_YEARS", "15"))
+
+CONDITION_SCORES = {
+    ConditionRating.GOOD: 3,
+    ConditionRating.FAIR: 2,
+    ConditionRating.POOR: 1,
+    ConditionRating.CRITICAL: 0,
+}
+# Share of the expected lifespan equipment in each condition lasts
+LIFESPAN_FACTORS = {
+    ConditionRating.GOOD: 1.0,
+    ConditionRating.FAIR: 0.75,
+    ConditionRating.POOR: 0.4,
+    ConditionRating.CRITICAL: 0.0,
+}
+
+# Condition projections further out than this are reported as none
+MAX_PROJECTION_YEARS = 50
+
+# Assets without condition or equipment data are cached as None
+forecast_cache = ExpiringCache(ttl=MAINTENANCE_FORECAST_TTL_SECONDS, maxsize=100_000)
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def invalidate(asset_id: int):
+    global _generation
+    with _generation_lock:
+        _generation += 1
+    forecast_cache.invalidate(asset_id)
+
+
+def _to_date(ordinal: float) -> Optional[date]:
+    return None if np.isnan(ordinal) else date.fromordinal(int(ordinal))
+
+
+def _ordinals(values: Iterable[Optional[date]]) -> np.ndarray:
+    return np.array([np.nan if d is None else d.toordinal() for d in values], dtype=np.float64)
+
+
+# ---------------------------------------------------------------------------
+# Condition trends
+# ---------------------------------------------------------------------------
+
+def _condition_forecasts(db: Session, asset_ids: Optional[List[int]]) -> Dict[int, Dict]:
+    stmt = (
+        select(ConditionEntry.asset_id, ConditionEntry.date, ConditionEntry.rating)
+        .order_by(ConditionEntry.asset_id, ConditionEntry.date, ConditionEntry.id)
+    )
+    if asset_ids is not None:
+        stmt = stmt.where(ConditionEntry.asset_id.in_(asset_ids))
+    rows = db.connection().execute(stmt).all()
+    if not rows:
+        return {}
+
+    assets = column(rows, 0, np.int64)
+    days = _ordinals(row.date for row in rows)
+    scores = np.array([CONDITION_SCORES[row.rating] for row in rows], dtype=np.float64)
+
+    # Rows are sorted by asset then date, so each asset's last row is its latest
+    last = np.flatnonzero(np.append(assets[1:] != assets[:-1], True))
+    index = AssetIndex(assets[last])
+    latest_day, latest_score = days[last], scores[last]
+
+    # Least-squares slope per asset, with time in years relative to the latest entry
+    t = (days - latest_day[index.positions(assets)]) / 365.25
+    n = index.count(assets)
+    st, sy = index.sum(assets, t), index.sum(assets, scores)
+    stt, sty = index.sum(assets, t * t), index.sum(assets, t * scores)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denominator = n * stt - st * st
+        slope = np.where((n >= 2) & (denominator > 0), (n * sty - st * sy) / denominator, np.nan)
+
+        # Years from the latest rating until the projected score reaches each level
+        falling = slope < 0
+        to_poor = np.where(falling, (latest_score - CONDITION_SCORES[ConditionRating.POOR]) / -slope, np.nan)
+        to_critical = np.where(falling, latest_score / -slope, np.nan)
+    to_poor[to_poor > MAX_PROJECTION_YEARS] = np.nan
+    to_critical[to_critical > MAX_PROJECTION_YEARS] = np.nan
+    # Levels already reached date from the latest rating itself
+    poor_by = np.where(latest_score <= 1, latest_day, latest_day + np.ceil(to_poor * 365.25))
+    critical_by = np.where(latest_score <= 0, latest_day, latest_day + np.ceil(to_critical * 365.25))
+
+    ratings = [rows[i].rating for i in last]
+    return {
+        int(asset_id): {
+            "latest_rating": ratings[i],
+            "latest_rating_date": _to_date(latest_day[i]),
+            "ratings": int(n[i]),
+            # Score change per year; negative means degrading
+            "trend_per_year": None if np.isnan(slope[i]) else round(float(slope[i]), 3),
+            "poor_by": _to_date(poor_by[i]),
+            "critical_by": _to_date(critical_by[i]),
+        }
+        for i, asset_id in enumerate(index.ids)
+    }
+
+
+# ---------------------------------------------------------------------------
+# Equipment
+# ---------------------------------------------------------------------------
+
+def _equipment_forecasts(db: Session, asset_ids: Optional[List[int]]) -> Dict[int, List[Dict]]:
+    stmt = select(
+        AssetEquipment.id, AssetEquipment.asset_id, AssetEquipment.name, AssetEquipment.condition,
+        AssetEquipment.install_date, AssetEquipment.last_service_date, AssetEquipment.next_service_due,
+    ).order_by(AssetEquipment.asset_id, AssetEquipment.id)
+    if asset_ids is not None:
+        stmt = stmt.where(AssetEquipment.asset_id.in_(asset_ids))
+    rows = db.connection().execute(stmt).all()
+    if not rows:
+        return {}
+
+    installed = _ordinals(row.install_date for row in rows)
+    serviced = _ordinals(row.last_service_date for row in rows)
+    scheduled = _ordinals(row.next_service_due for row in rows)
+    factor = np.array([LIFESPAN_FACTORS[row.condition] for row in rows], dtype=np.float64)
+
+    # First known of: the scheduled date, an interval after the last service
+    # or an interval after install
+    since_service = np.where(np.isnan(serviced), installed, serviced) + SERVICE_INTERVAL_DAYS
+    service_due = np.where(np.isnan(scheduled), since_service, scheduled)
+    replace_by = installed + np.round(EQUIPMENT_LIFESPAN_YEARS * 365.25 * factor)
+
+    forecasts: Dict[int, List[Dict]] = {}
+    for i, row in enumerate(rows):
+        forecasts.setdefault(row.asset_id, []).append({
+            "equipment_id": row.id,
+            "name": row.name,
+            "condition": row.condition,
+            "service_due": _to_date(service_due[i]),
+            "replace_by": _to_date(replace_by[i]),
+        })
+    return forecasts
+
+
+# ---------------------------------------------------------------------------
+# Forecasts
+# ---------------------------------------------------------------------------
+
+def compute(db: Session, asset_ids: Optional[List[int]] = None) -> Dict[int, Optional[Dict]]:
+    """Forecasts for ``asset_ids`` (every asset when None), None for assets without data."""
+    conditions = _condition_forecasts(db, asset_ids)
+    equipment = _equipment_forecasts(db, asset_ids)
+    keys = asset_ids if asset_ids is not None else set(conditions) | set(equipment)
+    return {
+        asset_id: (
+            {"condition": conditions.get(asset_id), "equipment": equipment.get(asset_id, [])}
+            if asset_id in conditions or asset_id in equipment else None
+        )
+        for asset_id in keys
+    }
+
+
+def _within(day: Optional[date], limit: date) -> bool:
+    return day is not None and day <= limit
+
+
+def forecast(
+    db: Session,
+    horizon_days: int = 365,
+    asset_id: Optional[int] = None,
+    today: Optional[date] = None,
+    pinned: bool = False,
+) -> Dict:
+    """Assets and equipment needing attention within ``horizon_days``.
+
+    Cached per-asset forecasts are reused; missing ones are computed in one
+    batch. ``db`` must read from the primary, as the results are cached for
+    every user; ``pinned`` recomputes every asset instead of trusting
+    entries that may predate the user's write.
+    """
+    today = today or datetime.utcnow().date()
+    limit = today + timedelta(days=horizon_days)
+
+    stmt = select(Asset.id, Asset.name).order_by(Asset.id)
+    if asset_id is not None:
+        stmt = stmt.where(Asset.id == asset_id)
+    names = dict(db.connection().execute(stmt).all())
+
+    cached = {}
+    missing = []
+    for key in names:
+        entry = None if pinned else forecast_cache.get(key)
+        if entry is None:
+            missing.append(key)
+        else:
+            cached[key] = entry
+    if missing:
+        generation = _generation
+        # Every asset missing (a cold cache) is one unfiltered batch
+        computed = compute(db, None if len(missing) == len(names) and asset_id is None else missing)
+        fresh = {key: computed.get(key) for key in missing}
+        with _generation_lock:
+            if generation == _generation:
+                for key, value in fresh.items():
+                    # Stored as a wrapper so "no data" is distinguishable from a miss
+                    forecast_cache.set(key, (value,))
+        cached.update({key: (value,) for key, value in fresh.items()})
+
+    assets = []
+    for key in names:
+        entry = cached[key][0]
+        if entry is None:
+            continue
+        condition = entry["condition"]
+        equipment = [
+            {
+                **item,
+                "service_overdue": _within(item["service_due"], today - timedelta(days=1)),
+                "service_due_soon": _within(item["service_due"], limit),
+                "replacement_due": (
+                    item["condition"] == ConditionRating.CRITICAL or _within(item["replace_by"], limit)
+                ),
+            }
+            for item in entry["equipment"]
+        ]
+        degrading = condition is not None and _within(condition["poor_by"], limit)
+        attention = [item for item in equipment if item["service_due_soon"] or item["replacement_due"]]
+        if asset_id is None and not degrading and not attention:
+            continue
+        assets.append({
+            "asset_id": key,
+            "name": names[key],
+            "condition": condition,
+            "degrading": degrading,
+            "equipment": equipment if asset_id is not None else attention,
+        })
+
+    return {
+        "as_of": today,
+        "horizon_days": horizon_days,
+        "assets": assets,
+        "summary": {
+            "assets_degrading": sum(a["degrading"] for a in assets),
+            "service_due": sum(i["service_due_soon"] for a in assets for i in a["equipment"]),
+            "service_overdue": sum(i["service_overdue"] for a in assets for i in a["equipment"]),
+            "replacement_due": sum(i["replacement_due"] for a in assets for i in a["equipment"]),
+        },
+    }
+
+
+__all__ = [
+    "MAINTENANCE_FORECAST_TTL_SECONDS", "SERVICE_INTERVAL_DAYS", "EQUIPMENT_LIFESPAN_YEARS",
+    "CONDITION_SCORES", "LIFESPAN_FACTORS", "forecast_cache", "invalidate", "compute", "forecast",
+]
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 # Configure logging
@@ -7,36 +9,39 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 from ..core.security import verify_password, get_password_hash, create_access_token
-from ..database import get_db
+from ..database import get_async_db
 from ..schemas import UserBase, UserLogin, UserCreate
 from ..models import Users, UserRole
 from ..models.activity_log import ActivityLog, ActivityEventType, ActivityStatus
+from ..services import typeahead
 
 router = APIRouter()
 
 @router.post("/register")
 @router.post("/signup")
-async def register(request: Request, user: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     logger.info(f"Received signup request: {user.email}")
     logger.info(f"Request URL: {request.url}")
     logger.info(f"Request method: {request.method}")
     logger.info(f"Request headers: {request.headers}")
     
-    existing = db.query(Users).filter(Users.email == user.email).first()
+    existing = (await db.execute(select(Users.id).where(Users.email == user.email))).first()
     if existing:
         logger.warning(f"Email already registered: {user.email}")
         raise HTTPException(status_code=400, detail="email already registered")
 
     logger.info(f"Creating new user: {user.email}")
-    create_user(user, db)
+    await create_user(user, db)
     logger.info(f"User created successfully: {user.email}")
     return {"message": "User created successfully"}
 
 @router.post("/login")
-async def login(user_login: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(Users).filter(Users.email == str(user_login.email)).first()
-    
-    if not user or not verify_password(user_login.password, user.password):
+async def login(user_login: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Users).where(Users.email == str(user_login.email)))
+    user = result.scalars().first()
+
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not user or not await run_in_threadpool(verify_password, user_login.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -52,7 +57,7 @@ async def login(user_login: UserLogin, db: Session = Depends(get_db)):
         target=user.email,
         status=ActivityStatus.INFO,
     ))
-    db.commit()
+    await db.commit()
 
     return {
         "access_token": access_token,
@@ -60,17 +65,18 @@ async def login(user_login: UserLogin, db: Session = Depends(get_db)):
         "role": user.role.value  # Include role in response
     }
 
-def create_user(user: UserBase, db: Session):
+async def create_user(user: UserBase, db: AsyncSession):
     db_user = Users(
         email=user.email,
         fullname=user.fullname,
-        password=get_password_hash(user.password),
+        password=await run_in_threadpool(get_password_hash, user.password),
         role=UserRole.USER  # Default role is USER
     )
 
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    typeahead.users_index.invalidate()
     return db_user
 
 
@@ -1,25 +1,39 @@
 import os
 from io import BytesIO
 import json
+import logging
+from typing import Optional
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.params import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse, StreamingResponse
 from fastapi.responses import Response
 
 from ..googledrivefunc import DriveFileOperations
-from ..dependencies import get_drive_file_ops
+from ..dependencies import get_drive_file_ops, get_async_read_db
 from ..schemas import FileBase
-from ..database import get_db
+from ..database import get_async_db
+from ..core.cache import ExpiringCache
+from ..core.pagination import keyset_paginate, split_page
 from ..models import Files, Users
 from ..dependencies import get_current_user
+from ..services import extraction, typeahead
+from ..models.document_text import DocumentSource
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 MAX_FILE_SIZE = 10 * 1024 * 1024
 ALLOWED_FILE_TYPES = ['.pdf', '.docx', '.txt']
 
+# Listing totals, keyed by owner id (None for the admin view of all documents)
+document_counts = ExpiringCache(ttl=float(os.getenv('DOCUMENT_COUNT_TTL_SECONDS', '60')))
+# Above this many rows the admin total is taken from PostgreSQL's estimate
+DOCUMENT_COUNT_ESTIMATE_THRESHOLD = int(os.getenv('DOCUMENT_COUNT_ESTIMATE_THRESHOLD', '100000'))
+
 @router.get("/")
 async def get_documents():
     return {"message": "Document management API is running"}
@@ -30,7 +44,7 @@ async def document_upload(
     file: UploadFile = File(...),
     document: str = Form(...),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         print("Starting document upload...")
@@ -49,16 +63,17 @@ async def document_upload(
             raise HTTPException(status_code=400, detail="Invalid file type")
 
         # Get user
-        user = db.query(Users).filter(Users.email == parsed_document.email).first()
+        result = await db.execute(select(Users).where(Users.email == parsed_document.email))
+        user = result.scalars().first()
         if not user:
             raise HTTPException(status_code=400, detail="User does not exist")
         print(f"Found user: {user.email}")
 
         # Check if file already exists
-        existing = db.query(Files).filter(
+        existing = (await db.execute(select(Files.id).where(
             Files.filename == parsed_document.filename,
             Files.user_id == user.id
-        ).first()
+        ))).first()
 
         if existing:
             raise HTTPException(status_code=400, detail="A file by that name is already loaded")
@@ -73,7 +88,8 @@ async def document_upload(
 
         print("Saving file to Google Drive...")
         # Save document to folder
-        drive_ops.check_and_save_file(
+        await run_in_threadpool(
+            drive_ops.check_and_save_file,
             file.filename,
             BytesIO(content),
             parsed_document.email)
@@ -82,12 +98,18 @@ async def document_upload(
         print("Creating database record...")
         # Create file record in database
         try:
-            db_file = create_file(parsed_document, db, user.id, current_user_email)
+            db_file = await create_file(parsed_document, db, user.id, current_user_email)
+            _invalidate_document_counts(user.id)
             print("Database record created successfully")
         except Exception as e:
             print(f"Error creating database record: {str(e)}")
             raise
 
+        # Index the document's text in the background
+        extraction.schedule_extraction(
+            DocumentSource.FILE, db_file.id, file.filename, content, user_id=user.id
+        )
+
         # Prepare response data
         response_data = {
             "id": db_file.id,
@@ -110,11 +132,11 @@ async def document_upload(
         raise HTTPException(status_code=400, detail="Invalid document data format")
     except Exception as e:
         print(f"Error in document upload: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding file: {str(e)}")
 
 
-def create_file(file: FileBase, db: Session, user_id: int, uploaded_by: str):
+async def create_file(file: FileBase, db: AsyncSession, user_id: int, uploaded_by: str):
     print(f"Creating file record with: filename={file.filename}, document_type={file.document_type}, user_id={user_id}, uploaded_by={uploaded_by}")
     db_file = Files(
         filename=file.filename,
@@ -123,8 +145,8 @@ def create_file(file: FileBase, db: Session, user_id: int, uploaded_by: str):
         uploaded_by=uploaded_by
     )
     db.add(db_file)
-    db.commit()
-    db.refresh(db_file)
+    await db.commit()
+    await db.refresh(db_file)
     print("File record created successfully")
     return db_file
 
@@ -133,22 +155,23 @@ def create_file(file: FileBase, db: Session, user_id: int, uploaded_by: str):
 async def delete_document(
     document_id: int,
     drive_ops: DriveFileOperations = Depends(get_drive_file_ops),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     try:
         # Find the file in the database
-        db_file = db.query(Files).filter(Files.id == document_id).first()
+        db_file = await db.get(Files, document_id)
         if not db_file:
             raise HTTPException(status_code=404, detail="File not found")
 
         # Get the user who owns the file
-        user = db.query(Users).filter(Users.id == db_file.user_id).first()
+        user = await db.get(Users, db_file.user_id) if db_file.user_id is not None else None
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
         # Check if current user is admin or the owner of the file
-        current_user_obj = db.query(Users).filter(Users.email == current_user).first()
+        result = await db.execute(select(Users).where(Users.email == current_user))
+        current_user_obj = result.scalars().first()
         if not current_user_obj:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
@@ -156,14 +179,17 @@ async def delete_document(
             raise HTTPException(status_code=403, detail="Not authorized to delete this file")
 
         # Delete from Google Drive
-        drive_delete_count = drive_ops.find_and_delete_files(
+        drive_delete_count = await run_in_threadpool(
+            drive_ops.find_and_delete_files,
             file_name=db_file.filename,
             folder_name=user.email
         )
 
         # Delete from database
-        db.delete(db_file)
-        db.commit()
+        await db.run_sync(extraction.delete_text, DocumentSource.FILE, db_file.id)
+        await db.delete(db_file)
+        await db.commit()
+        _invalidate_document_counts(user.id)
 
         return JSONResponse(
             status_code=200,
@@ -175,7 +201,7 @@ async def delete_document(
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting file: {str(e)}")
 
 @router.get("/documents/{email}")
@@ -183,84 +209,146 @@ async def get_documents_by_user(
     email: str,
     page: int = 1,
     per_page: int = 5,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: str = Depends(get_current_user)
 ):
     try:
-        # Get user
-        user = db.query(Users).filter(Users.email == email).first()
+        # Both users in one lookup
+        users = (await db.execute(
+            select(Users.id, Users.email, Users.role).where(Users.email.in_({email, current_user}))
+        )).all()
+        users_by_email = {u.email: u for u in users}
+        user = users_by_email.get(email)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
         # Get current user's role
-        current_user_obj = db.query(Users).filter(Users.email == current_user).first()
+        current_user_obj = users_by_email.get(current_user)
         if not current_user_obj:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
-        # Calculate offset
-        offset = (page - 1) * per_page
-
-        # If current user is admin, get all documents
-        if current_user_obj.role == "admin":
-            total_documents = db.query(Files).count()
-            documents = db.query(Files).order_by(Files.created_at.desc()).offset(offset).limit(per_page).all()
+        # If current user is admin, get all documents; regular users get only
+        # their own
+        owner_id = None if current_user_obj.role == "admin" else user.id
+
+        query = select(
+            Files.id,
+            Files.filename,
+            Files.document_type,
+            Files.uploaded_by,
+            Files.created_at,
+            Users.email,
+        ).outerjoin(Users, Files.user_id == Users.id)
+        if owner_id is not None:
+            query = query.where(Files.user_id == owner_id)
+
+        # On a cache miss the count rides along with the page query
+        total_documents = await _cached_document_total(db, owner_id)
+        if total_documents is None:
+            query = query.add_columns(_document_count(owner_id).scalar_subquery().label("total"))
+
+        # A cursor continues after the previous page with an index range scan;
+        # page numbers are still accepted for existing clients
+        if cursor:
+            query = keyset_paginate(query, (Files.created_at, Files.id), cursor, per_page)
         else:
-            # For regular users, get only their documents
-            total_documents = db.query(Files).filter(Files.user_id == user.id).count()
-            documents = db.query(Files).filter(
-                Files.user_id == user.id
-            ).order_by(Files.created_at.desc()).offset(offset).limit(per_page).all()
+            offset = (page - 1) * per_page
+            query = keyset_paginate(query, (Files.created_at, Files.id), None, per_page).offset(offset)
+        rows = (await db.execute(query)).all()
+
+        if total_documents is None:
+            total_documents = rows[0].total if rows else await db.scalar(_document_count(owner_id))
+            document_counts.set(owner_id, total_documents)
+
+        rows, next_cursor = split_page(rows, per_page, lambda r: (r.created_at, r.id))
 
         # Format documents for response
-        formatted_documents = []
-        for doc in documents:
-            doc_user = db.query(Users).filter(Users.id == doc.user_id).first()
-            formatted_documents.append({
-                "id": doc.id,
-                "filename": doc.filename,
-                "document_type": doc.document_type,
-                "email": doc_user.email if doc_user else "unknown",
-                "uploaded_by": doc.uploaded_by,
-                "created_at": doc.created_at.isoformat()
-            })
+        formatted_documents = [
+            {
+                "id": row.id,
+                "filename": row.filename,
+                "document_type": row.document_type,
+                "email": row.email or "unknown",
+                "uploaded_by": row.uploaded_by,
+                "created_at": row.created_at.isoformat()
+            }
+            for row in rows
+        ]
 
         return {
             "documents": formatted_documents,
             "total": total_documents,
             "page": page,
             "per_page": per_page,
-            "total_pages": (total_documents + per_page - 1) // per_page
+            "total_pages": (total_documents + per_page - 1) // per_page,
+            "next_cursor": next_cursor
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in get_documents_by_user: {str(e)}")
+        logger.exception("Error listing documents for %s", email)
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def _document_count(owner_id: Optional[int]):
+    stmt = select(func.count(Files.id))
+    if owner_id is not None:
+        stmt = stmt.where(Files.user_id == owner_id)
+    return stmt
+
+
+async def _cached_document_total(db: AsyncSession, owner_id: Optional[int]) -> Optional[int]:
+    """Document total from the cache, or the planner's estimate for large tables.
+
+    Returns None when the exact count still has to be computed.
+    """
+    total = document_counts.get(owner_id)
+    if total is not None:
+        return total
+
+    if owner_id is None and db.get_bind().dialect.name == "postgresql":
+        # Counting every row of a large table is a full scan; the planner's
+        # row estimate is close enough for a page count
+        estimate = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'files'::regclass")
+        )
+        if estimate is not None and estimate >= DOCUMENT_COUNT_ESTIMATE_THRESHOLD:
+            document_counts.set(owner_id, estimate)
+            return estimate
+    return None
+
+
+def _invalidate_document_counts(user_id: int):
+    # The admin total covers every user's documents
+    document_counts.invalidate(None, user_id)
+
 @router.get('/download/{email}/{filename}')
 async def download_document(
     email: str,
     filename: str,
     drive_ops: DriveFileOperations = Depends(get_drive_file_ops),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
         # Find the user
-        user = db.query(Users).filter(Users.email == email).first()
+        user = (await db.execute(select(Users).where(Users.email == email))).scalars().first()
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
         # Find the file in the database
-        db_file = db.query(Files).filter(
+        db_file = (await db.execute(select(Files.id).where(
             Files.filename == filename,
             Files.user_id == user.id
-        ).first()
+        ))).first()
 
         if not db_file:
             raise HTTPException(status_code=404, detail="File not found in database")
 
         # Find file in Google Drive and get content
         try:
-            file_content = drive_ops.download_file(filename, email)
+            file_content = await run_in_threadpool(drive_ops.download_file, filename, email)
             
             # Determine content type based on file extension
             content_type = 'application/octet-stream'  # default
@@ -301,28 +389,25 @@ async def preview_document(
     drive_ops: DriveFileOperations = Depends(get_drive_file_ops)
 ):
     try:
-        preview_url = drive_ops.get_preview_url(filename, email)
+        preview_url = await run_in_threadpool(drive_ops.get_preview_url, filename, email)
         return {"preview_url": preview_url}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get('/users/search/{query}')
-async def search_users(query: str, db: Session = Depends(get_db)):
+async def search_users(query: str, limit: int = Query(20, ge=1, le=50), db: AsyncSession = Depends(get_async_db)):
     try:
-        # Search for users by email or fullname
-        users = db.query(Users).filter(
-            (Users.email.ilike(f"%{query}%")) | 
-            (Users.fullname.ilike(f"%{query}%"))
-        ).all()
-        
+        # Ranked, bounded lookup by email or fullname
+        users = await db.run_sync(typeahead.search_users, query, limit)
+
         # Format the response
         formatted_users = []
         for user in users:
             user_data = {
-                "id": user.id,
-                "email": user.email,
-                "fullname": user.fullname,
-                "role": user.role
+                "id": user["id"],
+                "email": user["email"],
+                "fullname": user["fullname"],
+                "role": user["role"]
             }
             formatted_users.append(user_data)
             
@@ -332,36 +417,40 @@ async def search_users(query: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error searching users: {str(e)}")
 
 @router.get('/recent-uploads')
-async def get_recent_uploads(limit: int = 10, db: Session = Depends(get_db)):
+async def get_recent_uploads(limit: int = 10, db: AsyncSession = Depends(get_async_db)):
     try:
-        print("Fetching recent uploads...")
         # Get recent uploads with user information
-        recent_uploads = db.query(Files, Users).join(
-            Users, Files.user_id == Users.id
-        ).order_by(
-            Files.created_at.desc()
-        ).limit(limit).all()
-        
-        print(f"Found {len(recent_uploads)} recent uploads")
-        
+        recent_uploads = (await db.execute(
+            select(
+                Files.id,
+                Files.filename,
+                Files.document_type,
+                Files.created_at,
+                Users.id.label("user_id"),
+                Users.email,
+                Users.fullname,
+            ).join(
+                Users, Files.user_id == Users.id
+            ).order_by(
+                Files.created_at.desc(), Files.id.desc()
+            ).limit(limit)
+        )).all()
+
         # Format the response
-        formatted_uploads = []
-        for file, user in recent_uploads:
-            upload_data = {
-                "id": file.id,
-                "filename": file.filename,
-                "document_type": file.document_type,
-                "created_at": file.created_at.isoformat() if file.created_at else None,
+        return [
+            {
+                "id": row.id,
+                "filename": row.filename,
+                "document_type": row.document_type,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
                 "user": {
-                    "id": user.id,
-                    "email": user.email,
-                    "fullname": user.fullname
+                    "id": row.user_id,
+                    "email": row.email,
+                    "fullname": row.fullname
                 }
             }
-            formatted_uploads.append(upload_data)
-            
-        print("Formatted uploads:", formatted_uploads)
-        return formatted_uploads
+            for row in recent_uploads
+        ]
     except Exception as e:
-        print(f"Error fetching recent uploads: {str(e)}")
+        logger.exception("Error fetching recent uploads")
         raise HTTPException(status_code=500, detail=f"Error fetching recent uploads: {str(e)}") 
\ No newline at end of file
@@ -1,38 +1,41 @@
-from typing import List, Optional
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-
-from app.core.security import get_current_user, get_db_user
-from app.database import get_db
-from app.models.activity_log import ActivityEventType, ActivityLog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.filters import activity_filters
+from app.core.pagination import keyset_paginate, split_page
+from app.core.security import get_async_db_user, get_current_user
+from app.dependencies import get_async_read_db
+from app.models.activity_log import ActivityLog
 from app.models.user import UserRole
 from app.schemas.activity_log import ActivityLogResponse
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[ActivityLogResponse])
+@router.get("/", response_model=Page[ActivityLogResponse])
 async def list_activity_feed(
-    event_type: Optional[ActivityEventType] = Query(default=None),
+    filters: list = Depends(activity_filters),
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    current_user = get_db_user(current_user_email, db)
+    current_user = await get_async_db_user(current_user_email, db)
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="Only admins can access the activity feed")
 
-    query = db.query(ActivityLog)
+    query = select(ActivityLog).where(*filters)
 
-    if event_type is not None:
-        query = query.filter(ActivityLog.event_type == event_type)
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
 
-    entries = (
-        query.order_by(ActivityLog.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-    return entries
+    query = keyset_paginate(query, (ActivityLog.created_at, ActivityLog.id), cursor, limit)
+    entries = (await db.execute(query)).scalars().all()
+    items, next_cursor = split_page(entries, limit, lambda e: (e.created_at, e.id))
+    return {"items": items, "next_cursor": next_cursor, "total": total}
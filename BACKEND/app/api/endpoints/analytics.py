@@ -0,0 +1,82 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics import amortization, anomalies, cashflow, maintenance, stress
+from app.core.security import get_current_user
+from app.database import get_async_db
+from app.dependencies import get_async_read_db, get_read_pinned
+from app.models.asset import CostCategory
+from app.schemas.analytics import (
+    CashFlowReport, CostAnomalyReport, MaintenanceForecast, MortgageForecast,
+    StressParameters, StressTestResult,
+)
+
+router = APIRouter()
+
+
+@router.get("/cash-flow", response_model=CashFlowReport)
+async def cash_flow(
+    months: int = Query(default=12, ge=1, le=120, description="Trailing months to average costs over"),
+    asset_id: Optional[List[int]] = Query(default=None, description="Limit to these assets; repeatable"),
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await db.run_sync(cashflow.compute, months, asset_id)
+
+
+@router.get("/mortgages", response_model=MortgageForecast)
+async def mortgage_forecast(
+    default_rate: float = Query(
+        default=amortization.MORTGAGE_DEFAULT_RATE, ge=0, le=100,
+        description="Annual percentage rate for mortgages without their own",
+    ),
+    horizon_months: int = Query(default=360, ge=1, le=amortization.MAX_HORIZON_MONTHS),
+    current_user_email: str = Depends(get_current_user),
+    # Cached for everyone, so computed from the primary
+    db: AsyncSession = Depends(get_async_db),
+    pinned: bool = Depends(get_read_pinned),
+):
+    return await amortization.get_forecast(db, default_rate, horizon_months, pinned)
+
+
+@router.post("/stress-test", response_model=StressTestResult)
+async def stress_test(
+    params: StressParameters,
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await stress.run(db, params)
+
+
+@router.get("/cost-anomalies", response_model=CostAnomalyReport)
+async def cost_anomalies(
+    asset_id: Optional[int] = Query(default=None),
+    category: Optional[CostCategory] = Query(default=None),
+    since: Optional[date] = Query(default=None, description="Only report events on or after this date"),
+    window_months: int = Query(default=anomalies.COST_ANOMALY_WINDOW_MONTHS, ge=1, le=120),
+    z: float = Query(default=anomalies.COST_ANOMALY_Z, gt=0, description="z-score at or above which an event is flagged"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    report = await db.run_sync(anomalies.rescore, asset_id, category, since, window_months, z)
+    report["anomalies"] = report["anomalies"][:limit]
+    return report
+
+
+@router.get("/maintenance", response_model=MaintenanceForecast)
+async def maintenance_forecast(
+    horizon_days: int = Query(default=365, ge=1, le=3650),
+    asset_id: Optional[int] = Query(
+        default=None,
+        description="Return this asset's full forecast; otherwise only assets needing attention",
+    ),
+    current_user_email: str = Depends(get_current_user),
+    # Cached for everyone, so computed from the primary
+    db: AsyncSession = Depends(get_async_db),
+    pinned: bool = Depends(get_read_pinned),
+):
+    return await db.run_sync(maintenance.forecast, horizon_days, asset_id, None, pinned)
@@ -1,29 +1,41 @@
 import io
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-
-from app.core.security import get_current_user, get_db_user
-from app.database import get_db
-from app.dependencies import get_drive_file_ops
+from typing import List, Optional, Sequence
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.analytics import amortization, anomalies, maintenance
+from app.api.filters import asset_filters
+from app.core.pagination import keyset_paginate, split_page
+from app.core.security import get_current_user
+from app.database import get_async_db
+from app.dependencies import get_async_read_db, get_drive_file_ops
 from app.googledrivefunc.fileoperations import DriveFileOperations
 from app.models.asset import (
     Asset, AssetDocument, AssetEquipment, AssetStatus, AssetType,
     ConditionEntry, CostCategory, CostEvent, LotSizeUnit, Unit,
 )
 from app.models.activity_log import ActivityLog, ActivityEventType, ActivityStatus
+from app.models.asset_detail_doc import AssetDetailDoc
+from app.models.cost_rollup import CostRollup
 from app.schemas.asset import (
     AssetCreate, AssetUpdate, AssetResponse, AssetSummary,
     AssetDocumentResponse,
     ConditionEntryCreate, ConditionEntryResponse,
     CostEventCreate, CostEventResponse,
     EquipmentCreate, EquipmentUpdate, EquipmentResponse,
-    MortgageInfo, RentalInfo,
     UnitCreate, UnitUpdate, UnitResponse,
 )
+from app.models.document_text import DocumentSource
+from app.schemas.pagination import Page
+from app.services import asset_details, asset_summaries, cost_rollups, dashboard, extraction, typeahead
+from app.services.asset_details import ASSET_SECTION_LIMIT, ASSET_SECTIONS, build_response
 
 router = APIRouter()
 
@@ -33,7 +45,7 @@ router = APIRouter()
 # ---------------------------------------------------------------------------
 
 def _log(
-    db: Session,
+    db: AsyncSession,
     event_type: ActivityEventType,
     user_email: str,
     action: str,
@@ -52,13 +64,83 @@ def _log(
     ))
 
 
-def _get_asset_or_404(asset_id: int, db: Session) -> Asset:
-    asset = db.get(Asset, asset_id)
+async def _get_asset_or_404(asset_id: int, db: AsyncSession, lock: bool = False) -> Asset:
+    """Load an asset; ``lock`` holds its row until commit (FOR NO KEY UPDATE).
+
+    Lock whenever the write derives a delta from the asset's current values,
+    so concurrent writers apply their deltas one after the other.
+    """
+    if lock:
+        asset = await db.get(Asset, asset_id, with_for_update={"key_share": True}, populate_existing=True)
+    else:
+        asset = await db.get(Asset, asset_id)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return asset
+
+
+ASSET_FIELDS = [name for name in AssetResponse.model_fields if name not in ASSET_SECTIONS]
+
+
+async def _get_asset_detail_or_404(
+    asset_id: int,
+    db: AsyncSession,
+    sections: Sequence[str] = tuple(ASSET_SECTIONS),
+    limit: Optional[int] = ASSET_SECTION_LIMIT,
+) -> Asset:
+    """Load an asset with the requested child collections, refreshing any cached copy.
+
+    Each collection holds at most the ``limit`` most recent entries; pass
+    ``limit=None`` to load them all.
+    """
+    result = await db.execute(asset_details.detail_query(asset_id, sections, limit))
+    asset = result.scalars().first()
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     return asset
 
 
+async def _store_detail(db: AsyncSession, asset_id: int, new: bool = False) -> AssetResponse:
+    """Rebuild the asset's stored detail view from the pending changes (no commit).
+
+    The view is built from the rows as stored (e.g. money at the column's
+    scale), never from request values.
+    """
+    # The session does not autoflush, and the reload below would overwrite
+    # unflushed attribute changes
+    await db.flush()
+    # Rebuilds of one asset run one at a time: once the lock is held, the
+    # reload below sees every child row committed by earlier writers, so the
+    # last document stored always includes them. FOR NO KEY UPDATE, as the
+    # child inserts already hold key-share locks on the asset row.
+    await db.execute(select(Asset.id).where(Asset.id == asset_id).with_for_update(key_share=True))
+    if new:
+        # A new asset has no children; reload only its columns and mark the
+        # collections loaded instead of querying for them
+        asset = await _get_asset_detail_or_404(asset_id, db, sections=())
+        for section in ASSET_SECTIONS.values():
+            set_committed_value(asset, section.relationship.key, [])
+    else:
+        asset = await _get_asset_detail_or_404(asset_id, db)
+    response = build_response(asset)
+    await db.run_sync(asset_details.save, response)
+    return response
+
+
+def _parse_list(value: Optional[str], allowed: Sequence[str], param: str) -> Optional[List[str]]:
+    """Split a comma-separated query parameter, rejecting unknown names."""
+    if value is None:
+        return None
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {param}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return names
+
+
 def _apply_asset_data(asset: Asset, data: AssetCreate | AssetUpdate):
     """Write flat fields and expand nested mortgage/rental onto the ORM object."""
     updates = data.model_dump(exclude_unset=True, exclude={"mortgage", "rental"})
@@ -74,10 +156,14 @@ def _apply_asset_data(asset: Asset, data: AssetCreate | AssetUpdate):
             asset.mortgage_lender = data.mortgage.lender
             asset.mortgage_balance = Decimal(data.mortgage.balance)
             asset.mortgage_monthly_payment = Decimal(data.mortgage.monthly_payment)
+            asset.mortgage_interest_rate = (
+                Decimal(data.mortgage.interest_rate) if data.mortgage.interest_rate else None
+            )
         elif not asset.has_mortgage:
             asset.mortgage_lender = None
             asset.mortgage_balance = None
             asset.mortgage_monthly_payment = None
+            asset.mortgage_interest_rate = None
 
     # Rental
     if "has_rental" in updates or data.rental is not None:
@@ -93,57 +179,6 @@ def _apply_asset_data(asset: Asset, data: AssetCreate | AssetUpdate):
             asset.rental_lease_end = None
 
 
-def _build_response(asset: Asset) -> AssetResponse:
-    """Reconstruct nested mortgage/rental objects and return a validated response."""
-    mortgage = None
-    if asset.has_mortgage and asset.mortgage_lender:
-        mortgage = MortgageInfo(
-            lender=asset.mortgage_lender,
-            balance=str(asset.mortgage_balance or "0"),
-            monthly_payment=str(asset.mortgage_monthly_payment or "0"),
-        )
-
-    rental = None
-    if asset.has_rental and asset.rental_tenant_name:
-        rental = RentalInfo(
-            monthly_income=str(asset.rental_monthly_income or "0"),
-            tenant_name=asset.rental_tenant_name,
-            lease_start=asset.rental_lease_start,
-            lease_end=asset.rental_lease_end,
-        )
-
-    return AssetResponse(
-        id=asset.id,
-        name=asset.name,
-        type=asset.type,
-        street=asset.street,
-        parish=asset.parish,
-        country=asset.country,
-        registry_number=asset.registry_number,
-        lot_size=asset.lot_size,
-        lot_size_unit=asset.lot_size_unit,
-        build_year=asset.build_year,
-        external_ref_id=asset.external_ref_id,
-        comments=asset.comments,
-        status=asset.status,
-        owner_name=asset.owner_name,
-        acquisition_date=asset.acquisition_date,
-        purchase_price=str(asset.purchase_price) if asset.purchase_price is not None else None,
-        has_mortgage=asset.has_mortgage,
-        mortgage=mortgage,
-        has_rental=asset.has_rental,
-        rental=rental,
-        photo_url=asset.photo_url,
-        created_at=asset.created_at,
-        updated_at=asset.updated_at,
-        condition_log=[ConditionEntryResponse.model_validate(e) for e in asset.condition_log],
-        units=[UnitResponse.model_validate(u) for u in asset.units],
-        equipment=[EquipmentResponse.model_validate(e) for e in asset.equipment],
-        documents=[AssetDocumentResponse.model_validate(d) for d in asset.asset_documents],
-        cost_events=[CostEventResponse.model_validate(c) for c in asset.cost_events],
-    )
-
-
 def _format_size(num_bytes: int) -> str:
     for unit in ("B", "KB", "MB", "GB"):
         if num_bytes < 1024:
@@ -156,60 +191,109 @@ def _format_size(num_bytes: int) -> str:
 # Assets CRUD
 # ---------------------------------------------------------------------------
 
-@router.get("/", response_model=List[AssetSummary])
+# Sort keys for the listing; each is non-null so it can anchor a cursor
+ASSET_SORTS = {
+    "created_at": Asset.created_at,
+    "updated_at": Asset.updated_at,
+    "name": Asset.name,
+    "unit_count": Asset.unit_count,
+    "occupied_unit_count": Asset.occupied_unit_count,
+    "document_count": Asset.document_count,
+    "costs_ytd": Asset.costs_ytd,
+}
+
+# Only the columns an AssetSummary needs
+_SUMMARY_COLUMNS = [getattr(Asset, name) for name in AssetSummary.model_fields]
+
+
+@router.get("/", response_model=Page[AssetSummary])
 async def list_assets(
+    filters: list = Depends(asset_filters),
+    sort: str = Query(default="created_at", pattern="^(" + "|".join(ASSET_SORTS) + ")$"),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    assets = db.query(Asset).order_by(Asset.created_at.desc()).all()
-    summaries = []
-    for a in assets:
-        summaries.append(AssetSummary(
-            id=a.id,
-            name=a.name,
-            type=a.type,
-            street=a.street,
-            parish=a.parish,
-            country=a.country,
-            status=a.status,
-            owner_name=a.owner_name,
-            purchase_price=str(a.purchase_price) if a.purchase_price is not None else None,
-            has_mortgage=a.has_mortgage,
-            has_rental=a.has_rental,
-            photo_url=a.photo_url,
-            created_at=a.created_at,
-            updated_at=a.updated_at,
-        ))
-    return summaries
+    total = None
+    if include_total:
+        total = await db.scalar(select(func.count(Asset.id)).where(*filters))
+
+    sort_key = (ASSET_SORTS[sort], Asset.id)
+    stmt = keyset_paginate(
+        select(*_SUMMARY_COLUMNS).where(*filters),
+        sort_key, cursor, limit, descending=order == "desc",
+    )
+    rows = (await db.execute(stmt)).all()
+    rows, next_cursor = split_page(rows, limit, lambda r: (getattr(r, sort), r.id))
+
+    items = [AssetSummary.model_validate(dict(row._mapping)) for row in rows]
+    return {"items": items, "next_cursor": next_cursor, "total": total}
 
 
 @router.post("/", response_model=AssetResponse, status_code=201)
 async def create_asset(
     data: AssetCreate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     asset = Asset()
     _apply_asset_data(asset, data)
     asset.created_at = datetime.utcnow()
     asset.updated_at = datetime.utcnow()
     db.add(asset)
-    db.flush()  # get the id before logging
+    await db.flush()  # get the id before logging
+    await db.run_sync(dashboard.record_asset_change, None, dashboard.asset_cell(asset))
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Created asset {asset.name}", asset.name, asset.id)
-    db.commit()
-    db.refresh(asset)
-    return _build_response(asset)
+    response = await _store_detail(db, asset.id, new=True)
+    await db.commit()
+    typeahead.assets_index.invalidate()
+    dashboard.invalidate()
+    if asset.has_mortgage:
+        amortization.invalidate()
+    return response
 
 
 @router.get("/{asset_id}", response_model=AssetResponse)
 async def get_asset(
     asset_id: int,
+    include: Optional[str] = Query(
+        default=None,
+        description="Comma-separated sections to return: " + ", ".join(ASSET_SECTIONS)
+        + ". Defaults to all; pass an empty value for none.",
+    ),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated asset fields to return. Defaults to all.",
+    ),
+    limit: int = Query(default=ASSET_SECTION_LIMIT, ge=1, le=500,
+                       description="Most recent entries returned per section"),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
-    return _build_response(asset)
+    if include is None and fields is None and limit == ASSET_SECTION_LIMIT:
+        # The default view is stored pre-serialised by every write
+        body = await db.scalar(select(AssetDetailDoc.body).where(AssetDetailDoc.asset_id == asset_id))
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+
+    sections = _parse_list(include, list(ASSET_SECTIONS), "section")
+    selected_fields = _parse_list(fields, ASSET_FIELDS, "field")
+    if sections is None:
+        sections = list(ASSET_SECTIONS)
+
+    asset = await _get_asset_detail_or_404(asset_id, db, sections, limit)
+    response = build_response(asset, sections)
+    if include is None and fields is None:
+        return response
+
+    # A partial view does not satisfy AssetResponse, so it bypasses response
+    # validation; the full model above has already validated every value.
+    keys = {"id", *(selected_fields if selected_fields is not None else ASSET_FIELDS), *sections}
+    return JSONResponse(response.model_dump(mode="json", include=keys))
 
 
 @router.patch("/{asset_id}", response_model=AssetResponse)
@@ -217,30 +301,49 @@ async def update_asset(
     asset_id: int,
     data: AssetUpdate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    # The cube delta moves the asset out of its current cell
+    asset = await _get_asset_or_404(asset_id, db, lock=True)
+    before = dashboard.asset_cell(asset)
+    terms_before = amortization.mortgage_terms(asset)
     _apply_asset_data(asset, data)
     asset.updated_at = datetime.utcnow()
+    mortgage_changed = amortization.mortgage_terms(asset) != terms_before
+    await db.run_sync(dashboard.record_asset_change, before, dashboard.asset_cell(asset))
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Updated asset {asset.name}", asset.name, asset.id, ActivityStatus.INFO)
-    db.commit()
-    db.refresh(asset)
-    return _build_response(asset)
+    response = await _store_detail(db, asset_id)
+    await db.commit()
+    typeahead.assets_index.invalidate()
+    dashboard.invalidate()
+    if mortgage_changed:
+        amortization.invalidate()
+    return response
 
 
 @router.delete("/{asset_id}", status_code=200)
 async def delete_asset(
     asset_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    # Children are loaded so the unit of work can process them on delete
+    asset = await _get_asset_detail_or_404(asset_id, db, limit=None)
     name = asset.name
+    had_mortgage = asset.has_mortgage
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Deleted asset {name}", name, asset_id, ActivityStatus.INFO)
-    db.delete(asset)
-    db.commit()
+    await db.execute(delete(CostRollup).where(CostRollup.asset_id == asset_id))
+    await db.run_sync(dashboard.record_asset_change, dashboard.asset_cell(asset), None)
+    await db.run_sync(asset_details.discard, asset_id)
+    await db.delete(asset)
+    await db.commit()
+    typeahead.assets_index.invalidate()
+    dashboard.invalidate()
+    if had_mortgage:
+        amortization.invalidate()
+    maintenance.invalidate(asset_id)
     return {"message": f"Asset '{name}' deleted successfully"}
 
 
@@ -253,13 +356,14 @@ async def upload_asset_photo(
     asset_id: int,
     file: UploadFile = File(...),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     drive_ops: DriveFileOperations = Depends(get_drive_file_ops),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    asset = await _get_asset_or_404(asset_id, db)
     content = await file.read()
-    result = drive_ops.check_and_save_file(
-        file.filename, io.BytesIO(content), f"assets/{asset_id}/photos"
+    result = await run_in_threadpool(
+        drive_ops.check_and_save_file,
+        file.filename, io.BytesIO(content), f"assets/{asset_id}/photos",
     )
     if not result:
         raise HTTPException(status_code=500, detail="Photo upload to Drive failed")
@@ -269,9 +373,9 @@ async def upload_asset_photo(
     asset.updated_at = datetime.utcnow()
     _log(db, ActivityEventType.DOCUMENT_UPLOAD, current_user_email,
          f"Uploaded photo for {asset.name}", asset.name, asset_id)
-    db.commit()
-    db.refresh(asset)
-    return _build_response(asset)
+    response = await _store_detail(db, asset_id)
+    await db.commit()
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -282,16 +386,15 @@ async def upload_asset_photo(
 async def get_condition_log(
     asset_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    entries = (
-        db.query(ConditionEntry)
-        .filter(ConditionEntry.asset_id == asset_id)
+    await _get_asset_or_404(asset_id, db)
+    result = await db.execute(
+        select(ConditionEntry)
+        .where(ConditionEntry.asset_id == asset_id)
         .order_by(ConditionEntry.date.desc())
-        .all()
     )
-    return entries
+    return result.scalars().all()
 
 
 @router.post("/{asset_id}/condition-log", response_model=ConditionEntryResponse, status_code=201)
@@ -299,16 +402,19 @@ async def add_condition_entry(
     asset_id: int,
     data: ConditionEntryCreate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    asset = await _get_asset_or_404(asset_id, db)
     entry = ConditionEntry(asset_id=asset_id, **data.model_dump())
     db.add(entry)
-    db.flush()
+    await db.flush()
+    await db.run_sync(asset_summaries.refresh_condition, asset_id)
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Logged condition: {data.rating.value}", asset.name, asset_id)
-    db.commit()
-    db.refresh(entry)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    maintenance.invalidate(asset_id)
+    await db.refresh(entry)
     return entry
 
 
@@ -320,10 +426,11 @@ async def add_condition_entry(
 async def get_units(
     asset_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    return db.query(Unit).filter(Unit.asset_id == asset_id).all()
+    await _get_asset_or_404(asset_id, db)
+    result = await db.execute(select(Unit).where(Unit.asset_id == asset_id))
+    return result.scalars().all()
 
 
 @router.post("/{asset_id}/units", response_model=UnitResponse, status_code=201)
@@ -331,19 +438,23 @@ async def add_unit(
     asset_id: int,
     data: UnitCreate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    asset = await _get_asset_or_404(asset_id, db)
     unit_data = data.model_dump()
     if unit_data.get("monthly_rent") is not None:
         unit_data["monthly_rent"] = Decimal(unit_data["monthly_rent"])
     unit = Unit(asset_id=asset_id, **unit_data)
     db.add(unit)
-    db.flush()
+    await db.flush()
+    await db.run_sync(
+        asset_summaries.adjust, asset_id, unit_count=1, occupied_unit_count=asset_summaries.occupied(unit.status),
+    )
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Added unit {unit.name}", asset.name, asset_id)
-    db.commit()
-    db.refresh(unit)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    await db.refresh(unit)
     return unit
 
 
@@ -353,13 +464,15 @@ async def update_unit(
     unit_id: int,
     data: UnitUpdate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
-    unit = db.get(Unit, unit_id)
+    asset = await _get_asset_or_404(asset_id, db)
+    # Locked so concurrent status changes each see the status the last one left
+    unit = await db.get(Unit, unit_id, with_for_update={"key_share": True}, populate_existing=True)
     if not unit or unit.asset_id != asset_id:
         raise HTTPException(status_code=404, detail="Unit not found")
 
+    was_occupied = asset_summaries.occupied(unit.status)
     updates = data.model_dump(exclude_unset=True)
     for key, value in updates.items():
         if key == "monthly_rent" and value is not None:
@@ -367,10 +480,15 @@ async def update_unit(
         else:
             setattr(unit, key, value)
     unit.updated_at = datetime.utcnow()
+    await db.run_sync(
+        asset_summaries.adjust, asset_id,
+        occupied_unit_count=asset_summaries.occupied(unit.status) - was_occupied,
+    )
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Updated unit {unit.name}", asset.name, asset_id, ActivityStatus.INFO)
-    db.commit()
-    db.refresh(unit)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    await db.refresh(unit)
     return unit
 
 
@@ -382,10 +500,11 @@ async def update_unit(
 async def get_equipment(
     asset_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    return db.query(AssetEquipment).filter(AssetEquipment.asset_id == asset_id).all()
+    await _get_asset_or_404(asset_id, db)
+    result = await db.execute(select(AssetEquipment).where(AssetEquipment.asset_id == asset_id))
+    return result.scalars().all()
 
 
 @router.post("/{asset_id}/equipment", response_model=EquipmentResponse, status_code=201)
@@ -393,16 +512,19 @@ async def add_equipment(
     asset_id: int,
     data: EquipmentCreate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    asset = await _get_asset_or_404(asset_id, db)
     equipment = AssetEquipment(asset_id=asset_id, **data.model_dump())
     db.add(equipment)
-    db.flush()
+    await db.flush()
+    await db.run_sync(asset_summaries.adjust, asset_id, equipment_count=1)
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Added equipment {equipment.name}", asset.name, asset_id)
-    db.commit()
-    db.refresh(equipment)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    maintenance.invalidate(asset_id)
+    await db.refresh(equipment)
     return equipment
 
 
@@ -412,10 +534,10 @@ async def update_equipment(
     eq_id: int,
     data: EquipmentUpdate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
-    equipment = db.get(AssetEquipment, eq_id)
+    asset = await _get_asset_or_404(asset_id, db)
+    equipment = await db.get(AssetEquipment, eq_id)
     if not equipment or equipment.asset_id != asset_id:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
@@ -424,8 +546,10 @@ async def update_equipment(
     equipment.updated_at = datetime.utcnow()
     _log(db, ActivityEventType.ASSET_UPDATE, current_user_email,
          f"Updated equipment {equipment.name}", asset.name, asset_id, ActivityStatus.INFO)
-    db.commit()
-    db.refresh(equipment)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    maintenance.invalidate(asset_id)
+    await db.refresh(equipment)
     return equipment
 
 
@@ -437,15 +561,15 @@ async def update_equipment(
 async def get_asset_documents(
     asset_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    return (
-        db.query(AssetDocument)
-        .filter(AssetDocument.asset_id == asset_id)
+    await _get_asset_or_404(asset_id, db)
+    result = await db.execute(
+        select(AssetDocument)
+        .where(AssetDocument.asset_id == asset_id)
         .order_by(AssetDocument.uploaded_at.desc())
-        .all()
     )
+    return result.scalars().all()
 
 
 @router.post("/{asset_id}/documents", response_model=AssetDocumentResponse, status_code=201)
@@ -453,13 +577,14 @@ async def upload_asset_document(
     asset_id: int,
     file: UploadFile = File(...),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     drive_ops: DriveFileOperations = Depends(get_drive_file_ops),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    asset = await _get_asset_or_404(asset_id, db)
     content = await file.read()
-    result = drive_ops.check_and_save_file(
-        file.filename, io.BytesIO(content), f"assets/{asset_id}/documents"
+    result = await run_in_threadpool(
+        drive_ops.check_and_save_file,
+        file.filename, io.BytesIO(content), f"assets/{asset_id}/documents",
     )
     if not result:
         raise HTTPException(status_code=500, detail="Document upload to Drive failed")
@@ -472,11 +597,16 @@ async def upload_asset_document(
         blob_url=result["file"]["web_link"],
     )
     db.add(doc)
-    db.flush()
+    await db.flush()
+    await db.run_sync(asset_summaries.adjust, asset_id, document_count=1)
     _log(db, ActivityEventType.DOCUMENT_UPLOAD, current_user_email,
          f"Uploaded {file.filename}", asset.name, asset_id)
-    db.commit()
-    db.refresh(doc)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    await db.refresh(doc)
+    extraction.schedule_extraction(
+        DocumentSource.ASSET_DOCUMENT, doc.id, file.filename, content, asset_id=asset_id
+    )
     return doc
 
 
@@ -488,15 +618,15 @@ async def upload_asset_document(
 async def get_cost_events(
     asset_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    return (
-        db.query(CostEvent)
-        .filter(CostEvent.asset_id == asset_id)
+    await _get_asset_or_404(asset_id, db)
+    result = await db.execute(
+        select(CostEvent)
+        .where(CostEvent.asset_id == asset_id)
         .order_by(CostEvent.date.desc())
-        .all()
     )
+    return result.scalars().all()
 
 
 @router.delete("/{asset_id}/condition-log/{entry_id}", status_code=200)
@@ -504,14 +634,18 @@ async def delete_condition_entry(
     asset_id: int,
     entry_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    entry = db.get(ConditionEntry, entry_id)
+    await _get_asset_or_404(asset_id, db)
+    entry = await db.get(ConditionEntry, entry_id)
     if not entry or entry.asset_id != asset_id:
         raise HTTPException(status_code=404, detail="Condition entry not found")
-    db.delete(entry)
-    db.commit()
+    await db.delete(entry)
+    await db.flush()
+    await db.run_sync(asset_summaries.refresh_condition, asset_id)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    maintenance.invalidate(asset_id)
     return {"message": "Condition entry deleted"}
 
 
@@ -520,14 +654,19 @@ async def delete_unit(
     asset_id: int,
     unit_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    unit = db.get(Unit, unit_id)
+    await _get_asset_or_404(asset_id, db)
+    # Locked so a concurrent delete or status change is not counted twice
+    unit = await db.get(Unit, unit_id, with_for_update=True, populate_existing=True)
     if not unit or unit.asset_id != asset_id:
         raise HTTPException(status_code=404, detail="Unit not found")
-    db.delete(unit)
-    db.commit()
+    await db.run_sync(
+        asset_summaries.adjust, asset_id, unit_count=-1, occupied_unit_count=-asset_summaries.occupied(unit.status),
+    )
+    await db.delete(unit)
+    await _store_detail(db, asset_id)
+    await db.commit()
     return {"message": "Unit deleted"}
 
 
@@ -536,14 +675,17 @@ async def delete_equipment_item(
     asset_id: int,
     eq_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    equipment = db.get(AssetEquipment, eq_id)
+    await _get_asset_or_404(asset_id, db)
+    equipment = await db.get(AssetEquipment, eq_id)
     if not equipment or equipment.asset_id != asset_id:
         raise HTTPException(status_code=404, detail="Equipment not found")
-    db.delete(equipment)
-    db.commit()
+    await db.run_sync(asset_summaries.adjust, asset_id, equipment_count=-1)
+    await db.delete(equipment)
+    await _store_detail(db, asset_id)
+    await db.commit()
+    maintenance.invalidate(asset_id)
     return {"message": "Equipment deleted"}
 
 
@@ -552,14 +694,17 @@ async def delete_asset_document(
     asset_id: int,
     doc_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    doc = db.get(AssetDocument, doc_id)
+    await _get_asset_or_404(asset_id, db)
+    doc = await db.get(AssetDocument, doc_id)
     if not doc or doc.asset_id != asset_id:
         raise HTTPException(status_code=404, detail="Document not found")
-    db.delete(doc)
-    db.commit()
+    await db.run_sync(extraction.delete_text, DocumentSource.ASSET_DOCUMENT, doc.id)
+    await db.run_sync(asset_summaries.adjust, asset_id, document_count=-1)
+    await db.delete(doc)
+    await _store_detail(db, asset_id)
+    await db.commit()
     return {"message": "Document deleted"}
 
 
@@ -568,14 +713,19 @@ async def delete_cost_event(
     asset_id: int,
     cost_id: int,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    _get_asset_or_404(asset_id, db)
-    event = db.get(CostEvent, cost_id)
+    await _get_asset_or_404(asset_id, db)
+    event = await db.get(CostEvent, cost_id)
     if not event or event.asset_id != asset_id:
         raise HTTPException(status_code=404, detail="Cost event not found")
-    db.delete(event)
-    db.commit()
+    await db.run_sync(
+        cost_rollups.record_cost, asset_id, event.category, event.date, -event.amount, -1,
+    )
+    await db.run_sync(asset_summaries.record_cost, asset_id, event.date, -event.amount)
+    await db.delete(event)
+    await _store_detail(db, asset_id)
+    await db.commit()
     return {"message": "Cost event deleted"}
 
 
@@ -584,9 +734,9 @@ async def add_cost_event(
     asset_id: int,
     data: CostEventCreate,
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    asset = _get_asset_or_404(asset_id, db)
+    asset = await _get_asset_or_404(asset_id, db)
     event = CostEvent(
         asset_id=asset_id,
         date=data.date,
@@ -595,9 +745,20 @@ async def add_cost_event(
         amount=Decimal(data.amount),
     )
     db.add(event)
-    db.flush()
+    await db.flush()
+    # Scored against the rollups before they include this event
+    score = await db.run_sync(
+        anomalies.score_cost, asset_id, event.category, event.date, event.amount, event.id,
+    )
+    await db.run_sync(
+        cost_rollups.record_cost, asset_id, event.category, event.date, event.amount,
+    )
+    await db.run_sync(asset_summaries.record_cost, asset_id, event.date, event.amount)
     _log(db, ActivityEventType.COST_EVENT, current_user_email,
          f"Recorded {data.category.value}: {data.amount}", asset.name, asset_id)
-    db.commit()
-    db.refresh(event)
+    if score.is_anomaly:
+        db.add(anomalies.alert_entry(asset_id, asset.name, event.category, event.amount, score))
+    await _store_detail(db, asset_id)
+    await db.commit()
+    await db.refresh(event)
     return event
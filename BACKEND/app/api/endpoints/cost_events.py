@@ -1,14 +1,16 @@
-from datetime import date
-from typing import List, Optional
+from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends, Query
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.filters import cost_event_filters
+from app.core.pagination import keyset_paginate, split_page
 from app.core.security import get_current_user
-from app.database import get_db
+from app.dependencies import get_async_read_db
 from app.models.asset import Asset, CostCategory, CostEvent
 from app.schemas.asset import CostEventResponse
+from app.schemas.pagination import Page
 
 router = APIRouter()
 
@@ -20,38 +22,49 @@ class CostEventWithAsset(CostEventResponse):
         from_attributes = True
 
 
-@router.get("/", response_model=List[CostEventWithAsset])
+class CostEventPage(Page[CostEventWithAsset]):
+    # Summed amount per category across every matching event, not just this
+    # page; only filled in with ``total``
+    category_totals: Optional[Dict[CostCategory, str]] = None
+
+
+@router.get("/", response_model=CostEventPage)
 async def list_all_cost_events(
-    asset_id: Optional[int] = Query(default=None),
-    category: Optional[CostCategory] = Query(default=None),
-    start_date: Optional[date] = Query(default=None),
-    end_date: Optional[date] = Query(default=None),
+    filters: list = Depends(cost_event_filters),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    query = db.query(CostEvent).join(Asset, CostEvent.asset_id == Asset.id)
-
-    if asset_id is not None:
-        query = query.filter(CostEvent.asset_id == asset_id)
-    if category is not None:
-        query = query.filter(CostEvent.category == category)
-    if start_date is not None:
-        query = query.filter(CostEvent.date >= start_date)
-    if end_date is not None:
-        query = query.filter(CostEvent.date <= end_date)
-
-    events = query.order_by(CostEvent.date.desc()).all()
-
-    results = []
-    for event in events:
-        results.append(CostEventWithAsset(
-            id=event.id,
-            asset_id=event.asset_id,
-            asset_name=event.asset.name,
-            date=event.date,
-            category=event.category,
-            description=event.description,
-            amount=str(event.amount),
-            created_at=event.created_at,
-        ))
-    return results
+    total = category_totals = None
+    if include_total:
+        result = await db.execute(
+            select(CostEvent.category, func.count(CostEvent.id), func.sum(CostEvent.amount))
+            .where(*filters)
+            .group_by(CostEvent.category)
+        )
+        sums = result.all()
+        total = sum(count for _, count, _ in sums)
+        category_totals = {cat: str(amount) for cat, _, amount in sums}
+
+    # One joined query for the page; rows go out as plain dicts so the
+    # response model is the only validation pass
+    stmt = (
+        select(
+            CostEvent.id, CostEvent.asset_id, Asset.name.label("asset_name"),
+            CostEvent.date, CostEvent.category, CostEvent.description,
+            CostEvent.amount, CostEvent.created_at,
+        )
+        .join(Asset, CostEvent.asset_id == Asset.id)
+        .where(*filters)
+    )
+    rows = (await db.execute(keyset_paginate(stmt, (CostEvent.date, CostEvent.id), cursor, limit))).all()
+    rows, next_cursor = split_page(rows, limit, lambda r: (r.date, r.id))
+
+    return {
+        "items": [row._asdict() for row in rows],
+        "next_cursor": next_cursor,
+        "total": total,
+        "category_totals": category_totals,
+    }
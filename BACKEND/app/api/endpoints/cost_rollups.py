@@ -0,0 +1,51 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_current_user
+from app.dependencies import get_async_read_db
+from app.models.asset import CostCategory
+from app.schemas.cost_rollup import CostRollupSummary
+from app.services import cost_rollups
+
+router = APIRouter()
+
+_MONTH = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def _parse_month(value: Optional[str]) -> Optional[date]:
+    if value is None:
+        return None
+    year, month = value.split("-")
+    return date(int(year), int(month), 1)
+
+
+@router.get("/", response_model=CostRollupSummary)
+async def cost_rollup_summary(
+    start: Optional[str] = Query(default=None, pattern=_MONTH, description="First month, YYYY-MM"),
+    end: Optional[str] = Query(default=None, pattern=_MONTH, description="Last month, YYYY-MM"),
+    asset_id: Optional[int] = Query(default=None),
+    category: Optional[CostCategory] = Query(default=None),
+    group_by: str = Query(
+        default="",
+        description="Comma-separated breakdown: " + ", ".join(cost_rollups.GROUPINGS)
+        + ". Empty for a single portfolio-wide total.",
+    ),
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    groupings = [g.strip() for g in group_by.split(",") if g.strip()]
+    unknown = sorted(set(groupings) - set(cost_rollups.GROUPINGS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown grouping: {', '.join(unknown)}")
+
+    start_month, end_month = _parse_month(start), _parse_month(end)
+    if start_month and end_month and start_month > end_month:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    summary = await db.run_sync(
+        cost_rollups.summarize, start_month, end_month, asset_id, category, groupings,
+    )
+    return CostRollupSummary(start=start_month, end=end_month, group_by=groupings, **summary)
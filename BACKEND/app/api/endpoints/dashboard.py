@@ -1,71 +1,53 @@
-from decimal import Decimal
+from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_current_user
-from app.database import get_db
-from app.models.asset import Asset, AssetStatus, AssetType, CostEvent
-from app.schemas.dashboard import DashboardStats
+from app.database import get_async_db
+from app.dependencies import get_async_read_db, get_read_pinned
+from app.models.asset import AssetStatus, AssetType
+from app.schemas.dashboard import DashboardStats, DashboardTrend
+from app.schemas.upcoming import UpcomingDigestResponse
+from app.services import dashboard, dashboard_history, upcoming
 
 router = APIRouter()
 
 
 @router.get("/stats", response_model=DashboardStats)
 async def dashboard_stats(
+    parish: Optional[str] = Query(default=None),
+    type: Optional[AssetType] = Query(default=None),
+    status: Optional[AssetStatus] = Query(default=None),
+    owner: Optional[str] = Query(default=None, description="Exact owner name; empty for unowned assets"),
     current_user_email: str = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    # Cached for everyone, so computed from the primary (see dashboard.get_stats)
+    db: AsyncSession = Depends(get_async_db),
+    pinned: bool = Depends(get_read_pinned),
 ):
-    total_assets = db.query(func.count(Asset.id)).scalar() or 0
+    return await dashboard.get_stats(db, parish, type, status, owner, pinned)
 
-    total_portfolio_value = (
-        db.query(func.sum(Asset.purchase_price))
-        .scalar()
-    ) or Decimal("0")
 
-    total_mortgage_balance = (
-        db.query(func.sum(Asset.mortgage_balance))
-        .filter(Asset.has_mortgage.is_(True))
-        .scalar()
-    ) or Decimal("0")
-
-    total_monthly_rental_income = (
-        db.query(func.sum(Asset.rental_monthly_income))
-        .filter(Asset.has_rental.is_(True))
-        .scalar()
-    ) or Decimal("0")
-
-    # Assets by type
-    type_rows = (
-        db.query(Asset.type, func.count(Asset.id))
-        .group_by(Asset.type)
-        .all()
-    )
-    assets_by_type = {row[0].value: row[1] for row in type_rows}
-
-    # Assets by status
-    status_rows = (
-        db.query(Asset.status, func.count(Asset.id))
-        .group_by(Asset.status)
-        .all()
-    )
-    assets_by_status = {row[0].value: row[1] for row in status_rows}
+@router.get("/trend", response_model=DashboardTrend)
+async def dashboard_trend(
+    start: Optional[date] = Query(default=None, description="Defaults to 90 days before end"),
+    end: Optional[date] = Query(default=None, description="Defaults to today (UTC)"),
+    max_points: int = Query(default=120, ge=2, le=1000),
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    default_start, default_end = dashboard_history.default_range()
+    end = end or default_end
+    start = start or (end - (default_end - default_start))
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    return await db.run_sync(dashboard_history.trend, start, end, max_points)
 
-    # Assets needing attention
-    attention_statuses = [AssetStatus.UNDER_RENOVATION, AssetStatus.IN_MAINTENANCE]
-    assets_needing_attention = (
-        db.query(func.count(Asset.id))
-        .filter(Asset.status.in_(attention_statuses))
-        .scalar()
-    ) or 0
 
-    return DashboardStats(
-        total_assets=total_assets,
-        total_portfolio_value=str(total_portfolio_value),
-        total_mortgage_balance=str(total_mortgage_balance),
-        total_monthly_rental_income=str(total_monthly_rental_income),
-        assets_by_type=assets_by_type,
-        assets_by_status=assets_by_status,
-        assets_needing_attention=assets_needing_attention,
-    )
+@router.get("/upcoming", response_model=UpcomingDigestResponse)
+async def dashboard_upcoming(
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await db.run_sync(upcoming.latest_digest)
@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.filters import activity_filters, asset_filters, cost_event_filters
+from app.core.security import get_async_db_user, get_current_user
+from app.dependencies import get_async_read_db, get_async_read_session_factory
+from app.models.activity_log import ActivityLog
+from app.models.asset import Asset, CostEvent
+from app.models.user import UserRole
+from app.services.exports import MEDIA_TYPES, export_response
+
+router = APIRouter()
+
+_FORMAT = Query(default="csv", pattern="^(" + "|".join(MEDIA_TYPES) + ")$")
+
+# Drive bookkeeping that means nothing outside the app
+_ASSET_EXPORT_EXCLUDED = {"photo_drive_id"}
+
+
+@router.get("/assets")
+async def export_assets(
+    format: str = _FORMAT,
+    filters: list = Depends(asset_filters),
+    current_user_email: str = Depends(get_current_user),
+    session_factory=Depends(get_async_read_session_factory),
+):
+    columns = [c for c in Asset.__table__.columns if c.name not in _ASSET_EXPORT_EXCLUDED]
+    stmt = (
+        select(*columns)
+        .where(*filters)
+        .order_by(Asset.created_at.desc(), Asset.id.desc())
+    )
+    return export_response(stmt, format, "assets", session_factory)
+
+
+@router.get("/cost-events")
+async def export_cost_events(
+    format: str = _FORMAT,
+    filters: list = Depends(cost_event_filters),
+    current_user_email: str = Depends(get_current_user),
+    session_factory=Depends(get_async_read_session_factory),
+):
+    stmt = (
+        select(
+            CostEvent.id, CostEvent.asset_id, Asset.name.label("asset_name"),
+            CostEvent.date, CostEvent.category, CostEvent.description,
+            CostEvent.amount, CostEvent.created_at,
+        )
+        .join(Asset, CostEvent.asset_id == Asset.id)
+        .where(*filters)
+        .order_by(CostEvent.date.desc(), CostEvent.id.desc())
+    )
+    return export_response(stmt, format, "cost-events", session_factory)
+
+
+@router.get("/activity")
+async def export_activity(
+    format: str = _FORMAT,
+    filters: list = Depends(activity_filters),
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+    session_factory=Depends(get_async_read_session_factory),
+):
+    current_user = await get_async_db_user(current_user_email, db)
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can export the activity log")
+
+    stmt = (
+        select(*ActivityLog.__table__.columns)
+        .where(*filters)
+        .order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
+    )
+    return export_response(stmt, format, "activity", session_factory)
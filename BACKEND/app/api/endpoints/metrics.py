@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user, get_db_user
+from app.database import get_db
+from app.database.database import (
+    DB_READ_YOUR_WRITES_SECONDS,
+    engines,
+    pool_status,
+)
+from app.models.user import UserRole
+from app.schemas.metrics import DatabaseMetrics
+
+router = APIRouter()
+
+
+@router.get("/db", response_model=DatabaseMetrics)
+async def database_metrics(
+    current_user_email: str = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    current_user = get_db_user(current_user_email, db)
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can view database metrics")
+
+    return DatabaseMetrics(
+        replica_enabled="replica" in engines,
+        read_your_writes_seconds=DB_READ_YOUR_WRITES_SECONDS,
+        pools={name: pool_status(engine) for name, engine in engines.items()},
+    )
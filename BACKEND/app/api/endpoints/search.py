@@ -0,0 +1,60 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.security import get_current_user, get_db_user
+from app.dependencies import get_read_db
+from app.models.user import UserRole
+from app.schemas.search import AssetSearchResult, SearchHit, UserSearchResult
+from app.services import fulltext, typeahead
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[SearchHit])
+async def search_everything(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[List[str]] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user_email: str = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    unknown = set(types or []) - set(fulltext.ENTITY_NAMES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown search types: {', '.join(sorted(unknown))}",
+        )
+
+    current_user = get_db_user(current_user_email, db)
+    if not current_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return fulltext.search(
+        db, q,
+        is_admin=current_user.role == UserRole.ADMIN,
+        user_id=current_user.id,
+        types=types,
+        limit=limit,
+    )
+
+
+@router.get("/users", response_model=List[UserSearchResult])
+async def typeahead_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    current_user_email: str = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    return typeahead.search_users(db, q, limit)
+
+
+@router.get("/assets", response_model=List[AssetSearchResult])
+async def typeahead_assets(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    current_user_email: str = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    return typeahead.search_assets(db, q, limit)
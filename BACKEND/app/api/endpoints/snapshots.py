@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_async_db_user, get_current_user
+from app.database import get_async_db
+from app.models.user import UserRole
+from app.schemas.snapshot import SnapshotManifest, SnapshotRequest, SnapshotRun
+from app.services import snapshots
+
+router = APIRouter()
+
+
+async def _require_admin(current_user_email: str, db: AsyncSession):
+    current_user = await get_async_db_user(current_user_email, db)
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Only admins can manage snapshots")
+
+
+@router.get("/", response_model=SnapshotManifest)
+async def get_snapshot_manifest(
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await _require_admin(current_user_email, db)
+    manifest = await run_in_threadpool(snapshots.load_manifest)
+    return SnapshotManifest(
+        directory=snapshots.SNAPSHOT_DIR,
+        interval_seconds=snapshots.SNAPSHOT_INTERVAL_SECONDS,
+        tables=manifest["tables"],
+    )
+
+
+@router.post("/", response_model=SnapshotRun)
+async def run_snapshot(
+    request: SnapshotRequest,
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await _require_admin(current_user_email, db)
+    try:
+        return await run_in_threadpool(snapshots.run_snapshot, request.tables, request.full)
+    except snapshots.SnapshotInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
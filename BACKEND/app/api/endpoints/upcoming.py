@@ -0,0 +1,27 @@
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_current_user
+from app.dependencies import get_async_read_db
+from app.schemas.pagination import Page
+from app.schemas.upcoming import UpcomingEvent
+from app.services import upcoming
+
+router = APIRouter()
+
+
+@router.get("/", response_model=Page[UpcomingEvent])
+async def list_upcoming(
+    kind: Optional[List[Literal["lease_end", "service_due", "attention"]]] = Query(
+        default=None, description="Limit to these kinds of event; repeatable",
+    ),
+    days: int = Query(default=upcoming.UPCOMING_WINDOW_DAYS, ge=0, le=3650),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(default=None),
+    current_user_email: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    kinds = tuple(dict.fromkeys(kind)) if kind else upcoming.KINDS
+    return await db.run_sync(upcoming.list_events, kinds, days, limit, cursor)
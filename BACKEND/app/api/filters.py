@@ -0,0 +1,77 @@
+"""
+Query filters shared by the list and export endpoints.
+
+Each function is a FastAPI dependency: it declares the filter's query
+parameters and returns the matching WHERE clauses, so a listing and its
+export accept exactly the same filters.
+"""
+from datetime import date
+from typing import List, Optional
+
+from fastapi import Query
+
+from app.models.activity_log import ActivityEventType, ActivityLog
+from app.models.asset import Asset, AssetStatus, AssetType, ConditionRating, CostCategory, CostEvent
+
+
+def asset_filters(
+    type: Optional[AssetType] = Query(default=None),
+    status: Optional[AssetStatus] = Query(default=None),
+    parish: Optional[str] = Query(default=None),
+    owner: Optional[str] = Query(default=None, description="Exact owner name"),
+    has_mortgage: Optional[bool] = Query(default=None),
+    has_rental: Optional[bool] = Query(default=None),
+    condition: Optional[ConditionRating] = Query(default=None, description="Latest condition rating"),
+    min_units: Optional[int] = Query(default=None, ge=0),
+    has_documents: Optional[bool] = Query(default=None),
+) -> List:
+    filters = []
+    if type is not None:
+        filters.append(Asset.type == type)
+    if status is not None:
+        filters.append(Asset.status == status)
+    if parish is not None:
+        filters.append(Asset.parish == parish)
+    if owner is not None:
+        filters.append(Asset.owner_name == owner)
+    if has_mortgage is not None:
+        filters.append(Asset.has_mortgage == has_mortgage)
+    if has_rental is not None:
+        filters.append(Asset.has_rental == has_rental)
+    if condition is not None:
+        filters.append(Asset.latest_condition == condition)
+    if min_units is not None:
+        filters.append(Asset.unit_count >= min_units)
+    if has_documents is not None:
+        filters.append(Asset.document_count > 0 if has_documents else Asset.document_count == 0)
+    return filters
+
+
+def cost_event_filters(
+    asset_id: Optional[int] = Query(default=None),
+    category: Optional[CostCategory] = Query(default=None),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+) -> List:
+    filters = []
+    if asset_id is not None:
+        filters.append(CostEvent.asset_id == asset_id)
+    if category is not None:
+        filters.append(CostEvent.category == category)
+    if start_date is not None:
+        filters.append(CostEvent.date >= start_date)
+    if end_date is not None:
+        filters.append(CostEvent.date <= end_date)
+    return filters
+
+
+def activity_filters(
+    event_type: Optional[ActivityEventType] = Query(default=None),
+) -> List:
+    filters = []
+    if event_type is not None:
+        filters.append(ActivityLog.event_type == event_type)
+    return filters
+
+
+__all__ = ["asset_filters", "cost_event_filters", "activity_filters"]
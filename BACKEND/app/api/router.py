@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from app.api import auth
 from app.api import document_management
-from app.api.endpoints import project_notes, assets, dashboard, cost_events, activity, users
+from app.api.endpoints import project_notes, assets, dashboard, cost_events, cost_rollups, activity, users, search, metrics, exports, snapshots, analytics, upcoming
 
 api_router = APIRouter()
 
@@ -42,6 +42,12 @@ api_router.include_router(
     tags=["cost-events"]
 )
 
+api_router.include_router(
+    cost_rollups.router,
+    prefix="/cost-rollups",
+    tags=["cost-rollups"]
+)
+
 api_router.include_router(
     activity.router,
     prefix="/activity-feed",
@@ -54,4 +60,38 @@ api_router.include_router(
     tags=["users"]
 )
 
+api_router.include_router(
+    search.router,
+    prefix="/search",
+    tags=["search"]
+)
+
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["metrics"]
+)
 
+api_router.include_router(
+    exports.router,
+    prefix="/exports",
+    tags=["exports"]
+)
+
+api_router.include_router(
+    snapshots.router,
+    prefix="/snapshots",
+    tags=["snapshots"]
+)
+
+api_router.include_router(
+    analytics.router,
+    prefix="/analytics",
+    tags=["analytics"]
+)
+
+api_router.include_router(
+    upcoming.router,
+    prefix="/upcoming",
+    tags=["upcoming"]
+)
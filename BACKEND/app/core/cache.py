@@ -0,0 +1,51 @@
+"""
+Small in-process caches for values that are expensive to compute and
+tolerate brief staleness.
+
+Each worker process has its own cache, so writes made through another worker
+are only seen once the entry expires; routes that change the underlying data
+invalidate the local entries directly.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ExpiringCache:
+    """Thread-safe key/value cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                # Drop the entry closest to expiry to make room
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, *keys: Hashable):
+        """Drop ``keys``, or every entry when called without arguments."""
+        with self._lock:
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+__all__ = ["ExpiringCache"]
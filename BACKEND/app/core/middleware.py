@@ -0,0 +1,50 @@
+from app.core.security import WRITE_PIN_HEADER, create_write_pin, get_token_subject
+from app.database.database import DB_READ_YOUR_WRITES_SECONDS
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    """Pin the user's next reads to the primary after a successful write.
+
+    The pin is a short-lived signed token returned in the
+    ``X-Read-Your-Writes`` header; the client sends it back on its next
+    requests, so the pin holds whichever worker or instance serves them.
+
+    Pure ASGI so streamed responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or DB_READ_YOUR_WRITES_SECONDS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                pin = self._pin(scope)
+                if pin:
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (WRITE_PIN_HEADER.lower().encode(), pin.encode())],
+                    }
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _pin(scope):
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    email = get_token_subject(token)
+                    if email:
+                        return create_write_pin(email)
+                return None
+        return None
+
+
+__all__ = ["ReadYourWritesMiddleware"]
@@ -0,0 +1,80 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and then
+base64url-encoded so clients treat it as opaque. The next page is the rows
+strictly after that key in sort order. With an index on the key columns this
+is a single index range scan, however deep the page.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import literal, tuple_
+from sqlalchemy.types import TypeDecorator
+
+
+def encode_cursor(*values) -> str:
+    payload = [
+        v.isoformat() if isinstance(v, (date, datetime)) else str(v) if isinstance(v, Decimal) else v
+        for v in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """Decode ``cursor`` into one value per type in ``types``; 400 if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(
+            t.fromisoformat(v) if t in (date, datetime) else t(v)
+            for t, v in zip(types, payload)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError, InvalidOperation):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _python_type(column) -> type:
+    column_type = column.type
+    # e.g. SQLModel's AutoString, which doesn't report a python type itself
+    if isinstance(column_type, TypeDecorator):
+        column_type = column_type.impl_instance
+    return column_type.python_type
+
+
+def keyset_paginate(
+    stmt, columns: Sequence, cursor: Optional[str], limit: int, descending: bool = True
+):
+    """Order ``stmt`` on ``columns`` (newest-first by default) and start after ``cursor``.
+
+    Fetches one extra row so ``split_page`` can tell whether a next page
+    exists without a count query.
+    """
+    if cursor:
+        types = [_python_type(column) for column in columns]
+        values = decode_cursor(cursor, *types)
+        bound = [literal(v, type_=column.type) for column, v in zip(columns, values)]
+        if descending:
+            stmt = stmt.where(tuple_(*columns) < tuple_(*bound))
+        else:
+            stmt = stmt.where(tuple_(*columns) > tuple_(*bound))
+    order = [column.desc() if descending else column.asc() for column in columns]
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: Sequence, limit: int, key: Callable[[object], tuple]) -> Tuple[List, Optional[str]]:
+    """Trim the look-ahead row and return ``(items, next_cursor)``."""
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(*key(items[-1])) if len(rows) > limit else None
+    return items, next_cursor
+
+
+__all__ = ["encode_cursor", "decode_cursor", "keyset_paginate", "split_page"]
@@ -0,0 +1,66 @@
+"""
+In-process periodic jobs.
+
+Jobs are plain functions run on a worker thread every ``interval`` seconds
+from asyncio tasks started in the app lifespan, optionally once at start
+too, as a restart otherwise postpones the next run by a full interval. Each job is responsible for
+its own cross-process locking when several app workers run the scheduler.
+"""
+import asyncio
+import logging
+from typing import Callable, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob(NamedTuple):
+    name: str
+    interval: float
+    func: Callable[[], object]
+    run_at_start: bool
+
+
+_jobs: List[PeriodicJob] = []
+_tasks: List[asyncio.Task] = []
+
+
+def register_job(name: str, interval: float, func: Callable[[], object], run_at_start: bool = False):
+    """Run ``func`` every ``interval`` seconds once the scheduler starts; 0 disables it.
+
+    ``run_at_start`` also runs it as soon as the scheduler starts.
+    """
+    if interval <= 0:
+        logger.info("Periodic job %s is disabled", name)
+        return
+    _jobs.append(PeriodicJob(name, interval, func, run_at_start))
+
+
+async def _run_periodically(job: PeriodicJob):
+    if not job.run_at_start:
+        await asyncio.sleep(job.interval)
+    while True:
+        try:
+            await asyncio.to_thread(job.func)
+        except Exception:
+            logger.exception("Periodic job %s failed", job.name)
+        await asyncio.sleep(job.interval)
+
+
+def start_scheduler():
+    for job in _jobs:
+        _tasks.append(asyncio.create_task(_run_periodically(job), name=f"job:{job.name}"))
+
+
+async def stop_scheduler():
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    _jobs.clear()
+
+
+def scheduled_jobs() -> List[dict]:
+    return [{"name": job.name, "interval_seconds": job.interval} for job in _jobs]
+
+
+__all__ = ["register_job", "start_scheduler", "stop_scheduler", "scheduled_jobs"]
@@ -3,11 +3,15 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from typing import Optional
 import os
 import bcrypt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..models import Users
 from ..database import get_db
+from ..database.database import DB_READ_YOUR_WRITES_SECONDS
 
 load_dotenv()
 
@@ -50,6 +54,38 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# Response header carrying a write pin, echoed back by the client on its
+# following requests
+WRITE_PIN_HEADER = "X-Read-Your-Writes"
+_WRITE_PIN_SCOPE = "read-your-writes"
+
+def create_write_pin(email: str) -> str:
+    """A signed token pinning ``email``'s reads to the primary for the read-your-writes window.
+
+    The client carries the pin, so it holds whichever worker serves the
+    next request. It names the user outside ``sub`` so it can never pass
+    as an access token.
+    """
+    expire = datetime.utcnow() + timedelta(seconds=DB_READ_YOUR_WRITES_SECONDS)
+    return jwt.encode({"pinned": email, "scope": _WRITE_PIN_SCOPE, "exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
+
+def has_write_pin(pin: Optional[str], email: Optional[str]) -> bool:
+    """Whether ``pin`` is an unexpired write pin issued to ``email``."""
+    if not pin or not email:
+        return False
+    try:
+        payload = jwt.decode(pin, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return False
+    return payload.get("scope") == _WRITE_PIN_SCOPE and payload.get("pinned") == email
+
+def get_token_subject(token: str):
+    """Return the email a token was issued to, or None if it doesn't verify."""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
 def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -68,4 +104,8 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
 
 def get_db_user(email: str, db: Session = Depends(get_db)):
     user = db.query(Users).filter(Users.email == email).first()
-    return user
\ No newline at end of file
+    return user
+
+async def get_async_db_user(email: str, db: AsyncSession):
+    result = await db.execute(select(Users).where(Users.email == email))
+    return result.scalars().first()
@@ -0,0 +1,40 @@
+"""
+Shared process pool for CPU-bound work that must stay off the event loop.
+
+Workers are started with the "spawn" method so they never inherit the
+parent's database connections or lock state.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", "2"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the process-wide pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=PROCESS_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_process_pool(wait: bool = True):
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait, cancel_futures=not wait)
+            _pool = None
+
+
+__all__ = ["get_process_pool", "shutdown_process_pool"]
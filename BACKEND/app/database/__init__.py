@@ -1,7 +1,27 @@
-from .database import  engine, SessionLocal, get_db
+from .database import (
+    engine,
+    replica_engine,
+    SessionLocal,
+    ReadSessionLocal,
+    get_db,
+)
+from .async_database import (
+    async_engine,
+    async_replica_engine,
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+    get_async_db,
+)
 
 __all__ = [
     "engine",
+    "replica_engine",
     "SessionLocal",
+    "ReadSessionLocal",
     "get_db",
-]
\ No newline at end of file
+    "async_engine",
+    "async_replica_engine",
+    "AsyncSessionLocal",
+    "AsyncReadSessionLocal",
+    "get_async_db",
+]
@@ -0,0 +1,77 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .database import (
+    DATABASE_URL,
+    DATABASE_REPLICA_URL,
+    InstrumentedQueuePool,
+    engines,
+    pool_options,
+)
+
+# Sync driver -> async driver used for the same database
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with the same checkout wait metrics as the sync pools."""
+
+
+def async_url(url: str):
+    """Rewrite a sync DATABASE_URL for the matching async driver.
+
+    Returns the URL and any connect arguments that asyncpg needs in place of
+    libpq-only query parameters.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    connect_args = {}
+    if backend == 'postgresql':
+        query = dict(parsed.query)
+        # asyncpg takes ``ssl`` rather than ``sslmode``, and session settings
+        # such as application_name through ``server_settings``
+        if 'sslmode' in query:
+            query['ssl'] = query.pop('sslmode')
+        if 'application_name' in query:
+            connect_args['server_settings'] = {'application_name': query.pop('application_name')}
+        parsed = parsed.set(query=query)
+    return parsed.render_as_string(hide_password=False), connect_args
+
+
+def _create_engine(url: str):
+    target, connect_args = async_url(url)
+    return create_async_engine(
+        target,
+        connect_args=connect_args,
+        **pool_options(url, pool_base=InstrumentedAsyncQueuePool),
+    )
+
+
+async_engine = _create_engine(DATABASE_URL)
+engines['primary_async'] = async_engine
+
+if DATABASE_REPLICA_URL:
+    async_replica_engine = _create_engine(DATABASE_REPLICA_URL)
+    engines['replica_async'] = async_replica_engine
+else:
+    async_replica_engine = async_engine
+
+# Objects stay usable after commit; async sessions cannot lazily reload them
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,50 @@
+"""
+Additive upserts for summary tables.
+
+``increment`` adds deltas to the row identified by a unique key, inserting
+it on first use, as one atomic statement on PostgreSQL and SQLite so
+concurrent writers never lose an update. Rows whose count drops to zero
+are removed.
+"""
+from typing import Dict
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def increment(db: Session, model, key: Dict, deltas: Dict, count_column: str):
+    """Add ``deltas`` to the ``model`` row matching ``key`` (no commit).
+
+    ``key`` must cover a unique constraint on the table. The row is deleted
+    once ``count_column`` reaches zero.
+    """
+    table = model.__table__
+    match = [table.c[name] == value for name, value in key.items()]
+    dialect = db.get_bind().dialect.name
+
+    if dialect in _UPSERT_INSERTS:
+        stmt = _UPSERT_INSERTS[dialect](table).values(**key, **deltas)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={name: table.c[name] + stmt.excluded[name] for name in deltas},
+        ))
+    else:
+        updated = db.execute(
+            update(table).where(*match).values(
+                {name: table.c[name] + value for name, value in deltas.items()}
+            )
+        )
+        if not updated.rowcount:
+            db.execute(insert(table).values(**key, **deltas))
+
+    if deltas.get(count_column, 0) < 0:
+        db.execute(delete(table).where(*match, table.c[count_column] <= 0))
+
+
+__all__ = ["increment"]
@@ -1,7 +1,13 @@
 import os
+import threading
+import time
+from typing import Dict
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 
 from dotenv import load_dotenv
@@ -12,15 +18,130 @@ load_dotenv()
 
 
 DATABASE_URL = os.getenv('DATABASE_URL')
+# Optional read replica; read-only routes use it when set
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+
+# Connection pool tuning (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+# How long a user's reads stay on the primary after one of their own writes,
+# so they never see a replica that hasn't caught up yet
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', '5'))
+
+
+# ---------------------------------------------------------------------------
+# Pool instrumentation
+# ---------------------------------------------------------------------------
+
+class PoolMetrics:
+    """Checkout wait statistics for one engine's pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times how long each checkout waits for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+# name -> engine, for the metrics endpoint
+engines: Dict[str, object] = {}
+
+
+def pool_options(url: str, pool_base=InstrumentedQueuePool) -> dict:
+    """Pool keyword arguments for ``url``; SQLite keeps SQLAlchemy's defaults."""
+    if make_url(url).get_backend_name() == 'sqlite':
+        return {}
+    # A subclass per engine keeps its metrics attached across pool.recreate()
+    poolclass = type(pool_base.__name__, (pool_base,), {'metrics': PoolMetrics()})
+    return {
+        'poolclass': poolclass,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+
+
+def pool_status(engine) -> dict:
+    """Current utilisation and checkout wait statistics for ``engine``."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        status.update({
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "utilisation": round(checked_out / capacity, 3) if capacity else 0.0,
+        })
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
+
 
 # creates database engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
+engines['primary'] = engine
+
+if DATABASE_REPLICA_URL:
+    replica_engine = create_engine(DATABASE_REPLICA_URL, **pool_options(DATABASE_REPLICA_URL))
+    engines['replica'] = replica_engine
+else:
+    replica_engine = engine
 
 # configures session to be used for database operations
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# sessions for read-only routes (the primary when no replica is configured)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
 
-#creates a database session 
+#creates a database session
 def get_db():
     db = SessionLocal()
     try:
@@ -1,19 +1,58 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
-from .database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import (
+    ReadSessionLocal, SessionLocal,
+    AsyncReadSessionLocal, AsyncSessionLocal, get_async_db,
+)
 from .models import Users
+from .core import security
 from .core.security import SECRET_KEY, ALGORITHM
 from .googledrivefunc import DriveFileOperations, DriveConnection
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+def _pinned(request: Request, current_user_email: str) -> bool:
+    return security.has_write_pin(request.headers.get(security.WRITE_PIN_HEADER), current_user_email)
+
+def get_read_pinned(request: Request, current_user_email: str = Depends(security.get_current_user)) -> bool:
+    """Whether the request carries the user's write pin.
+
+    Routes serving shared cached results read the primary and use this to
+    bypass the cache, which may predate the user's write.
+    """
+    return _pinned(request, current_user_email)
+
+def get_read_db(request: Request, current_user_email: str = Depends(security.get_current_user)):
+    """Session for read-only routes.
+
+    Uses the read replica when one is configured, except for requests that
+    carry the user's write pin (see ``ReadYourWritesMiddleware``), whose reads
+    stay on the primary so they see their own changes.
+    """
+    session_factory = SessionLocal if _pinned(request, current_user_email) else ReadSessionLocal
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_async_read_session_factory(request: Request, current_user_email: str = Depends(security.get_current_user)):
+    """Session factory with ``get_read_db``'s routing, for work that outlives the request's session."""
+    return AsyncSessionLocal if _pinned(request, current_user_email) else AsyncReadSessionLocal
+
+async def get_async_read_db(session_factory=Depends(get_async_read_session_factory)):
+    """Async counterpart of ``get_read_db``."""
+    async with session_factory() as db:
+        yield db
+
 def get_drive_file_ops():
     drive_connection = DriveConnection()
     return DriveFileOperations(drive_connection.service)
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -27,7 +66,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(Users).filter(Users.email == email).first()
+    user = (await db.execute(select(Users.id).where(Users.email == email))).first()
     if user is None:
         raise credentials_exception
     return email
@@ -290,4 +290,29 @@ class DriveFileOperations:
 
         except Exception as e:
             print(f"❌ Download failed: {str(e)}")
-            raise Exception(f"Error downloading file: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error downloading file: {str(e)}")
+
+    def download_file_by_id(self, file_id):
+        """
+        Download a file from Google Drive by its file ID.
+
+        Args:
+            file_id (str): Drive ID of the file
+
+        Returns:
+            bytes: File content as bytes
+        """
+        try:
+            request = self.service.files().get_media(fileId=file_id)
+            file_content = io.BytesIO()
+            downloader = MediaIoBaseDownload(file_content, request)
+
+            done = False
+            while not done:
+                _, done = downloader.next_chunk()
+
+            return file_content.getvalue()
+
+        except Exception as e:
+            print(f"❌ Download failed: {str(e)}")
+            raise Exception(f"Error downloading file: {str(e)}")
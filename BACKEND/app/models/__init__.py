@@ -7,11 +7,19 @@ from .asset import (
     AssetType, AssetStatus, ConditionRating, LotSizeUnit, CostCategory,
 )
 from .activity_log import ActivityLog, ActivityEventType, ActivityStatus
+from .document_text import DocumentText, DocumentSource
+from .cost_rollup import CostRollup
+from .portfolio_cube import PortfolioCell
+from .dashboard_snapshot import DashboardSnapshot
+from .upcoming_digest import UpcomingDigest
+from .asset_detail_doc import AssetDetailDoc
 
 __all__ = [
     'Base', 'Users', 'Files', 'UserRole', 'ProjectNote',
     'Asset', 'ConditionEntry', 'Unit', 'AssetEquipment', 'AssetDocument', 'CostEvent',
     'AssetType', 'AssetStatus', 'ConditionRating', 'LotSizeUnit', 'CostCategory',
     'ActivityLog', 'ActivityEventType', 'ActivityStatus',
+    'DocumentText', 'DocumentSource',
+    'CostRollup', 'PortfolioCell', 'DashboardSnapshot', 'UpcomingDigest', 'AssetDetailDoc',
 ]
 
@@ -2,6 +2,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -22,6 +23,12 @@ class ActivityStatus(str, enum.Enum):
 
 class ActivityLog(SQLModel, table=True):
     __tablename__ = "activity_log"
+    __table_args__ = (
+        # Feed, newest first, with and without an event type filter; id
+        # breaks ties for keyset pagination
+        Index("ix_activity_log_created_at_id", "created_at", "id"),
+        Index("ix_activity_log_event_type_created_at_id", "event_type", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     event_type: ActivityEventType
@@ -3,7 +3,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Optional
 
-from sqlalchemy import Column, Numeric
+from sqlalchemy import Column, Index, Numeric
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -52,6 +52,25 @@ class CostCategory(str, enum.Enum):
 
 class Asset(SQLModel, table=True):
     __tablename__ = "assets"
+    __table_args__ = (
+        # Asset listing in each sort order, and newest first under each
+        # equality filter; id breaks ties for keyset pagination
+        Index("ix_assets_created_at_id", "created_at", "id"),
+        Index("ix_assets_updated_at_id", "updated_at", "id"),
+        Index("ix_assets_name_id", "name", "id"),
+        Index("ix_assets_type_created_at_id", "type", "created_at", "id"),
+        Index("ix_assets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_assets_parish_created_at_id", "parish", "created_at", "id"),
+        Index("ix_assets_owner_name_created_at_id", "owner_name", "created_at", "id"),
+        # Upcoming lease ends
+        Index("ix_assets_rental_lease_end_id", "rental_lease_end", "id"),
+        # Listing sorts and filters on the summary columns
+        Index("ix_assets_unit_count_id", "unit_count", "id"),
+        Index("ix_assets_occupied_unit_count_id", "occupied_unit_count", "id"),
+        Index("ix_assets_document_count_id", "document_count", "id"),
+        Index("ix_assets_costs_ytd_id", "costs_ytd", "id"),
+        Index("ix_assets_latest_condition_created_at_id", "latest_condition", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
@@ -75,6 +94,8 @@ class Asset(SQLModel, table=True):
     mortgage_lender: Optional[str] = None
     mortgage_balance: Optional[Decimal] = Field(default=None, sa_column=Column(Numeric(15, 2)))
     mortgage_monthly_payment: Optional[Decimal] = Field(default=None, sa_column=Column(Numeric(15, 2)))
+    # Annual percentage rate; NULL uses the portfolio default in forecasts
+    mortgage_interest_rate: Optional[Decimal] = Field(default=None, sa_column=Column(Numeric(7, 4)))
 
     # Rental (inline columns)
     has_rental: bool = Field(default=False)
@@ -83,6 +104,19 @@ class Asset(SQLModel, table=True):
     rental_lease_start: Optional[date] = None
     rental_lease_end: Optional[date] = None
 
+    # Summary of the child rows, kept in step by the asset routes
+    # (app/services/asset_summaries.py) so the listing needs no joins
+    unit_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    occupied_unit_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    equipment_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    document_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    latest_condition: Optional[ConditionRating] = None
+    latest_condition_date: Optional[date] = None
+    # Total of the cost events dated in costs_ytd_year; the year is moved on
+    # (and the total recomputed) by the year-start reset job
+    costs_ytd: Decimal = Field(default=Decimal("0"), sa_column=Column(Numeric(15, 2), nullable=False, server_default="0"))
+    costs_ytd_year: Optional[int] = Field(default_factory=lambda: datetime.utcnow().year)
+
     # Photo
     photo_drive_id: Optional[str] = None
     photo_url: Optional[str] = None
@@ -100,6 +134,10 @@ class Asset(SQLModel, table=True):
 
 class ConditionEntry(SQLModel, table=True):
     __tablename__ = "condition_entries"
+    __table_args__ = (
+        # An asset's latest rating
+        Index("ix_condition_entries_asset_id_date_id", "asset_id", "date", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     asset_id: int = Field(foreign_key="assets.id")
@@ -128,6 +166,10 @@ class Unit(SQLModel, table=True):
 
 class AssetEquipment(SQLModel, table=True):
     __tablename__ = "asset_equipment"
+    __table_args__ = (
+        # Upcoming and overdue service
+        Index("ix_asset_equipment_next_service_due_id", "next_service_due", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     asset_id: int = Field(foreign_key="assets.id")
@@ -158,6 +200,12 @@ class AssetDocument(SQLModel, table=True):
 
 class CostEvent(SQLModel, table=True):
     __tablename__ = "cost_events"
+    __table_args__ = (
+        # Per-asset cost history and the date-ranged cost listing; id breaks
+        # ties for keyset pagination
+        Index("ix_cost_events_asset_id_date_id", "asset_id", "date", "id"),
+        Index("ix_cost_events_date_id", "date", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     asset_id: int = Field(foreign_key="assets.id")
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Text
+from sqlmodel import Field, SQLModel
+
+
+class AssetDetailDoc(SQLModel, table=True):
+    """An asset's detail view, serialised as the detail endpoint returns it.
+
+    Rewritten by the asset routes in the same transaction as any change to
+    the asset or its child rows; ``scripts/rebuild_asset_details.py``
+    rebuilds it from scratch.
+    """
+    __tablename__ = "asset_detail_docs"
+
+    asset_id: int = Field(foreign_key="assets.id", primary_key=True)
+    # AssetResponse JSON, served byte for byte
+    body: str = Field(sa_column=Column(Text, nullable=False))
+    built_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+__all__ = ["AssetDetailDoc"]
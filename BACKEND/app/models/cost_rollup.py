@@ -0,0 +1,37 @@
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Column, Index, Numeric, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+from .asset import CostCategory
+
+
+class CostRollup(SQLModel, table=True):
+    """Cost events summed per asset, category and month.
+
+    Kept in step with ``cost_events`` by the cost routes, in the same
+    transaction as the event itself; ``scripts/rebuild_cost_rollups.py``
+    recomputes it from scratch.
+    """
+    __tablename__ = "cost_rollups"
+    __table_args__ = (
+        # One row per key; also serves per-asset month ranges
+        UniqueConstraint("asset_id", "category", "month"),
+        # Portfolio-wide month ranges
+        Index("ix_cost_rollups_month_category", "month", "category"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    asset_id: int = Field(foreign_key="assets.id")
+    category: CostCategory
+    # First day of the month
+    month: date
+    total: Decimal = Field(default=Decimal("0"), sa_column=Column(Numeric(15, 2), nullable=False))
+    event_count: int = Field(default=0)
+    # Sum of squared amounts, for the variance in cost anomaly scoring
+    total_squares: Decimal = Field(default=Decimal("0"), sa_column=Column(Numeric(30, 4), nullable=False, server_default="0"))
+
+
+__all__ = ["CostRollup"]
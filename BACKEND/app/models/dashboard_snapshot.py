@@ -0,0 +1,26 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy import JSON, Column, Numeric
+from sqlmodel import Field, SQLModel
+
+
+class DashboardSnapshot(SQLModel, table=True):
+    """The dashboard figures as they stood at the end of one day (UTC)."""
+    __tablename__ = "dashboard_snapshots"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    day: date = Field(unique=True)
+    total_assets: int
+    portfolio_value: Decimal = Field(sa_column=Column(Numeric(18, 2), nullable=False))
+    mortgage_balance: Decimal = Field(sa_column=Column(Numeric(18, 2), nullable=False))
+    rental_income: Decimal = Field(sa_column=Column(Numeric(18, 2), nullable=False))
+    assets_needing_attention: int
+    # Asset counts keyed by type / status value
+    assets_by_type: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    assets_by_status: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON, nullable=False))
+    recorded_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+__all__ = ["DashboardSnapshot"]
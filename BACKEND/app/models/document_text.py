@@ -0,0 +1,31 @@
+import enum
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, Text, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class DocumentSource(str, enum.Enum):
+    FILE = "file"
+    ASSET_DOCUMENT = "asset_document"
+
+
+class DocumentText(SQLModel, table=True):
+    """Plain text extracted from an uploaded document, kept for search."""
+    __tablename__ = "document_texts"
+    __table_args__ = (UniqueConstraint("source_type", "source_id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source_type: DocumentSource
+    source_id: int
+    title: str
+    # Copied from the source row so search can scope hits without a join
+    user_id: Optional[int] = Field(default=None, foreign_key="users.id")
+    asset_id: Optional[int] = Field(default=None, foreign_key="assets.id")
+    content: str = Field(sa_column=Column(Text, nullable=False))
+    char_count: int = Field(default=0)
+    extracted_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+__all__ = ["DocumentSource", "DocumentText"]
@@ -1,9 +1,18 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship, ForeignKey
 from typing import Optional
 from datetime import datetime
 
 class Files(SQLModel, table=True):
     __tablename__ = "files"
+    __table_args__ = (
+        # Per-user and admin listings, newest first; id breaks ties for
+        # keyset pagination
+        Index("ix_files_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_files_created_at_id", "created_at", "id"),
+        # Duplicate-name check on upload and download lookup
+        Index("ix_files_filename_user_id", "filename", "user_id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     filename: str
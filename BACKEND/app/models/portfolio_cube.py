@@ -0,0 +1,32 @@
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Column, Numeric, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+from .asset import AssetStatus, AssetType
+
+
+class PortfolioCell(SQLModel, table=True):
+    """Asset measures summed per parish, type, status and owner.
+
+    One row per combination that has assets, adjusted by the asset routes in
+    the same transaction as the write; the dashboard answers any filter from
+    these rows instead of scanning ``assets``.
+    """
+    __tablename__ = "portfolio_cube"
+    __table_args__ = (UniqueConstraint("parish", "type", "status", "owner"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    parish: str
+    type: AssetType
+    status: AssetStatus
+    # Empty for assets without an owner, so the unique key has no NULLs
+    owner: str = Field(default="")
+    asset_count: int = Field(default=0)
+    portfolio_value: Decimal = Field(default=Decimal("0"), sa_column=Column(Numeric(18, 2), nullable=False))
+    mortgage_balance: Decimal = Field(default=Decimal("0"), sa_column=Column(Numeric(18, 2), nullable=False))
+    rental_income: Decimal = Field(default=Decimal("0"), sa_column=Column(Numeric(18, 2), nullable=False))
+
+
+__all__ = ["PortfolioCell"]
@@ -0,0 +1,24 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+
+class UpcomingDigest(SQLModel, table=True):
+    """Upcoming lease ends, equipment service and attention statuses as of one day (UTC)."""
+    __tablename__ = "upcoming_digests"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    day: date = Field(unique=True)
+    window_days: int
+    leases_expiring: int
+    service_overdue: int
+    service_due: int
+    assets_needing_attention: int
+    # The soonest events, as returned by the upcoming-events endpoint
+    events: List[Dict] = Field(default_factory=list, sa_column=Column(JSON, nullable=False))
+    recorded_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+__all__ = ["UpcomingDigest"]
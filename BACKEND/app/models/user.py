@@ -10,9 +10,9 @@ class Users(SQLModel, table=True):
     __tablename__ = "users"
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    email: str = Field(index=True)
-    password: str = Field(index=True)
-    fullname: str = Field(index=True)
+    email: str = Field(index=True, unique=True)
+    password: str
+    fullname: str
     role: UserRole = Field(default=UserRole.USER)
     files: List["Files"] = Relationship(back_populates="users")
 
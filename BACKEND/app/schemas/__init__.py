@@ -19,6 +19,8 @@ from .asset import (
 )
 from .activity_log import ActivityLogResponse
 from .dashboard import DashboardStats
+from .search import UserSearchResult, AssetSearchResult, SearchHit
+from .metrics import PoolStatus, DatabaseMetrics
 
 __all__ = [
     "Token", "TokenData", "UserLogin",
@@ -34,4 +36,6 @@ __all__ = [
     "CostEventCreate", "CostEventResponse",
     "ActivityLogResponse",
     "DashboardStats",
+    "UserSearchResult", "AssetSearchResult", "SearchHit",
+    "PoolStatus", "DatabaseMetrics",
 ]
\ No newline at end of file
@@ -0,0 +1,221 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.asset import ConditionRating, CostCategory
+
+
+class AssetCashFlow(BaseModel):
+    asset_id: int
+    name: str
+    units: int
+    let_units: int
+    rent_roll: float
+    occupied_rent: float
+    vacancy_loss: float
+    operating_expenses: float
+    noi: float
+    debt_service: float
+    capital_expenses: float
+    cash_flow: float
+    # Vacant share of units (None for assets with no rent at all)
+    vacancy_rate: Optional[float] = None
+    # Annual NOI over purchase price
+    cap_rate: Optional[float] = None
+
+
+class PortfolioCashFlow(BaseModel):
+    asset_count: int
+    units: int
+    let_units: int
+    rent_roll: float
+    occupied_rent: float
+    vacancy_loss: float
+    operating_expenses: float
+    noi: float
+    debt_service: float
+    capital_expenses: float
+    cash_flow: float
+    vacancy_rate: Optional[float] = None
+
+
+class CashFlowReport(BaseModel):
+    months: int
+    since: date
+    portfolio: PortfolioCashFlow
+    assets: List[AssetCashFlow]
+    compute_ms: float
+
+
+class MortgageSchedule(BaseModel):
+    asset_id: int
+    name: str
+    balance: float
+    monthly_payment: float
+    # Annual percentage rate used for the forecast
+    interest_rate: float
+    rate_is_default: bool
+    # None when the payment does not cover the interest
+    months_remaining: Optional[int] = None
+    payoff_date: Optional[date] = None
+    total_interest: Optional[float] = None
+
+
+class PortfolioDebt(BaseModel):
+    mortgages: int
+    balance: float
+    monthly_payment: float
+    total_interest: float
+    never_paid_off: int
+    final_payoff_date: Optional[date] = None
+
+
+class DebtCurvePoint(BaseModel):
+    month: date
+    # Outstanding after the month's payments
+    balance: float
+    interest: float
+    principal: float
+
+
+class MortgageForecast(BaseModel):
+    as_of: date
+    default_rate: float
+    horizon_months: int
+    portfolio: PortfolioDebt
+    assets: List[MortgageSchedule]
+    debt_curve: List[DebtCurvePoint]
+    compute_ms: float
+
+
+class StressParameters(BaseModel):
+    scenarios: int = Field(default=10_000, ge=100, le=100_000)
+    horizon_months: int = Field(default=12, ge=1, le=120)
+    # Trailing months of costs behind the baseline
+    months: int = Field(default=12, ge=1, le=120)
+    # Shocks are normal draws per scenario; all figures in percent
+    rent_change_mean: float = 0.0
+    rent_change_sd: float = Field(default=5.0, ge=0)
+    cost_inflation_mean: float = 5.0
+    cost_inflation_sd: float = Field(default=3.0, ge=0)
+    # Percentage points added to every mortgage's annual rate
+    rate_rise_mean: float = 1.0
+    rate_rise_sd: float = Field(default=1.0, ge=0)
+    # Share of let units vacated, clipped to 0-100
+    vacancy_mean: float = Field(default=10.0, ge=0, le=100)
+    vacancy_sd: float = Field(default=5.0, ge=0)
+    percentiles: List[float] = Field(default=[5, 25, 50, 75, 95], min_length=1, max_length=20)
+    seed: int = 0
+
+    @field_validator("percentiles")
+    @classmethod
+    def check_percentiles(cls, v):
+        if any(p < 0 or p > 100 for p in v):
+            raise ValueError("percentiles must be between 0 and 100")
+        return sorted(set(v))
+
+
+class StressBaseline(BaseModel):
+    monthly_noi: float
+    monthly_cash_flow: float
+    horizon_cash_flow: float
+
+
+class StressBand(BaseModel):
+    month: int
+    # Portfolio cash flow for the month, by percentile ("p5", "p50", ...)
+    cash_flow: Dict[str, float]
+
+
+class StressTestResult(BaseModel):
+    as_of: datetime
+    parameters: StressParameters
+    asset_count: int
+    baseline: StressBaseline
+    # Percentiles across scenarios, keyed "p5", "p50", ...
+    monthly_noi: Dict[str, float]
+    monthly_cash_flow: Dict[str, float]
+    horizon_cash_flow: Dict[str, float]
+    # Share of scenarios with negative cash flow over the horizon
+    probability_negative: float
+    negative_assets: Dict[str, float]
+    bands: List[StressBand]
+    in_process_pool: bool
+    compute_ms: float
+
+
+class CostAnomaly(BaseModel):
+    cost_event_id: int
+    asset_id: int
+    asset_name: str
+    category: CostCategory
+    date: date
+    amount: Decimal
+    # Events of the same asset and category dated before this one in the window
+    window_events: int
+    window_mean: float
+    z: float
+
+
+class CostAnomalyReport(BaseModel):
+    window_months: int
+    z_threshold: float
+    scored: int
+    anomalies: List[CostAnomaly]
+
+
+class ConditionForecast(BaseModel):
+    latest_rating: ConditionRating
+    latest_rating_date: date
+    ratings: int
+    # Score change per year (Good 3 ... Critical 0); negative means degrading
+    trend_per_year: Optional[float] = None
+    # None when the trend is flat, rising or unknown
+    poor_by: Optional[date] = None
+    critical_by: Optional[date] = None
+
+
+class EquipmentForecast(BaseModel):
+    equipment_id: int
+    name: str
+    condition: ConditionRating
+    service_due: Optional[date] = None
+    replace_by: Optional[date] = None
+    service_overdue: bool
+    service_due_soon: bool
+    replacement_due: bool
+
+
+class AssetMaintenanceForecast(BaseModel):
+    asset_id: int
+    name: str
+    condition: Optional[ConditionForecast] = None
+    # Projected to reach Poor within the horizon (or already there)
+    degrading: bool
+    equipment: List[EquipmentForecast]
+
+
+class MaintenanceSummary(BaseModel):
+    assets_degrading: int
+    service_due: int
+    service_overdue: int
+    replacement_due: int
+
+
+class MaintenanceForecast(BaseModel):
+    as_of: date
+    horizon_days: int
+    assets: List[AssetMaintenanceForecast]
+    summary: MaintenanceSummary
+
+
+__all__ = [
+    "AssetCashFlow", "PortfolioCashFlow", "CashFlowReport",
+    "MortgageSchedule", "PortfolioDebt", "DebtCurvePoint", "MortgageForecast",
+    "StressParameters", "StressBaseline", "StressBand", "StressTestResult",
+    "CostAnomaly", "CostAnomalyReport",
+    "ConditionForecast", "EquipmentForecast", "AssetMaintenanceForecast",
+    "MaintenanceSummary", "MaintenanceForecast",
+]
@@ -40,6 +40,8 @@ class MortgageInfo(BaseModel):
     lender: str
     balance: str
     monthly_payment: str
+    # Annual percentage rate, e.g. "7.25"
+    interest_rate: Optional[str] = None
 
 
 class RentalInfo(BaseModel):
@@ -271,10 +273,19 @@ class AssetSummary(BaseModel):
     has_mortgage: bool
     has_rental: bool
     photo_url: Optional[str] = None
+    unit_count: int = 0
+    occupied_unit_count: int = 0
+    equipment_count: int = 0
+    document_count: int = 0
+    latest_condition: Optional[ConditionRating] = None
+    latest_condition_date: Optional[date] = None
+    # Cost events dated in costs_ytd_year
+    costs_ytd: str = "0"
+    costs_ytd_year: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
-    @field_validator("purchase_price", mode="before")
+    @field_validator("purchase_price", "costs_ytd", mode="before")
     @classmethod
     def coerce_purchase_price(cls, v):
         return _from_decimal(v) if isinstance(v, Decimal) else v
@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel, field_validator
+
+from app.models.asset import CostCategory
+
+
+def _from_decimal(value):
+    return str(value) if isinstance(value, (Decimal, int, float)) else value
+
+
+class CostRollupRow(BaseModel):
+    # Only the dimensions that were grouped by are filled in
+    asset_id: Optional[int] = None
+    asset_name: Optional[str] = None
+    category: Optional[CostCategory] = None
+    month: Optional[date] = None
+    total: str
+    event_count: int
+
+    @field_validator("total", mode="before")
+    @classmethod
+    def coerce_total(cls, v):
+        return _from_decimal(v)
+
+
+class CostRollupSummary(BaseModel):
+    start: Optional[date] = None
+    end: Optional[date] = None
+    group_by: List[str]
+    rows: List[CostRollupRow]
+    total: str
+    event_count: int
+
+    @field_validator("total", mode="before")
+    @classmethod
+    def coerce_total(cls, v):
+        return _from_decimal(v)
+
+
+__all__ = ["CostRollupRow", "CostRollupSummary"]
@@ -1,6 +1,8 @@
-from typing import Dict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class DashboardStats(BaseModel):
@@ -13,4 +15,31 @@ class DashboardStats(BaseModel):
     assets_needing_attention: int
 
 
-__all__ = ["DashboardStats"]
+class DashboardSnapshotPoint(BaseModel):
+    day: date
+    total_assets: int
+    portfolio_value: str
+    mortgage_balance: str
+    rental_income: str
+    assets_needing_attention: int
+    assets_by_type: Dict[str, int]
+    assets_by_status: Dict[str, int]
+
+    @field_validator("portfolio_value", "mortgage_balance", "rental_income", mode="before")
+    @classmethod
+    def coerce_money(cls, v):
+        return str(v) if isinstance(v, Decimal) else v
+
+    class Config:
+        from_attributes = True
+
+
+class DashboardTrend(BaseModel):
+    start: date
+    end: date
+    # Days per point; above 1 each point is the last snapshot in its bucket
+    step_days: int
+    points: List[DashboardSnapshotPoint]
+
+
+__all__ = ["DashboardStats", "DashboardSnapshotPoint", "DashboardTrend"]
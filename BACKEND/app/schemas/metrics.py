@@ -0,0 +1,26 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    pool_class: str
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_out: Optional[int] = None
+    checked_in: Optional[int] = None
+    overflow: Optional[int] = None
+    utilisation: Optional[float] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    avg_wait_ms: Optional[float] = None
+    max_wait_ms: Optional[float] = None
+
+
+class DatabaseMetrics(BaseModel):
+    replica_enabled: bool
+    read_your_writes_seconds: float
+    pools: Dict[str, PoolStatus]
+
+
+__all__ = ["PoolStatus", "DatabaseMetrics"]
@@ -0,0 +1,16 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass back as ``cursor`` for the next page; None on the last page
+    next_cursor: Optional[str] = None
+    # Only filled in when the request asks for it
+    total: Optional[int] = None
+
+
+__all__ = ["Page"]
@@ -0,0 +1,34 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.models.asset import AssetStatus, AssetType
+from app.models.user import UserRole
+
+
+class UserSearchResult(BaseModel):
+    id: int
+    email: str
+    fullname: str
+    role: UserRole
+
+
+class AssetSearchResult(BaseModel):
+    id: int
+    name: str
+    registry_number: Optional[str] = None
+    type: AssetType
+    status: AssetStatus
+    parish: str
+
+
+class SearchHit(BaseModel):
+    entity_type: str
+    id: int
+    title: Optional[str] = None
+    snippet: str
+    rank: float
+    asset_id: Optional[int] = None
+
+
+__all__ = ["UserSearchResult", "AssetSearchResult", "SearchHit"]
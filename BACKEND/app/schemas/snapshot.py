@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class SnapshotRequest(BaseModel):
+    # Defaults to every snapshotted table
+    tables: Optional[List[str]] = None
+    # Discard existing parts and rewrite the tables from scratch
+    full: bool = False
+
+
+class SnapshotTableResult(BaseModel):
+    table: str
+    rows: int
+    file: Optional[str] = None
+
+
+class SnapshotRun(BaseModel):
+    run_id: str
+    format: str
+    tables: List[SnapshotTableResult]
+
+
+class SnapshotPart(BaseModel):
+    file: str
+    rows: int
+    written_at: datetime
+
+
+class SnapshotTableState(BaseModel):
+    format: str
+    # [watermark timestamp, id] of the last row written
+    watermark: Optional[List] = None
+    parts: List[SnapshotPart] = []
+
+
+class SnapshotManifest(BaseModel):
+    directory: str
+    interval_seconds: float
+    tables: Dict[str, SnapshotTableState]
+
+
+__all__ = [
+    "SnapshotRequest", "SnapshotTableResult", "SnapshotRun",
+    "SnapshotPart", "SnapshotTableState", "SnapshotManifest",
+]
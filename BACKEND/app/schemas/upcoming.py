@@ -0,0 +1,35 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class UpcomingEvent(BaseModel):
+    # "lease_end", "service_due" or "attention"
+    kind: str
+    # Lease end, service due date, or the day an attention asset was last updated
+    date: date
+    # Asset id, or equipment id for service events
+    ref_id: int
+    asset_id: int
+    asset_name: str
+    # Tenant, equipment name or asset status
+    detail: Optional[str] = None
+    overdue: bool = False
+
+
+class UpcomingDigestResponse(BaseModel):
+    day: date
+    window_days: int
+    leases_expiring: int
+    service_overdue: int
+    service_due: int
+    assets_needing_attention: int
+    events: List[UpcomingEvent]
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+__all__ = ["UpcomingEvent", "UpcomingDigestResponse"]
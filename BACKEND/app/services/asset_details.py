@@ -0,0 +1,210 @@
+"""
+Asset detail view and its materialised copy.
+
+``build_response`` turns an asset loaded with its child collections into
+the ``AssetResponse`` the detail endpoint returns. The asset routes store
+that response, already serialised, in ``asset_detail_docs`` in the same
+transaction as every change to the asset or its child rows, so the
+default detail view is one primary-key read returned as stored bytes.
+Partial views (``include``, ``fields`` or a non-default ``limit``) are
+still built per request.
+"""
+import os
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional, Sequence
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.asset import Asset, AssetDocument, AssetEquipment, ConditionEntry, CostEvent, Unit
+from app.models.asset_detail_doc import AssetDetailDoc
+from app.schemas.asset import (
+    AssetDocumentResponse, AssetResponse, ConditionEntryResponse, CostEventResponse,
+    EquipmentResponse, MortgageInfo, RentalInfo, UnitResponse,
+)
+
+# Most recent entries returned per sub-collection on the asset detail view
+ASSET_SECTION_LIMIT = int(os.getenv("ASSET_SECTION_LIMIT", "50"))
+
+
+class _Section(NamedTuple):
+    relationship: object
+    model: type
+    # Newest entries first when a section is cut to the most recent N
+    recency: object
+
+
+# Response key -> how to load it. Async sessions cannot lazy-load, so only the
+# sections named here are ever read from an Asset.
+ASSET_SECTIONS: Dict[str, _Section] = {
+    "condition_log": _Section(Asset.condition_log, ConditionEntry, ConditionEntry.date),
+    "units": _Section(Asset.units, Unit, Unit.created_at),
+    "equipment": _Section(Asset.equipment, AssetEquipment, AssetEquipment.created_at),
+    "documents": _Section(Asset.asset_documents, AssetDocument, AssetDocument.uploaded_at),
+    "cost_events": _Section(Asset.cost_events, CostEvent, CostEvent.date),
+}
+
+_SECTION_SCHEMAS = {
+    "condition_log": ConditionEntryResponse,
+    "units": UnitResponse,
+    "equipment": EquipmentResponse,
+    "documents": AssetDocumentResponse,
+    "cost_events": CostEventResponse,
+}
+
+
+# ---------------------------------------------------------------------------
+# Building the view
+# ---------------------------------------------------------------------------
+
+def section_loader(name: str, asset_id: int, limit: Optional[int]):
+    section = ASSET_SECTIONS[name]
+    if limit is None:
+        return selectinload(section.relationship)
+    recent = (
+        select(section.model.id)
+        .where(section.model.asset_id == asset_id)
+        .order_by(section.recency.desc(), section.model.id.desc())
+        .limit(limit)
+    )
+    return selectinload(section.relationship.and_(section.model.id.in_(recent)))
+
+
+def detail_query(asset_id: int, sections: Sequence[str] = tuple(ASSET_SECTIONS), limit: Optional[int] = ASSET_SECTION_LIMIT):
+    """Select one asset with the requested collections, refreshing any loaded copy.
+
+    Each collection holds at most the ``limit`` most recent entries; pass
+    ``limit=None`` to load them all.
+    """
+    return (
+        select(Asset)
+        .where(Asset.id == asset_id)
+        .options(*[section_loader(name, asset_id, limit) for name in sections])
+        .execution_options(populate_existing=True)
+    )
+
+
+def _recent_first(items, name: str) -> list:
+    recency = ASSET_SECTIONS[name].recency.key
+    return sorted(items, key=lambda item: (getattr(item, recency), item.id), reverse=True)
+
+
+def _build_sections(asset: Asset, sections: Sequence[str]) -> dict:
+    built = {}
+    for name in sections:
+        items = getattr(asset, ASSET_SECTIONS[name].relationship.key)
+        schema = _SECTION_SCHEMAS[name]
+        built[name] = [schema.model_validate(item) for item in _recent_first(items, name)]
+    return built
+
+
+def build_response(asset: Asset, sections: Sequence[str] = tuple(ASSET_SECTIONS)) -> AssetResponse:
+    """Reconstruct nested mortgage/rental objects and return a validated response.
+
+    Only the collections in ``sections`` are read; the rest are left empty.
+    """
+    mortgage = None
+    if asset.has_mortgage and asset.mortgage_lender:
+        mortgage = MortgageInfo(
+            lender=asset.mortgage_lender,
+            balance=str(asset.mortgage_balance or "0"),
+            monthly_payment=str(asset.mortgage_monthly_payment or "0"),
+            interest_rate=(
+                str(asset.mortgage_interest_rate) if asset.mortgage_interest_rate is not None else None
+            ),
+        )
+
+    rental = None
+    if asset.has_rental and asset.rental_tenant_name:
+        rental = RentalInfo(
+            monthly_income=str(asset.rental_monthly_income or "0"),
+            tenant_name=asset.rental_tenant_name,
+            lease_start=asset.rental_lease_start,
+            lease_end=asset.rental_lease_end,
+        )
+
+    return AssetResponse(
+        id=asset.id,
+        name=asset.name,
+        type=asset.type,
+        street=asset.street,
+        parish=asset.parish,
+        country=asset.country,
+        registry_number=asset.registry_number,
+        lot_size=asset.lot_size,
+        lot_size_unit=asset.lot_size_unit,
+        build_year=asset.build_year,
+        external_ref_id=asset.external_ref_id,
+        comments=asset.comments,
+        status=asset.status,
+        owner_name=asset.owner_name,
+        acquisition_date=asset.acquisition_date,
+        purchase_price=str(asset.purchase_price) if asset.purchase_price is not None else None,
+        has_mortgage=asset.has_mortgage,
+        mortgage=mortgage,
+        has_rental=asset.has_rental,
+        rental=rental,
+        photo_url=asset.photo_url,
+        created_at=asset.created_at,
+        updated_at=asset.updated_at,
+        **_build_sections(asset, sections),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Stored documents
+# ---------------------------------------------------------------------------
+
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def save(db: Session, response: AssetResponse):
+    """Store ``response`` as its asset's detail document (no commit).
+
+    ``response`` must be the full default view: every section, cut to
+    ``ASSET_SECTION_LIMIT``.
+    """
+    values = {"asset_id": response.id, "body": response.model_dump_json(), "built_at": datetime.utcnow()}
+    dialect = db.get_bind().dialect.name
+    if dialect in _UPSERT_INSERTS:
+        stmt = _UPSERT_INSERTS[dialect](AssetDetailDoc).values(**values)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["asset_id"],
+            set_={"body": stmt.excluded.body, "built_at": stmt.excluded.built_at},
+        ))
+    else:
+        updated = db.execute(
+            update(AssetDetailDoc).where(AssetDetailDoc.asset_id == response.id)
+            .values(body=values["body"], built_at=values["built_at"])
+        )
+        if not updated.rowcount:
+            db.execute(insert(AssetDetailDoc).values(**values))
+
+
+def discard(db: Session, asset_id: int):
+    """Remove an asset's detail document ahead of deleting the asset (no commit)."""
+    db.execute(delete(AssetDetailDoc).where(AssetDetailDoc.asset_id == asset_id))
+
+
+def rebuild(db: Session, asset_id: Optional[int] = None) -> int:
+    """Rebuild stored documents from the asset tables (no commit); returns the asset count."""
+    stmt = select(Asset.id).order_by(Asset.id)
+    if asset_id is not None:
+        stmt = stmt.where(Asset.id == asset_id)
+    asset_ids = db.scalars(stmt).all()
+    for current in asset_ids:
+        asset = db.scalars(detail_query(current)).one()
+        save(db, build_response(asset))
+        # Nothing is pending (save is a plain statement); keep the identity map small
+        db.expunge_all()
+    return len(asset_ids)
+
+
+__all__ = [
+    "ASSET_SECTION_LIMIT", "ASSET_SECTIONS",
+    "section_loader", "detail_query", "build_response", "save", "discard", "rebuild",
+]
@@ -0,0 +1,152 @@
+"""
+Per-asset summary columns: unit, occupied-unit, equipment and document
+counts, the latest condition rating and year-to-date costs.
+
+The asset routes adjust them in the same transaction as each child write:
+counts move by single-row atomic increments, and the latest rating is
+re-read for the one asset whose condition log changed. ``rebuild``
+recomputes every column from the child tables.
+
+``costs_ytd`` holds the total of the cost events dated in
+``costs_ytd_year``; events from other years leave it alone. A periodic job
+moves assets on to the current year at year start, recomputing the total
+from the cost rollups, so new-year events recorded before it runs are
+still counted.
+
+Every change also moves the asset's ``updated_at``, as that is what
+incremental snapshots watch.
+"""
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.asset import Asset, AssetDocument, AssetEquipment, AssetStatus, ConditionEntry, CostEvent, Unit
+from app.models.cost_rollup import CostRollup
+
+# How often the job checks for assets still on last year's costs; 0 disables it
+ASSET_SUMMARY_RESET_INTERVAL_SECONDS = float(os.getenv("ASSET_SUMMARY_RESET_INTERVAL_SECONDS", "3600"))
+
+def occupied(status: Optional[AssetStatus]) -> int:
+    """1 if a unit in ``status`` counts as occupied."""
+    return int(status == AssetStatus.TENANTED)
+
+
+def adjust(db: Session, asset_id: int, **deltas: int):
+    """Add ``deltas`` to the named count columns of one asset (no commit)."""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    db.execute(
+        update(Asset).where(Asset.id == asset_id)
+        .values({**{name: getattr(Asset, name) + delta for name, delta in deltas.items()}, "updated_at": datetime.utcnow()})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _latest_condition(column):
+    return (
+        select(column)
+        .where(ConditionEntry.asset_id == Asset.id)
+        .order_by(ConditionEntry.date.desc(), ConditionEntry.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def refresh_condition(db: Session, asset_id: int):
+    """Re-read one asset's latest condition rating (no commit)."""
+    db.execute(
+        update(Asset).where(Asset.id == asset_id)
+        .values(
+            latest_condition=_latest_condition(ConditionEntry.rating),
+            latest_condition_date=_latest_condition(ConditionEntry.date),
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def record_cost(db: Session, asset_id: int, day: date, amount: Decimal):
+    """Add ``amount`` (negative for a delete) to costs_ytd if ``day`` is in the asset's year (no commit)."""
+    db.execute(
+        update(Asset).where(Asset.id == asset_id, Asset.costs_ytd_year == day.year)
+        .values(costs_ytd=Asset.costs_ytd + amount, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _count(model, *filters):
+    return select(func.count(model.id)).where(model.asset_id == Asset.id, *filters).scalar_subquery()
+
+
+def _year_costs(year: int):
+    return (
+        select(func.coalesce(func.sum(CostEvent.amount), 0))
+        .where(
+            CostEvent.asset_id == Asset.id,
+            CostEvent.date >= date(year, 1, 1),
+            CostEvent.date < date(year + 1, 1, 1),
+        )
+        .scalar_subquery()
+    )
+
+
+def rebuild(db: Session, asset_id: Optional[int] = None, year: Optional[int] = None) -> int:
+    """Recompute the summary columns from the child tables (no commit); returns the asset count."""
+    year = year or datetime.utcnow().year
+    stmt = update(Asset).values(
+        unit_count=_count(Unit),
+        occupied_unit_count=_count(Unit, Unit.status == AssetStatus.TENANTED),
+        equipment_count=_count(AssetEquipment),
+        document_count=_count(AssetDocument),
+        latest_condition=_latest_condition(ConditionEntry.rating),
+        latest_condition_date=_latest_condition(ConditionEntry.date),
+        costs_ytd=_year_costs(year),
+        costs_ytd_year=year,
+        updated_at=datetime.utcnow(),
+    )
+    if asset_id is not None:
+        stmt = stmt.where(Asset.id == asset_id)
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+def reset_year(db: Session, year: Optional[int] = None) -> int:
+    """Move assets still on an earlier year on to ``year`` (no commit); returns the asset count."""
+    year = year or datetime.utcnow().year
+    year_total = (
+        select(func.coalesce(func.sum(CostRollup.total), 0))
+        .where(
+            CostRollup.asset_id == Asset.id,
+            CostRollup.month >= date(year, 1, 1),
+            CostRollup.month < date(year + 1, 1, 1),
+        )
+        .scalar_subquery()
+    )
+    stmt = (
+        update(Asset)
+        .where(or_(Asset.costs_ytd_year.is_(None), Asset.costs_ytd_year != year))
+        .values(costs_ytd=year_total, costs_ytd_year=year, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).rowcount
+
+
+def scheduled_reset():
+    """Entry point for the periodic job."""
+    db = SessionLocal()
+    try:
+        reset_year(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+__all__ = [
+    "ASSET_SUMMARY_RESET_INTERVAL_SECONDS",
+    "occupied", "adjust", "refresh_condition", "record_cost", "rebuild", "reset_year", "scheduled_reset",
+]
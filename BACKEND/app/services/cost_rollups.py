@@ -0,0 +1,124 @@
+"""
+Cost rollups: cost events summed per asset, category and month.
+
+``record_cost`` adjusts the one affected row with an upsert in the caller's
+transaction, so a rollup can never disagree with a committed event.
+``rebuild`` recomputes rows from ``cost_events``, and ``summarize`` answers
+range questions from the rollups alone.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Date, cast, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.database.counters import increment
+from app.models.asset import Asset, CostCategory, CostEvent
+from app.models.cost_rollup import CostRollup
+
+# Dimensions ``summarize`` can break totals down by
+GROUPINGS = ("asset", "category", "month")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _month_expr(dialect: str, column):
+    if dialect == "postgresql":
+        return cast(func.date_trunc("month", column), Date)
+    if dialect == "sqlite":
+        return func.date(column, "start of month")
+    raise ValueError(f"Cost rollups are not supported on '{dialect}' databases")
+
+
+def record_cost(db: Session, asset_id: int, category: CostCategory, day: date, amount: Decimal, count: int = 1):
+    """Add ``amount`` (negative with ``count=-1`` for a delete) to its rollup row (no commit)."""
+    square = amount * amount
+    increment(
+        db, CostRollup,
+        key={"asset_id": asset_id, "category": category, "month": month_start(day)},
+        deltas={"total": amount, "event_count": count, "total_squares": square if count > 0 else -square},
+        count_column="event_count",
+    )
+
+
+def rebuild(db: Session, asset_id: Optional[int] = None) -> int:
+    """Recompute rollups from ``cost_events`` (no commit); returns the row count."""
+    month = _month_expr(db.get_bind().dialect.name, CostEvent.date)
+    source = (
+        select(
+            CostEvent.asset_id, CostEvent.category, month.label("month"),
+            func.sum(CostEvent.amount), func.count(CostEvent.id),
+            func.sum(CostEvent.amount * CostEvent.amount),
+        )
+        .group_by(CostEvent.asset_id, CostEvent.category, month)
+    )
+    clear = delete(CostRollup)
+    if asset_id is not None:
+        source = source.where(CostEvent.asset_id == asset_id)
+        clear = clear.where(CostRollup.asset_id == asset_id)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(CostRollup).from_select(
+            ["asset_id", "category", "month", "total", "event_count", "total_squares"], source,
+        )
+    )
+    return result.rowcount
+
+
+def summarize(
+    db: Session,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    asset_id: Optional[int] = None,
+    category: Optional[CostCategory] = None,
+    group_by: Sequence[str] = (),
+) -> Dict:
+    """Totals over the months from ``start`` to ``end`` inclusive.
+
+    ``group_by`` picks any of ``GROUPINGS``; with none the result is one
+    portfolio-wide row.
+    """
+    filters = []
+    if start is not None:
+        filters.append(CostRollup.month >= month_start(start))
+    if end is not None:
+        filters.append(CostRollup.month <= month_start(end))
+    if asset_id is not None:
+        filters.append(CostRollup.asset_id == asset_id)
+    if category is not None:
+        filters.append(CostRollup.category == category)
+
+    keys = []
+    if "asset" in group_by:
+        keys += [CostRollup.asset_id, Asset.name.label("asset_name")]
+    if "category" in group_by:
+        keys.append(CostRollup.category)
+    if "month" in group_by:
+        keys.append(CostRollup.month)
+
+    stmt = (
+        select(
+            *keys,
+            func.coalesce(func.sum(CostRollup.total), 0).label("total"),
+            func.coalesce(func.sum(CostRollup.event_count), 0).label("event_count"),
+        )
+        .where(*filters)
+    )
+    if keys:
+        stmt = stmt.group_by(*keys).order_by(*keys)
+    if "asset" in group_by:
+        stmt = stmt.join(Asset, CostRollup.asset_id == Asset.id)
+
+    rows: List[Dict] = [dict(row._mapping) for row in db.execute(stmt)]
+    return {
+        "rows": rows,
+        "total": sum((Decimal(r["total"]) for r in rows), Decimal("0")),
+        "event_count": sum(r["event_count"] for r in rows),
+    }
+
+
+__all__ = ["GROUPINGS", "month_start", "record_cost", "rebuild", "summarize"]
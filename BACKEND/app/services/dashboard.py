@@ -0,0 +1,204 @@
+"""
+Portfolio figures for the dashboard.
+
+Figures come from the ``portfolio_cube`` table: asset count, value,
+mortgage balance and rental income summed per parish, type, status and
+owner. The asset routes adjust the affected cells in the same transaction
+as each write (``record_asset_change``), so any combination of filters is
+answered by summing at most a few cells rather than scanning ``assets``.
+
+Results are cached in process per filter combination until an asset route
+invalidates them; the TTL bounds how long writes made through another
+worker go unseen. The cache is shared by every user, so it is only filled
+from the primary: a lagging replica's figures would otherwise be served to
+all of them, the writer included.
+"""
+import os
+import threading
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import ExpiringCache
+from app.database.counters import increment
+from app.models.asset import Asset, AssetStatus, AssetType
+from app.models.portfolio_cube import PortfolioCell
+from app.schemas.dashboard import DashboardStats
+
+DASHBOARD_STATS_TTL_SECONDS = float(os.getenv("DASHBOARD_STATS_TTL_SECONDS", "300"))
+
+ATTENTION_STATUSES = (AssetStatus.UNDER_RENOVATION, AssetStatus.IN_MAINTENANCE)
+
+stats_cache = ExpiringCache(ttl=DASHBOARD_STATS_TTL_SECONDS, maxsize=256)
+
+# Bumped on every invalidation so a computation that started before a write
+# never caches its (stale) result
+_generation = 0
+_generation_lock = threading.Lock()
+
+# (cell key, measures) for one asset
+Cell = Tuple[Dict, Dict]
+
+
+def invalidate():
+    global _generation
+    with _generation_lock:
+        _generation += 1
+    stats_cache.invalidate()
+
+
+# ---------------------------------------------------------------------------
+# Cube maintenance
+# ---------------------------------------------------------------------------
+
+def asset_cell(asset: Asset) -> Cell:
+    """The cell ``asset`` falls in and what it contributes there."""
+    key = {
+        "parish": asset.parish,
+        "type": asset.type,
+        "status": asset.status,
+        "owner": asset.owner_name or "",
+    }
+    measures = {
+        "asset_count": 1,
+        "portfolio_value": asset.purchase_price or Decimal("0"),
+        "mortgage_balance": (asset.mortgage_balance or Decimal("0")) if asset.has_mortgage else Decimal("0"),
+        "rental_income": (asset.rental_monthly_income or Decimal("0")) if asset.has_rental else Decimal("0"),
+    }
+    return key, measures
+
+
+def record_asset_change(db: Session, before: Optional[Cell], after: Optional[Cell]):
+    """Move an asset's contribution from ``before`` to ``after`` (no commit).
+
+    ``before`` is None for a new asset and ``after`` is None for a deleted one.
+    """
+    if before == after:
+        return
+    if before is not None:
+        key, measures = before
+        increment(db, PortfolioCell, key, {k: -v for k, v in measures.items()}, "asset_count")
+    if after is not None:
+        key, measures = after
+        increment(db, PortfolioCell, key, measures, "asset_count")
+
+
+def rebuild_cube(db: Session) -> int:
+    """Recompute every cell from ``assets`` (no commit); returns the cell count."""
+    zero = Decimal("0")
+    source = (
+        select(
+            Asset.parish, Asset.type, Asset.status,
+            func.coalesce(Asset.owner_name, "").label("owner"),
+            func.count(Asset.id),
+            func.coalesce(func.sum(Asset.purchase_price), zero),
+            func.coalesce(func.sum(case((Asset.has_mortgage.is_(True), Asset.mortgage_balance))), zero),
+            func.coalesce(func.sum(case((Asset.has_rental.is_(True), Asset.rental_monthly_income))), zero),
+        )
+        .group_by(Asset.parish, Asset.type, Asset.status, func.coalesce(Asset.owner_name, ""))
+    )
+    db.execute(delete(PortfolioCell))
+    result = db.execute(
+        insert(PortfolioCell).from_select(
+            ["parish", "type", "status", "owner", "asset_count",
+             "portfolio_value", "mortgage_balance", "rental_income"],
+            source,
+        )
+    )
+    return result.rowcount
+
+
+# ---------------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------------
+
+def _stats_query(parish, asset_type, status, owner):
+    filters = []
+    if parish is not None:
+        filters.append(PortfolioCell.parish == parish)
+    if asset_type is not None:
+        filters.append(PortfolioCell.type == asset_type)
+    if status is not None:
+        filters.append(PortfolioCell.status == status)
+    if owner is not None:
+        filters.append(PortfolioCell.owner == owner)
+    # At most one row per type and status, however many assets there are
+    return (
+        select(
+            PortfolioCell.type, PortfolioCell.status,
+            func.sum(PortfolioCell.asset_count).label("asset_count"),
+            func.sum(PortfolioCell.portfolio_value).label("portfolio_value"),
+            func.sum(PortfolioCell.mortgage_balance).label("mortgage_balance"),
+            func.sum(PortfolioCell.rental_income).label("rental_income"),
+        )
+        .where(*filters)
+        .group_by(PortfolioCell.type, PortfolioCell.status)
+    )
+
+
+def _build_stats(rows) -> DashboardStats:
+    total_assets = attention = 0
+    value = mortgage = rental = Decimal("0")
+    by_type: Dict[str, int] = {}
+    by_status: Dict[str, int] = {}
+    for row in rows:
+        count = int(row.asset_count)
+        total_assets += count
+        value += Decimal(row.portfolio_value)
+        mortgage += Decimal(row.mortgage_balance)
+        rental += Decimal(row.rental_income)
+        by_type[row.type.value] = by_type.get(row.type.value, 0) + count
+        by_status[row.status.value] = by_status.get(row.status.value, 0) + count
+        if row.status in ATTENTION_STATUSES:
+            attention += count
+    return DashboardStats(
+        total_assets=total_assets,
+        total_portfolio_value=str(value),
+        total_mortgage_balance=str(mortgage),
+        total_monthly_rental_income=str(rental),
+        assets_by_type=by_type,
+        assets_by_status=by_status,
+        assets_needing_attention=attention,
+    )
+
+
+def compute_stats(db: Session) -> DashboardStats:
+    """Portfolio-wide stats straight from the cube, bypassing the cache."""
+    return _build_stats(db.execute(_stats_query(None, None, None, None)).all())
+
+
+async def get_stats(
+    db: AsyncSession,
+    parish: Optional[str] = None,
+    asset_type: Optional[AssetType] = None,
+    status: Optional[AssetStatus] = None,
+    owner: Optional[str] = None,
+    pinned: bool = False,
+) -> DashboardStats:
+    """Stats for the filter combination, cached.
+
+    ``db`` must read from the primary. ``pinned`` (the user wrote recently)
+    skips the lookup, as the cached entry may predate a write made through
+    another worker; the fresh result still refreshes the cache.
+    """
+    cache_key = (parish, asset_type, status, owner)
+    stats = None if pinned else stats_cache.get(cache_key)
+    if stats is not None:
+        return stats
+
+    generation = _generation
+    rows = (await db.execute(_stats_query(parish, asset_type, status, owner))).all()
+    stats = _build_stats(rows)
+    with _generation_lock:
+        if generation == _generation:
+            stats_cache.set(cache_key, stats)
+    return stats
+
+
+__all__ = [
+    "DASHBOARD_STATS_TTL_SECONDS", "stats_cache", "invalidate",
+    "asset_cell", "record_asset_change", "rebuild_cube", "compute_stats", "get_stats",
+]
@@ -0,0 +1,109 @@
+"""
+Daily history of the dashboard figures.
+
+A periodic job stores one ``dashboard_snapshots`` row per UTC day, taken
+from the portfolio cube and overwritten on each run so the row ends up
+holding the day's closing figures. Trend queries read only these rows and
+thin long ranges down to a bounded number of points.
+"""
+import math
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.dashboard_snapshot import DashboardSnapshot
+from app.services.dashboard import compute_stats
+
+# Runs during the day keep refreshing today's row; 0 disables the job
+DASHBOARD_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("DASHBOARD_SNAPSHOT_INTERVAL_SECONDS", "3600"))
+
+# Fields copied from DashboardStats, by snapshot column
+_FIELDS = {
+    "total_assets": "total_assets",
+    "portfolio_value": "total_portfolio_value",
+    "mortgage_balance": "total_mortgage_balance",
+    "rental_income": "total_monthly_rental_income",
+    "assets_needing_attention": "assets_needing_attention",
+    "assets_by_type": "assets_by_type",
+    "assets_by_status": "assets_by_status",
+}
+_MONEY_FIELDS = ("portfolio_value", "mortgage_balance", "rental_income")
+
+
+def record_snapshot(db: Session, day: Optional[date] = None) -> DashboardSnapshot:
+    """Store the current figures as ``day``'s snapshot (today by default) and commit."""
+    day = day or datetime.utcnow().date()
+    stats = compute_stats(db)
+    values = {column: getattr(stats, field) for column, field in _FIELDS.items()}
+    for column in _MONEY_FIELDS:
+        values[column] = Decimal(values[column])
+
+    for attempt in range(2):
+        snapshot = db.scalars(select(DashboardSnapshot).where(DashboardSnapshot.day == day)).first()
+        if snapshot is None:
+            snapshot = DashboardSnapshot(day=day)
+            db.add(snapshot)
+        for column, value in values.items():
+            setattr(snapshot, column, value)
+        snapshot.recorded_at = datetime.utcnow()
+        try:
+            db.commit()
+            return snapshot
+        except IntegrityError:
+            # Another worker inserted today's row first; update that one instead
+            db.rollback()
+            if attempt:
+                raise
+
+
+def scheduled_snapshot():
+    """Entry point for the periodic job."""
+    db = SessionLocal()
+    try:
+        record_snapshot(db)
+    finally:
+        db.close()
+
+
+def trend(db: Session, start: date, end: date, max_points: int) -> Dict:
+    """Snapshots from ``start`` to ``end``, thinned to at most ``max_points``.
+
+    Long ranges are split into equal buckets of days and each bucket is
+    represented by its latest snapshot, as the figures are levels rather
+    than flows.
+    """
+    rows = db.scalars(
+        select(DashboardSnapshot)
+        .where(DashboardSnapshot.day >= start, DashboardSnapshot.day <= end)
+        .order_by(DashboardSnapshot.day)
+    ).all()
+
+    days = (end - start).days + 1
+    step = max(1, math.ceil(days / max_points))
+    points: List[DashboardSnapshot] = []
+    if step == 1:
+        points = list(rows)
+    else:
+        buckets: Dict[int, DashboardSnapshot] = {}
+        for row in rows:
+            buckets[(row.day - start).days // step] = row
+        points = [buckets[b] for b in sorted(buckets)]
+
+    return {"start": start, "end": end, "step_days": step, "points": points}
+
+
+def default_range(days: int = 90):
+    end = datetime.utcnow().date()
+    return end - timedelta(days=days - 1), end
+
+
+__all__ = [
+    "DASHBOARD_SNAPSHOT_INTERVAL_SECONDS",
+    "record_snapshot", "scheduled_snapshot", "trend", "default_range",
+]
@@ -0,0 +1,257 @@
+"""
+Background extraction of uploaded document text into the search index.
+
+Upload routes hand the bytes they already hold to ``schedule_extraction``,
+which parses them in the shared process pool and stores the result from a
+background task on the event loop, so request handlers never wait on
+extraction. The database write runs on a worker thread; the pool's own
+result-handling thread never touches the database.
+``backfill`` walks existing documents in id order and writes a checkpoint
+after every batch so an interrupted run resumes where it stopped.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.workers import get_process_pool
+from app.database import SessionLocal
+from app.models.asset import AssetDocument
+from app.models.document_text import DocumentSource, DocumentText
+from app.models.files import Files
+from app.models.user import Users
+from app.services.textextract import EXTRACTABLE_TYPES, extract_text
+
+logger = logging.getLogger(__name__)
+
+# Running store tasks; the loop only keeps weak references to tasks
+_store_tasks: Set[asyncio.Task] = set()
+
+
+def is_extractable(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in EXTRACTABLE_TYPES
+
+
+def store_text(
+    db: Session,
+    source_type: DocumentSource,
+    source_id: int,
+    title: str,
+    text: str,
+    user_id: Optional[int] = None,
+    asset_id: Optional[int] = None,
+) -> DocumentText:
+    """Insert or replace the extracted text for one document (no commit)."""
+    row = db.query(DocumentText).filter(
+        DocumentText.source_type == source_type,
+        DocumentText.source_id == source_id,
+    ).first()
+    if row is None:
+        row = DocumentText(source_type=source_type, source_id=source_id)
+        db.add(row)
+    row.title = title
+    row.user_id = user_id
+    row.asset_id = asset_id
+    row.content = text
+    row.char_count = len(text)
+    row.extracted_at = datetime.utcnow()
+    return row
+
+
+def delete_text(db: Session, source_type: DocumentSource, source_id: int):
+    """Drop the extracted text for a deleted document (no commit)."""
+    db.query(DocumentText).filter(
+        DocumentText.source_type == source_type,
+        DocumentText.source_id == source_id,
+    ).delete(synchronize_session=False)
+
+
+def _source_exists(db: Session, source_type: DocumentSource, source_id: int, filename: str) -> bool:
+    if source_type == DocumentSource.FILE:
+        source = db.get(Files, source_id)
+        return source is not None and source.filename == filename
+    source = db.get(AssetDocument, source_id)
+    return source is not None and source.name == filename
+
+
+def _store_result(source_type, source_id, title, user_id, asset_id, text):
+    db = SessionLocal()
+    try:
+        # The document may have been deleted (and its id reused) while it was
+        # being parsed
+        if _source_exists(db, source_type, source_id, title):
+            store_text(db, source_type, source_id, title, text, user_id, asset_id)
+            db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Storing extracted text failed for %s %s", source_type.value, source_id)
+    finally:
+        db.close()
+
+
+async def _store_when_done(source_type, source_id, title, user_id, asset_id, future):
+    try:
+        text = await asyncio.wrap_future(future)
+    except Exception:
+        logger.exception("Text extraction failed for %s %s", source_type.value, source_id)
+        return
+    if text:
+        await asyncio.to_thread(_store_result, source_type, source_id, title, user_id, asset_id, text)
+
+
+def schedule_extraction(
+    source_type: DocumentSource,
+    source_id: int,
+    filename: str,
+    content: bytes,
+    user_id: Optional[int] = None,
+    asset_id: Optional[int] = None,
+):
+    """Queue ``content`` for extraction and return the future, if any.
+
+    Call from the event loop, which stores the result once it is ready.
+    """
+    if not is_extractable(filename):
+        return None
+    future = get_process_pool().submit(extract_text, filename, content)
+    task = asyncio.get_running_loop().create_task(
+        _store_when_done(source_type, source_id, filename, user_id, asset_id, future)
+    )
+    _store_tasks.add(task)
+    task.add_done_callback(_store_tasks.discard)
+    return future
+
+
+# ---------------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------------
+
+def _load_checkpoint(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _save_checkpoint(path: str, checkpoint: Dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(checkpoint, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _next_batch(db: Session, source_type: DocumentSource, after_id: int, batch_size: int) -> List[dict]:
+    extracted = (
+        select(DocumentText.id)
+        .where(DocumentText.source_type == source_type)
+    )
+    if source_type == DocumentSource.FILE:
+        extracted = extracted.where(DocumentText.source_id == Files.id)
+        stmt = (
+            select(
+                Files.id, Files.filename.label("name"), Files.user_id,
+                Users.email.label("folder"), extracted.exists().label("done"),
+            )
+            .join(Users, Files.user_id == Users.id)
+            .where(Files.id > after_id)
+            .order_by(Files.id)
+            .limit(batch_size)
+        )
+    else:
+        extracted = extracted.where(DocumentText.source_id == AssetDocument.id)
+        stmt = (
+            select(
+                AssetDocument.id, AssetDocument.name, AssetDocument.asset_id,
+                AssetDocument.drive_file_id, extracted.exists().label("done"),
+            )
+            .where(AssetDocument.id > after_id)
+            .order_by(AssetDocument.id)
+            .limit(batch_size)
+        )
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+def _download(drive_ops, source_type: DocumentSource, item: dict) -> bytes:
+    if source_type == DocumentSource.FILE:
+        return drive_ops.download_file(item["name"], item["folder"])
+    return drive_ops.download_file_by_id(item["drive_file_id"])
+
+
+def backfill(
+    drive_ops,
+    checkpoint_path: str,
+    sources: Iterable[DocumentSource] = tuple(DocumentSource),
+    batch_size: int = 20,
+    reset: bool = False,
+):
+    """Extract text for existing documents, yielding progress per batch.
+
+    Documents that already have text are skipped without downloading. Ids
+    that fail to download or parse are recorded under ``failed`` in the
+    checkpoint.
+    """
+    checkpoint = {} if reset else _load_checkpoint(checkpoint_path)
+    pool = get_process_pool()
+
+    for source_type in sources:
+        key = source_type.value
+        failed = checkpoint.setdefault("failed", {}).setdefault(key, [])
+        while True:
+            db = SessionLocal()
+            try:
+                batch = _next_batch(db, source_type, checkpoint.get(key, 0), batch_size)
+            finally:
+                db.close()
+            if not batch:
+                break
+
+            pending, contents = [], []
+            for item in batch:
+                if item["done"] or not is_extractable(item["name"]):
+                    continue
+                try:
+                    contents.append(_download(drive_ops, source_type, item))
+                    pending.append(item)
+                except Exception:
+                    logger.exception("Download failed for %s %s", key, item["id"])
+                    failed.append(item["id"])
+
+            futures = [
+                pool.submit(extract_text, item["name"], content)
+                for item, content in zip(pending, contents)
+            ]
+
+            db = SessionLocal()
+            try:
+                stored = 0
+                for item, future in zip(pending, futures):
+                    try:
+                        text = future.result()
+                    except Exception:
+                        logger.exception("Text extraction failed for %s %s", key, item["id"])
+                        failed.append(item["id"])
+                        continue
+                    if text:
+                        store_text(
+                            db, source_type, item["id"], item["name"], text,
+                            user_id=item.get("user_id"), asset_id=item.get("asset_id"),
+                        )
+                        stored += 1
+                db.commit()
+            finally:
+                db.close()
+
+            checkpoint[key] = batch[-1]["id"]
+            _save_checkpoint(checkpoint_path, checkpoint)
+            yield {"source": key, "last_id": checkpoint[key], "scanned": len(batch), "stored": stored}
+
+
+__all__ = [
+    "is_extractable", "store_text", "delete_text",
+    "schedule_extraction", "backfill",
+]
@@ -0,0 +1,283 @@
+"""
+Ranked full-text search across assets, project notes, documents and costs.
+
+On PostgreSQL the ``add_fulltext_search_vectors`` migration adds a generated
+``search_vector`` tsvector column with a GIN index to each searched table, so
+the vectors are maintained by the database on every write and a search is a
+single UNION ALL of index scans. Other engines, or databases where the
+migration has not run, fall back to ILIKE scans ranked in Python.
+
+Snippets are HTML: the matched text is wrapped in ``<mark>`` and everything
+else is escaped, so clients can render them as markup.
+"""
+import html
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import String, and_, cast, func, literal, literal_column, or_, select, text, union_all
+from sqlalchemy.orm import Session
+
+from app.models.asset import Asset, AssetDocument, CostEvent
+from app.models.document_text import DocumentSource, DocumentText
+from app.models.files import Files
+from app.models.project_notes import ProjectNote
+
+TS_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+_SNIPPET_RADIUS = 80
+
+_vector_support: Dict[str, bool] = {}
+
+
+@dataclass(frozen=True)
+class SearchEntity:
+    """How one table takes part in search.
+
+    ``text_columns`` feed both the snippet and the fallback scan and should
+    match the expression of the table's ``search_vector`` column. ``owner``
+    restricts hits to the caller's own rows for non-admins; ``admin_only``
+    hides the entity from non-admins altogether.
+    """
+    name: str
+    table: str
+    id_column: object
+    title: object
+    text_columns: Sequence[object]
+    asset_id: Optional[object] = None
+    owner: Optional[object] = None
+    admin_only: bool = False
+    filters: Sequence[object] = field(default_factory=tuple)
+
+
+ENTITIES: List[SearchEntity] = [
+    SearchEntity(
+        name="asset",
+        table="assets",
+        id_column=Asset.id,
+        title=Asset.name,
+        text_columns=[Asset.name, Asset.registry_number, Asset.street, Asset.parish,
+                      Asset.owner_name, Asset.comments],
+        asset_id=Asset.id,
+    ),
+    SearchEntity(
+        name="project_note",
+        table="project_notes",
+        id_column=ProjectNote.id,
+        title=ProjectNote.title,
+        text_columns=[ProjectNote.title, ProjectNote.description],
+        admin_only=True,
+    ),
+    SearchEntity(
+        name="document",
+        table="files",
+        id_column=Files.id,
+        title=Files.filename,
+        text_columns=[Files.filename, Files.document_type],
+        owner=Files.user_id,
+    ),
+    SearchEntity(
+        name="asset_document",
+        table="asset_documents",
+        id_column=AssetDocument.id,
+        title=AssetDocument.name,
+        text_columns=[AssetDocument.name],
+        asset_id=AssetDocument.asset_id,
+    ),
+    SearchEntity(
+        name="cost_event",
+        table="cost_events",
+        id_column=CostEvent.id,
+        title=CostEvent.description,
+        text_columns=[CostEvent.description],
+        asset_id=CostEvent.asset_id,
+    ),
+    # Extracted text; ``id`` is the id of the source document
+    SearchEntity(
+        name="document_content",
+        table="document_texts",
+        id_column=DocumentText.source_id,
+        title=DocumentText.title,
+        text_columns=[DocumentText.content],
+        owner=DocumentText.user_id,
+        filters=(DocumentText.source_type == DocumentSource.FILE,),
+    ),
+    SearchEntity(
+        name="asset_document_content",
+        table="document_texts",
+        id_column=DocumentText.source_id,
+        title=DocumentText.title,
+        text_columns=[DocumentText.content],
+        asset_id=DocumentText.asset_id,
+        filters=(DocumentText.source_type == DocumentSource.ASSET_DOCUMENT,),
+    ),
+]
+
+ENTITY_NAMES = [e.name for e in ENTITIES]
+
+
+def has_vector_support(db: Session) -> bool:
+    """True when every searched table carries a ``search_vector`` column."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    key = str(bind.url)
+    if key not in _vector_support:
+        tables = {e.table for e in ENTITIES}
+        found = db.execute(
+            text(
+                "SELECT count(DISTINCT table_name) FROM information_schema.columns "
+                "WHERE column_name = 'search_vector' AND table_name = ANY(:tables)"
+            ),
+            {"tables": list(tables)},
+        ).scalar()
+        _vector_support[key] = found == len(tables)
+    return _vector_support[key]
+
+
+def _visible_entities(types: Optional[Sequence[str]], is_admin: bool) -> List[SearchEntity]:
+    return [
+        e for e in ENTITIES
+        if (not types or e.name in types) and (is_admin or not e.admin_only)
+    ]
+
+
+def _scope(entity: SearchEntity, is_admin: bool, user_id: Optional[int]) -> list:
+    criteria = list(entity.filters)
+    if entity.owner is not None and not is_admin:
+        criteria.append(entity.owner == user_id)
+    return criteria
+
+
+def _document_text(entity: SearchEntity):
+    return func.concat_ws(" ", *entity.text_columns)
+
+
+def _html_escaped(expr):
+    """``expr`` with ``&``, ``<`` and ``>`` escaped, as ``html.escape(quote=False)`` does."""
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        expr = func.replace(expr, char, entity)
+    return expr
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL: one ranked UNION ALL over the GIN-indexed vectors
+# ---------------------------------------------------------------------------
+
+def _vector_search(db: Session, query: str, entities, is_admin, user_id, limit) -> List[dict]:
+    tsquery = func.websearch_to_tsquery(TS_CONFIG, query)
+    parts = []
+    for entity in entities:
+        vector = literal_column(f"{entity.table}.search_vector")
+        asset_id = entity.asset_id if entity.asset_id is not None else literal(None)
+        parts.append(
+            select(
+                literal(entity.name).label("entity_type"),
+                entity.id_column.label("id"),
+                cast(entity.title, String).label("title"),
+                _document_text(entity).label("body"),
+                func.ts_rank_cd(vector, tsquery).label("rank"),
+                cast(asset_id, entity.id_column.type).label("asset_id"),
+            ).where(vector.op("@@")(tsquery), *_scope(entity, is_admin, user_id))
+        )
+
+    # Rank and cut first, then build headlines only for the rows returned.
+    top = union_all(*parts).order_by(literal_column("rank").desc()).limit(limit).subquery()
+    stmt = select(
+        top.c.entity_type,
+        top.c.id,
+        top.c.title,
+        # Escaped first so only the headline's own <mark> tags are markup
+        func.ts_headline(TS_CONFIG, _html_escaped(top.c.body), tsquery, HEADLINE_OPTIONS).label("snippet"),
+        top.c.rank,
+        top.c.asset_id,
+    ).order_by(top.c.rank.desc())
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+# ---------------------------------------------------------------------------
+# Fallback: ILIKE scans ranked by term frequency
+# ---------------------------------------------------------------------------
+
+def _terms(query: str) -> List[str]:
+    return [t for t in re.split(r"\W+", query.lower()) if t]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _snippet(body: str, terms: List[str]) -> str:
+    lowered = body.lower()
+    positions = [lowered.find(t) for t in terms if lowered.find(t) >= 0]
+    start = max(min(positions) - _SNIPPET_RADIUS, 0) if positions else 0
+    excerpt = body[start:start + 2 * _SNIPPET_RADIUS]
+    # Longest terms first so a term inside another does not split its match
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    parts, end = [], 0
+    for match in pattern.finditer(excerpt):
+        parts += [
+            html.escape(excerpt[end:match.start()], quote=False),
+            "<mark>", html.escape(match.group(), quote=False), "</mark>",
+        ]
+        end = match.end()
+    parts.append(html.escape(excerpt[end:], quote=False))
+    return ("..." if start else "") + "".join(parts)
+
+
+def _scan_search(db: Session, query: str, entities, is_admin, user_id, limit) -> List[dict]:
+    terms = _terms(query)
+    if not terms:
+        return []
+    hits = []
+    for entity in entities:
+        matches = [
+            or_(*[col.ilike(f"%{_escape_like(term)}%", escape="\\") for col in entity.text_columns])
+            for term in terms
+        ]
+        asset_id = entity.asset_id if entity.asset_id is not None else literal(None)
+        stmt = (
+            select(entity.id_column, entity.title, asset_id, *entity.text_columns)
+            .where(and_(*matches), *_scope(entity, is_admin, user_id))
+            .limit(limit)
+        )
+        for row in db.execute(stmt):
+            title, row_asset_id, values = row[1], row[2], row[3:]
+            body = " ".join(str(v) for v in values if v)
+            lowered = body.lower()
+            rank = sum(lowered.count(t) for t in terms) / (1 + len(body) / 1000)
+            hits.append({
+                "entity_type": entity.name,
+                "id": row[0],
+                "title": title,
+                "snippet": _snippet(body, terms),
+                "rank": rank,
+                "asset_id": row_asset_id,
+            })
+    hits.sort(key=lambda h: h["rank"], reverse=True)
+    return hits[:limit]
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def search(
+    db: Session,
+    query: str,
+    *,
+    is_admin: bool,
+    user_id: Optional[int],
+    types: Optional[Sequence[str]] = None,
+    limit: int = 20,
+) -> List[dict]:
+    """Return ranked hits with snippets across the searchable entities."""
+    entities = _visible_entities(types, is_admin)
+    if not entities or not query.strip():
+        return []
+    if has_vector_support(db):
+        return _vector_search(db, query, entities, is_admin, user_id, limit)
+    return _scan_search(db, query, entities, is_admin, user_id, limit)
+
+
+__all__ = ["SearchEntity", "ENTITIES", "ENTITY_NAMES", "has_vector_support", "search"]
@@ -0,0 +1,344 @@
+"""
+Columnar snapshots of the portfolio tables for offline analysis.
+
+Each run appends one Parquet (or Arrow IPC) part per table holding the rows
+whose watermark column moved past the previous run's high-water mark, so
+analysts read local files instead of paging through the API. Watermarks are
+stamped in Python before commit and the rows are read from the replica, so
+a row can become visible after a later-stamped one; each run therefore
+re-reads ``SNAPSHOT_OVERLAP_SECONDS`` behind the mark and skips the row
+versions the manifest lists as already written. Parts are a
+change log: an asset edited twice appears in two parts, and readers keep
+the last row per id (``read_table`` does this). Deletes are not captured;
+``full=True`` discards the parts and writes each table from scratch.
+
+``manifest.json`` in the snapshot directory records every part and each
+table's watermark. A lock file keeps concurrent runs, e.g. from several
+app workers, from writing the same parts.
+"""
+import enum
+import json
+import logging
+import os
+import shutil
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, select
+
+from app.database import ReadSessionLocal
+from app.models.activity_log import ActivityLog
+from app.models.asset import Asset, ConditionEntry, CostEvent, Unit
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+# "parquet" (zstd) or "arrow" (lz4 IPC files, which can be memory-mapped)
+SNAPSHOT_FORMAT = os.getenv("SNAPSHOT_FORMAT", "parquet")
+SNAPSHOT_BATCH_SIZE = int(os.getenv("SNAPSHOT_BATCH_SIZE", "10000"))
+# How far behind the watermark each run re-reads: the longest a row can take
+# from being stamped to being visible on the replica (commit plus lag)
+SNAPSHOT_OVERLAP_SECONDS = float(os.getenv("SNAPSHOT_OVERLAP_SECONDS", "3600"))
+# How often the scheduled job runs; 0 disables it
+SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("SNAPSHOT_INTERVAL_SECONDS", "86400"))
+
+EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+class SnapshotTable(NamedTuple):
+    model: type
+    # Rows are picked up when this moves past the last run's watermark
+    watermark: object
+
+
+TABLES: Dict[str, SnapshotTable] = {
+    "assets": SnapshotTable(Asset, Asset.updated_at),
+    "units": SnapshotTable(Unit, Unit.updated_at),
+    "cost_events": SnapshotTable(CostEvent, CostEvent.created_at),
+    "condition_entries": SnapshotTable(ConditionEntry, ConditionEntry.created_at),
+    "activity_log": SnapshotTable(ActivityLog, ActivityLog.created_at),
+}
+
+
+class SnapshotInProgress(Exception):
+    """Another process holds the snapshot lock."""
+
+
+# ---------------------------------------------------------------------------
+# Arrow schema
+# ---------------------------------------------------------------------------
+
+def _arrow_type(column) -> pa.DataType:
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Numeric):
+        return pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    # Strings and enums (stored as their values)
+    return pa.string()
+
+
+def table_schema(name: str) -> pa.Schema:
+    columns = TABLES[name].model.__table__.columns
+    return pa.schema([pa.field(c.name, _arrow_type(c), nullable=c.nullable) for c in columns])
+
+
+def _to_batch(rows, schema: pa.Schema) -> pa.RecordBatch:
+    arrays = []
+    for i, field in enumerate(schema):
+        values = [row[i] for row in rows]
+        if pa.types.is_string(field.type):
+            values = [v.value if isinstance(v, enum.Enum) else v for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# ---------------------------------------------------------------------------
+# Manifest and locking
+# ---------------------------------------------------------------------------
+
+def _manifest_path(directory: str) -> str:
+    return os.path.join(directory, "manifest.json")
+
+
+def load_manifest(directory: str = SNAPSHOT_DIR) -> Dict:
+    path = _manifest_path(directory)
+    if not os.path.exists(path):
+        return {"tables": {}}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _save_manifest(directory: str, manifest: Dict):
+    path = _manifest_path(directory)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _try_lock(fh) -> bool:
+    try:
+        if fcntl:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fh):
+    if fcntl:
+        fcntl.flock(fh, fcntl.LOCK_UN)
+    else:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _snapshot_lock(directory: str):
+    os.makedirs(directory, exist_ok=True)
+    # flock on POSIX, a one-byte region lock on Windows; both are released
+    # if the process dies. Append mode, so opening never truncates a file
+    # another process has locked
+    with open(os.path.join(directory, ".lock"), "a") as fh:
+        if not _try_lock(fh):
+            raise SnapshotInProgress("A snapshot is already running")
+        try:
+            yield
+        finally:
+            _unlock(fh)
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+class _PartWriter:
+    """Open a part file lazily so an empty increment writes nothing."""
+
+    def __init__(self, path: str, schema: pa.Schema, fmt: str):
+        self.path, self.schema, self.fmt = path, schema, fmt
+        self._writer = None
+
+    def write(self, batch: pa.RecordBatch):
+        if self._writer is None:
+            if self.fmt == "arrow":
+                options = ipc.IpcWriteOptions(compression="lz4")
+                self._writer = ipc.new_file(self.path, self.schema, options=options)
+            else:
+                self._writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _snapshot_table(db, name: str, state: Dict, directory: str, fmt: str, run_id: str) -> Dict:
+    table = TABLES[name]
+    model, watermark = table.model, table.watermark
+    schema = table_schema(name)
+
+    overlap = timedelta(seconds=SNAPSHOT_OVERLAP_SECONDS)
+    stmt = select(*model.__table__.columns).order_by(watermark, model.id)
+    if state.get("watermark"):
+        after, _ = state["watermark"]
+        stmt = stmt.where(watermark >= datetime.fromisoformat(after) - overlap)
+    # (id, watermark) of the row versions already written within the overlap
+    written = {tuple(version) for version in state.get("recent", [])}
+
+    table_dir = os.path.join(directory, name)
+    os.makedirs(table_dir, exist_ok=True)
+    filename = f"part-{run_id}.{EXTENSIONS[fmt]}"
+    writer = _PartWriter(os.path.join(table_dir, filename), schema, fmt)
+
+    rows_written, last = 0, None
+    # Versions written by this run that may fall in the next run's overlap,
+    # oldest first (rows arrive in watermark order)
+    recent = deque()
+    watermark_index = schema.get_field_index(watermark.key)
+    try:
+        result = db.execute(stmt.execution_options(yield_per=SNAPSHOT_BATCH_SIZE))
+        for rows in result.partitions():
+            last = rows[-1]
+            rows = [row for row in rows if (row.id, row[watermark_index].isoformat()) not in written]
+            if rows:
+                writer.write(_to_batch(rows, schema))
+                rows_written += len(rows)
+                recent.extend((row.id, row[watermark_index].isoformat()) for row in rows)
+            floor = (last[watermark_index] - overlap).isoformat()
+            while recent and recent[0][1] < floor:
+                recent.popleft()
+    finally:
+        writer.close()
+
+    if last is not None:
+        state["watermark"] = [last[watermark_index].isoformat(), last.id]
+        state["recent"] = sorted(
+            [row_id, stamp] for row_id, stamp in written.union(recent) if stamp >= floor
+        )
+    if not rows_written:
+        return {"table": name, "rows": 0, "file": None}
+
+    state.setdefault("parts", []).append({
+        "file": f"{name}/{filename}",
+        "rows": rows_written,
+        "written_at": datetime.utcnow().isoformat(),
+    })
+    return {"table": name, "rows": rows_written, "file": f"{name}/{filename}"}
+
+
+def run_snapshot(
+    tables: Optional[Iterable[str]] = None,
+    full: bool = False,
+    directory: str = SNAPSHOT_DIR,
+    fmt: str = SNAPSHOT_FORMAT,
+) -> Dict:
+    """Write the rows changed since the last run for each of ``tables``.
+
+    Reads go to the replica when one is configured. Raises
+    ``SnapshotInProgress`` if another run holds the lock.
+    """
+    names = list(tables) if tables else list(TABLES)
+    unknown = sorted(set(names) - set(TABLES))
+    if unknown:
+        raise ValueError(f"Unknown snapshot tables: {', '.join(unknown)}")
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"Unknown snapshot format: {fmt}")
+
+    with _snapshot_lock(directory):
+        manifest = load_manifest(directory)
+        run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        results: List[Dict] = []
+
+        db = ReadSessionLocal()
+        try:
+            for name in names:
+                if full:
+                    shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+                    manifest["tables"].pop(name, None)
+                state = manifest["tables"].setdefault(name, {"format": fmt})
+                if state.get("format", fmt) != fmt:
+                    raise ValueError(
+                        f"{name} is snapshotted as {state['format']}; rerun with full=True to switch"
+                    )
+                results.append(_snapshot_table(db, name, state, directory, fmt, run_id))
+                # Record each table as it completes so a failure keeps earlier work
+                _save_manifest(directory, manifest)
+        finally:
+            db.close()
+
+    logger.info("Snapshot %s wrote %s rows", run_id, sum(r["rows"] for r in results))
+    return {"run_id": run_id, "format": fmt, "tables": results}
+
+
+def scheduled_snapshot():
+    """Entry point for the periodic job; another worker's run is not an error."""
+    try:
+        run_snapshot()
+    except SnapshotInProgress:
+        logger.info("Skipping scheduled snapshot; another run holds the lock")
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def read_table(name: str, directory: str = SNAPSHOT_DIR, columns: Optional[List[str]] = None) -> pa.Table:
+    """Load every part of a snapshotted table, keeping the latest row per id.
+
+    Arrow IPC parts are memory-mapped rather than read into memory.
+    """
+    state = load_manifest(directory)["tables"].get(name)
+    if state is None:
+        raise ValueError(f"No snapshot for {name}")
+    schema = table_schema(name)
+    parts = []
+    for part in state.get("parts", []):
+        path = os.path.join(directory, part["file"])
+        if state.get("format") == "arrow":
+            part_table = ipc.open_file(pa.memory_map(path)).read_all()
+        else:
+            part_table = pq.read_table(path)
+        parts.append(part_table)
+    if not parts:
+        combined = schema.empty_table()
+    else:
+        # Parts written before a column was added lack it; fill with nulls
+        combined = pa.concat_tables(parts, promote_options="default")
+
+    # Later parts hold newer versions of a row; keep the last occurrence of each id
+    if combined.num_rows:
+        ids = combined.column("id").to_pylist()
+        latest = {row_id: i for i, row_id in enumerate(ids)}
+        combined = combined.take(sorted(latest.values()))
+    if columns:
+        combined = combined.select(columns)
+    return combined
+
+
+__all__ = [
+    "SNAPSHOT_DIR", "SNAPSHOT_FORMAT", "SNAPSHOT_OVERLAP_SECONDS", "SNAPSHOT_INTERVAL_SECONDS", "TABLES",
+    "SnapshotInProgress", "table_schema", "load_manifest",
+    "run_snapshot", "scheduled_snapshot", "read_table",
+]
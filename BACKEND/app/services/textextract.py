@@ -0,0 +1,84 @@
+"""
+Text extraction for uploaded documents.
+
+These functions run inside worker processes, so they only take and return
+plain values. PDF support needs the optional ``pypdf`` package; without it
+PDFs yield no text.
+"""
+import io
+import logging
+import os
+import re
+import unicodedata
+import zipfile
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+EXTRACTABLE_TYPES = (".pdf", ".docx", ".txt")
+
+# Upper bound on stored characters; keeps rows and tsvectors compact
+MAX_TEXT_CHARS = int(os.getenv("DOCUMENT_TEXT_MAX_CHARS", "200000"))
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def compact_text(text: str) -> str:
+    """Normalise unicode, drop control characters and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", text)
+    text = "".join(ch if ch.isprintable() or ch.isspace() else " " for ch in text)
+    return _WHITESPACE.sub(" ", text).strip()[:MAX_TEXT_CHARS]
+
+
+def _txt_text(content: bytes) -> str:
+    for encoding in ("utf-8", "utf-16", "cp1252"):
+        try:
+            return content.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return content.decode("utf-8", errors="ignore")
+
+
+def _docx_text(content: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NS}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{_WORD_NS}t")))
+    return "\n".join(paragraphs)
+
+
+def _pdf_text(content: bytes) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning("pypdf is not installed; skipping PDF text extraction")
+        return ""
+    reader = PdfReader(io.BytesIO(content))
+    pages = []
+    total = 0
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        pages.append(text)
+        total += len(text)
+        if total >= MAX_TEXT_CHARS:
+            break
+    return "\n".join(pages)
+
+
+def extract_text(filename: str, content: bytes) -> str:
+    """Return compacted text for ``content``, or "" for unsupported files."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == ".txt":
+        text = _txt_text(content)
+    elif ext == ".docx":
+        text = _docx_text(content)
+    elif ext == ".pdf":
+        text = _pdf_text(content)
+    else:
+        return ""
+    return compact_text(text)
+
+
+__all__ = ["EXTRACTABLE_TYPES", "compact_text", "extract_text"]
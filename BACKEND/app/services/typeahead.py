@@ -0,0 +1,207 @@
+"""
+Typeahead lookups for users and assets.
+
+On PostgreSQL with the pg_trgm extension, lookups are answered by the trigram
+GIN indexes created in the ``add_trigram_search_indexes`` migration. Other
+engines, and databases without pg_trgm, fall back to an in-process prefix
+index that is rebuilt lazily after writes.
+"""
+import bisect
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import case, func, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.asset import Asset
+from app.models.user import Users
+
+# Writes made by other workers only reach this process's prefix index once it
+# is rebuilt, so the TTL bounds how stale a lookup can be.
+PREFIX_INDEX_TTL_SECONDS = float(os.getenv("TYPEAHEAD_INDEX_TTL_SECONDS", "300"))
+
+# Cap on index entries inspected per lookup so one-letter queries stay cheap.
+_MAX_SCAN = 5000
+
+_TOKEN_SPLIT = re.compile(r"[\s@._\-/,]+")
+
+_trigram_support: Dict[str, bool] = {}
+
+
+def _normalize(value: str) -> str:
+    return value.strip().lower()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def has_trigram_support(db: Session) -> bool:
+    """True when the session is bound to PostgreSQL with pg_trgm installed."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    key = str(bind.url)
+    if key not in _trigram_support:
+        _trigram_support[key] = db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first() is not None
+    return _trigram_support[key]
+
+
+# ---------------------------------------------------------------------------
+# In-process prefix index (fallback)
+# ---------------------------------------------------------------------------
+
+Loader = Callable[[Session], Iterable[Tuple[dict, Sequence[str]]]]
+
+
+class PrefixIndex:
+    """Sorted token list answering ranked prefix lookups.
+
+    ``loader`` yields ``(row, values)`` pairs: ``row`` is the dict returned to
+    callers and ``values`` are the strings to index, most important first.
+    Each value is indexed whole and word by word, so "bob@example.com" is
+    found by "bob", "example" or the full address.
+    """
+
+    def __init__(self, loader: Loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._tokens: List[Tuple[str, int, int, int]] = []
+        self._rows: Dict[int, dict] = {}
+        self._generation = 0
+        self._built_generation = -1
+        self._built_at = 0.0
+
+    def invalidate(self):
+        self._generation += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._built_generation == self._generation
+            and time.monotonic() - self._built_at < PREFIX_INDEX_TTL_SECONDS
+        )
+
+    def _ensure_built(self, db: Session):
+        if self._is_fresh():
+            return
+        with self._lock:
+            if self._is_fresh():
+                return
+            generation = self._generation
+            rows: Dict[int, dict] = {}
+            tokens: List[Tuple[str, int, int, int]] = []
+            for row, values in self._loader(db):
+                rows[row["id"]] = row
+                for priority, value in enumerate(values):
+                    if not value:
+                        continue
+                    whole = _normalize(value)
+                    tokens.append((whole, 0, priority, row["id"]))
+                    for word in _TOKEN_SPLIT.split(whole):
+                        if word and word != whole:
+                            tokens.append((word, 1, priority, row["id"]))
+            tokens.sort()
+            self._tokens, self._rows = tokens, rows
+            self._built_generation = generation
+            self._built_at = time.monotonic()
+
+    def search(self, db: Session, query: str, limit: int) -> List[dict]:
+        self._ensure_built(db)
+        q = _normalize(query)
+        if not q:
+            return []
+        tokens, rows = self._tokens, self._rows
+
+        # Rank: exact match, then whole-value prefix, then word prefix; ties go
+        # to the higher-priority field and then the shorter value.
+        best: Dict[int, tuple] = {}
+        start = bisect.bisect_left(tokens, (q,))
+        for i in range(start, min(len(tokens), start + _MAX_SCAN)):
+            token, is_word, priority, row_id = tokens[i]
+            if not token.startswith(q):
+                break
+            score = (token != q, is_word, priority, len(token))
+            if row_id not in best or score < best[row_id]:
+                best[row_id] = score
+
+        ranked = sorted(best, key=lambda row_id: (best[row_id], row_id))[:limit]
+        return [rows[row_id] for row_id in ranked]
+
+
+def _load_users(db: Session):
+    stmt = select(Users.id, Users.email, Users.fullname, Users.role)
+    for row in db.execute(stmt):
+        yield dict(row._mapping), (row.email, row.fullname)
+
+
+def _load_assets(db: Session):
+    stmt = select(
+        Asset.id, Asset.name, Asset.registry_number,
+        Asset.type, Asset.status, Asset.parish,
+    )
+    for row in db.execute(stmt):
+        yield dict(row._mapping), (row.registry_number, row.name)
+
+
+users_index = PrefixIndex(_load_users)
+assets_index = PrefixIndex(_load_assets)
+
+
+# ---------------------------------------------------------------------------
+# Trigram queries (PostgreSQL)
+# ---------------------------------------------------------------------------
+
+def _trigram_search(db: Session, columns, fields, query: str, limit: int) -> List[dict]:
+    q = query.strip()
+    contains = f"%{_escape_like(q)}%"
+    prefix = f"{_escape_like(q)}%"
+    stmt = (
+        select(*columns)
+        .where(or_(*[f.ilike(contains, escape="\\") for f in fields]))
+        .order_by(
+            case((or_(*[f.ilike(prefix, escape="\\") for f in fields]), 0), else_=1),
+            func.greatest(*[func.similarity(f, q) for f in fields]).desc(),
+            columns[0],
+        )
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in db.execute(stmt)]
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def search_users(db: Session, query: str, limit: int = 10) -> List[dict]:
+    """Rank users whose email or full name matches ``query``."""
+    if has_trigram_support(db):
+        return _trigram_search(
+            db,
+            [Users.id, Users.email, Users.fullname, Users.role],
+            [Users.email, Users.fullname],
+            query, limit,
+        )
+    return users_index.search(db, query, limit)
+
+
+def search_assets(db: Session, query: str, limit: int = 10) -> List[dict]:
+    """Rank assets whose name or registry number matches ``query``."""
+    if has_trigram_support(db):
+        return _trigram_search(
+            db,
+            [Asset.id, Asset.name, Asset.registry_number, Asset.type, Asset.status, Asset.parish],
+            [Asset.registry_number, Asset.name],
+            query, limit,
+        )
+    return assets_index.search(db, query, limit)
+
+
+__all__ = [
+    "PrefixIndex", "users_index", "assets_index",
+    "has_trigram_support", "search_users", "search_assets",
+]
@@ -0,0 +1,205 @@
+"""
+Upcoming events: lease ends, equipment service and assets needing attention.
+
+Each kind of event is one indexed range query (lease ends on
+``rental_lease_end``, service on ``next_service_due``, attention on
+``status``) that already applies the page cursor and limit; the page is
+the merge of those short lists, so a page costs the same however many
+events exist.
+
+A daily job records an ``upcoming_digests`` row with the counts and the
+soonest events, and logs a SYSTEM_ALERT entry per non-empty kind the first
+time each day's digest is written. The dashboard reads today's row, or
+computes the digest on the fly until the job has recorded one.
+"""
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, String, case, cast, func, literal, literal_column, select, tuple_, type_coerce, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, split_page
+from app.database import SessionLocal
+from app.models.activity_log import ActivityEventType, ActivityLog, ActivityStatus
+from app.models.asset import Asset, AssetEquipment
+from app.models.upcoming_digest import UpcomingDigest
+from app.services.dashboard import ATTENTION_STATUSES
+
+UPCOMING_DIGEST_INTERVAL_SECONDS = float(os.getenv("UPCOMING_DIGEST_INTERVAL_SECONDS", "86400"))
+UPCOMING_WINDOW_DAYS = int(os.getenv("UPCOMING_WINDOW_DAYS", "30"))
+# Events stored with each digest
+DIGEST_EVENTS = 20
+
+KINDS = ("lease_end", "service_due", "attention")
+
+
+def _day(dialect: str, column):
+    if dialect == "sqlite":
+        return type_coerce(func.date(column), Date)
+    return cast(column, Date)
+
+
+def _branches(dialect: str, today: date, until: date) -> Dict[str, tuple]:
+    """Per kind: (select, date column, id column), each servable from one index."""
+    lease = select(
+        Asset.rental_lease_end.label("date"), literal_column("'lease_end'", String).label("kind"),
+        Asset.id.label("ref_id"), Asset.id.label("asset_id"), Asset.name.label("asset_name"),
+        Asset.rental_tenant_name.label("detail"),
+    ).where(
+        Asset.has_rental.is_(True),
+        Asset.rental_lease_end >= today,
+        Asset.rental_lease_end <= until,
+    )
+    # Overdue service has no lower bound
+    service = select(
+        AssetEquipment.next_service_due.label("date"), literal_column("'service_due'", String).label("kind"),
+        AssetEquipment.id.label("ref_id"), Asset.id.label("asset_id"), Asset.name.label("asset_name"),
+        AssetEquipment.name.label("detail"),
+    ).join(Asset, AssetEquipment.asset_id == Asset.id).where(AssetEquipment.next_service_due <= until)
+    since = _day(dialect, Asset.updated_at)
+    attention = select(
+        since.label("date"), literal_column("'attention'", String).label("kind"),
+        Asset.id.label("ref_id"), Asset.id.label("asset_id"), Asset.name.label("asset_name"),
+        case(*[(Asset.status == status, status.value) for status in ATTENTION_STATUSES]).label("detail"),
+    ).where(Asset.status.in_(ATTENTION_STATUSES))
+    return {
+        "lease_end": (lease, Asset.rental_lease_end, Asset.id),
+        "service_due": (service, AssetEquipment.next_service_due, AssetEquipment.id),
+        "attention": (attention, since, Asset.id),
+    }
+
+
+def _after(kind: str, day_column, id_column, cursor: Tuple[date, str, int]):
+    """Rows of ``kind`` that sort after ``cursor`` in (date, kind, ref_id) order."""
+    day, cursor_kind, ref_id = cursor
+    if kind > cursor_kind:
+        return day_column >= day
+    if kind < cursor_kind:
+        return day_column > day
+    return tuple_(day_column, id_column) > tuple_(literal(day, Date), literal(ref_id))
+
+
+def list_events(
+    db: Session,
+    kinds: Sequence[str] = KINDS,
+    days: int = UPCOMING_WINDOW_DAYS,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    today: Optional[date] = None,
+) -> Dict:
+    """One page of events, soonest (most overdue) first."""
+    today = today or datetime.utcnow().date()
+    branches = _branches(db.get_bind().dialect.name, today, today + timedelta(days=days))
+    after = decode_cursor(cursor, date, str, int) if cursor else None
+
+    parts = []
+    for kind in kinds:
+        stmt, day_column, id_column = branches[kind]
+        if after is not None:
+            stmt = stmt.where(_after(kind, day_column, id_column, after))
+        # Each branch contributes at most a page, read in index order
+        parts.append(select(stmt.order_by(day_column, id_column).limit(limit + 1).subquery()))
+    merged = union_all(*parts).subquery()
+    rows = db.execute(
+        select(merged).order_by(merged.c.date, merged.c.kind, merged.c.ref_id).limit(limit + 1)
+    ).all()
+
+    rows, next_cursor = split_page(rows, limit, lambda r: (r.date, r.kind, r.ref_id))
+    items = [
+        {**row._asdict(), "overdue": row.kind == "service_due" and row.date < today}
+        for row in rows
+    ]
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _counts(db: Session, today: date, until: date) -> Dict[str, int]:
+    return {
+        "leases_expiring": db.scalar(select(func.count(Asset.id)).where(
+            Asset.has_rental.is_(True), Asset.rental_lease_end >= today, Asset.rental_lease_end <= until,
+        )),
+        "service_overdue": db.scalar(select(func.count(AssetEquipment.id)).where(
+            AssetEquipment.next_service_due < today,
+        )),
+        "service_due": db.scalar(select(func.count(AssetEquipment.id)).where(
+            AssetEquipment.next_service_due >= today, AssetEquipment.next_service_due <= until,
+        )),
+        "assets_needing_attention": db.scalar(select(func.count(Asset.id)).where(
+            Asset.status.in_(ATTENTION_STATUSES),
+        )),
+    }
+
+
+def build_digest(db: Session, today: Optional[date] = None, window_days: int = UPCOMING_WINDOW_DAYS) -> Dict:
+    """The digest's values for ``today``, without storing them."""
+    today = today or datetime.utcnow().date()
+    events = list_events(db, days=window_days, limit=DIGEST_EVENTS, today=today)["items"]
+    return {
+        "day": today,
+        "window_days": window_days,
+        **_counts(db, today, today + timedelta(days=window_days)),
+        "events": [{**event, "date": event["date"].isoformat()} for event in events],
+    }
+
+
+_ALERTS = {
+    "leases_expiring": "{n} lease(s) end within {days} days",
+    "service_overdue": "{n} equipment item(s) overdue for service",
+    "service_due": "{n} equipment item(s) due for service within {days} days",
+    "assets_needing_attention": "{n} asset(s) under renovation or in maintenance",
+}
+
+
+def record_digest(db: Session, today: Optional[date] = None) -> UpcomingDigest:
+    """Store today's digest (commits); alerts are logged only when the day's row is new."""
+    values = build_digest(db, today)
+    digest = db.scalars(select(UpcomingDigest).where(UpcomingDigest.day == values["day"])).first()
+    created = digest is None
+    if created:
+        digest = UpcomingDigest(day=values["day"])
+        db.add(digest)
+    for name, value in values.items():
+        setattr(digest, name, value)
+    digest.recorded_at = datetime.utcnow()
+
+    if created:
+        for name, message in _ALERTS.items():
+            if values[name]:
+                db.add(ActivityLog(
+                    event_type=ActivityEventType.SYSTEM_ALERT,
+                    action=message.format(n=values[name], days=values["window_days"]),
+                    target="Upcoming events",
+                    status=ActivityStatus.WARNING,
+                ))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker recorded today's digest (and its alerts) first
+        db.rollback()
+        return db.scalars(select(UpcomingDigest).where(UpcomingDigest.day == values["day"])).one()
+    return digest
+
+
+def scheduled_digest():
+    """Entry point for the periodic job."""
+    db = SessionLocal()
+    try:
+        record_digest(db)
+    finally:
+        db.close()
+
+
+def latest_digest(db: Session, today: Optional[date] = None) -> Dict:
+    """Today's stored digest, or one computed now if today's is not stored yet."""
+    today = today or datetime.utcnow().date()
+    digest = db.scalars(select(UpcomingDigest).where(UpcomingDigest.day == today)).first()
+    if digest is None:
+        return {**build_digest(db, today), "recorded_at": datetime.utcnow()}
+    return digest
+
+
+__all__ = [
+    "UPCOMING_DIGEST_INTERVAL_SECONDS", "UPCOMING_WINDOW_DAYS", "KINDS",
+    "list_events", "build_digest", "record_digest", "scheduled_digest", "latest_digest",
+]
@@ -4,15 +4,47 @@ import sys
 # Add the current directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import api_router
+from app.core.middleware import ReadYourWritesMiddleware
+from app.core.security import WRITE_PIN_HEADER
+from app.core.scheduler import register_job, start_scheduler, stop_scheduler
+from app.core.workers import shutdown_process_pool
+from app.services import asset_summaries, dashboard_history, snapshots, upcoming
 import uvicorn
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    register_job("snapshots", snapshots.SNAPSHOT_INTERVAL_SECONDS, snapshots.scheduled_snapshot, run_at_start=True)
+    register_job(
+        "dashboard_history",
+        dashboard_history.DASHBOARD_SNAPSHOT_INTERVAL_SECONDS,
+        dashboard_history.scheduled_snapshot,
+    )
+    register_job(
+        "upcoming_digest", upcoming.UPCOMING_DIGEST_INTERVAL_SECONDS, upcoming.scheduled_digest, run_at_start=True,
+    )
+    register_job(
+        "asset_summary_year_reset",
+        asset_summaries.ASSET_SUMMARY_RESET_INTERVAL_SECONDS,
+        asset_summaries.scheduled_reset,
+    )
+    start_scheduler()
+    yield
+    await stop_scheduler()
+    # Stop background extraction workers without waiting on queued jobs
+    shutdown_process_pool(wait=False)
+
+
 app = FastAPI(
     title="Document Management System API",
     description="API for managing documents with Google Drive integration",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS - make it more flexible for different environments
@@ -23,8 +55,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read-your-writes pin, sent back by the client after a write
+    expose_headers=[WRITE_PIN_HEADER],
 )
 
+# Keep a user's reads on the primary right after their own writes
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
@@ -0,0 +1,35 @@
+import argparse
+
+from app.dependencies import get_drive_file_ops
+from app.core.workers import shutdown_process_pool
+from app.models.document_text import DocumentSource
+from app.services.extraction import backfill
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract text from existing documents for search")
+    parser.add_argument("--checkpoint", default="document_text_checkpoint.json",
+                        help="File recording the last processed id per source")
+    parser.add_argument("--source", choices=[s.value for s in DocumentSource],
+                        help="Only process one source (default: all)")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--reset", action="store_true", help="Ignore the existing checkpoint")
+    args = parser.parse_args()
+
+    sources = [DocumentSource(args.source)] if args.source else list(DocumentSource)
+    try:
+        for progress in backfill(
+            get_drive_file_ops(),
+            args.checkpoint,
+            sources=sources,
+            batch_size=args.batch_size,
+            reset=args.reset,
+        ):
+            print(f"{progress['source']}: up to id {progress['last_id']} "
+                  f"({progress['stored']}/{progress['scanned']} stored)")
+    finally:
+        shutdown_process_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Record query plans and timings for the listing endpoints' queries.
+
+Run it before and after a migration and diff the reports:
+
+    python -m scripts.benchmark_query_plans --seed --output before.json
+    alembic upgrade head
+    python -m scripts.benchmark_query_plans --output after.json
+
+``--seed`` fills an empty database with a synthetic dataset first. It refuses
+to touch a database that already has users, so point DATABASE_URL at a
+scratch database.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select
+
+from app.database import SessionLocal, engine
+from app.models import Files, Users, UserRole
+from app.models.activity_log import ActivityEventType, ActivityLog, ActivityStatus
+from app.models.asset import Asset, AssetStatus, AssetType, CostCategory, CostEvent
+
+_CHUNK = 5000
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def _insert_chunked(db, model, rows):
+    for start in range(0, len(rows), _CHUNK):
+        db.execute(insert(model), rows[start:start + _CHUNK])
+
+
+def seed(db, users: int, files_per_user: int, assets: int, cost_events: int, activity: int):
+    if db.scalar(select(func.count(Users.id))):
+        raise SystemExit("Refusing to seed: the users table is not empty")
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    def past(days: int) -> datetime:
+        return now - timedelta(seconds=rng.randint(0, days * 86400))
+
+    _insert_chunked(db, Users, [
+        {"email": f"user{i}@example.com", "fullname": f"User {i}",
+         "password": "not-a-real-hash", "role": UserRole.USER}
+        for i in range(users)
+    ])
+    user_ids = db.scalars(select(Users.id)).all()
+
+    _insert_chunked(db, Files, [
+        {"filename": f"document-{user_id}-{n}.pdf", "document_type": "Report",
+         "user_id": user_id, "uploaded_by": "admin@example.com", "created_at": past(730)}
+        for user_id in user_ids
+        for n in range(files_per_user)
+    ])
+
+    _insert_chunked(db, Asset, [
+        {"name": f"Asset {i}", "type": rng.choice(list(AssetType)),
+         "street": f"{i} Main Street", "parish": "Kingston", "country": "Jamaica",
+         "status": rng.choice(list(AssetStatus)), "has_mortgage": False, "has_rental": False,
+         "purchase_price": Decimal(rng.randint(10_000, 2_000_000)),
+         "created_at": past(1460), "updated_at": now}
+        for i in range(assets)
+    ])
+    asset_ids = db.scalars(select(Asset.id)).all()
+
+    _insert_chunked(db, CostEvent, [
+        {"asset_id": rng.choice(asset_ids), "date": past(1460).date(),
+         "category": rng.choice(list(CostCategory)), "description": "Synthetic cost",
+         "amount": Decimal(rng.randint(100, 50_000)), "created_at": now}
+        for _ in range(cost_events)
+    ])
+
+    _insert_chunked(db, ActivityLog, [
+        {"event_type": rng.choice(list(ActivityEventType)), "user_email": "admin@example.com",
+         "action": "Synthetic event", "target": "benchmark",
+         "status": ActivityStatus.INFO, "created_at": past(365)}
+        for _ in range(activity)
+    ])
+    db.commit()
+
+
+# ---------------------------------------------------------------------------
+# Queries, mirroring the endpoints that issue them
+# ---------------------------------------------------------------------------
+
+def build_queries(db) -> dict:
+    user = db.execute(select(Users.id, Users.email).order_by(Users.id)).first()
+    if user is None:
+        raise SystemExit("Database is empty; run with --seed against a scratch database")
+    filename = db.scalar(select(Files.filename).where(Files.user_id == user.id)) or "missing.pdf"
+    asset_id = db.scalar(select(CostEvent.asset_id)) or 0
+    today = date.today()
+
+    return {
+        "login lookup": select(Users).where(Users.email == user.email),
+        "documents, admin page": (
+            select(Files).order_by(Files.created_at.desc()).limit(5)
+        ),
+        "documents, user page": (
+            select(Files).where(Files.user_id == user.id)
+            .order_by(Files.created_at.desc()).limit(5)
+        ),
+        "documents, user count": (
+            select(func.count(Files.id)).where(Files.user_id == user.id)
+        ),
+        "upload duplicate check": (
+            select(Files.id).where(Files.filename == filename, Files.user_id == user.id)
+        ),
+        "activity feed": (
+            select(ActivityLog).order_by(ActivityLog.created_at.desc()).limit(50)
+        ),
+        "activity feed by type": (
+            select(ActivityLog).where(ActivityLog.event_type == ActivityEventType.COST_EVENT)
+            .order_by(ActivityLog.created_at.desc()).limit(50)
+        ),
+        "assets, newest page": (
+            select(Asset.id, Asset.name, Asset.status).order_by(Asset.created_at.desc(), Asset.id.desc())
+            .limit(101)
+        ),
+        "assets by status": (
+            select(Asset.id, Asset.name, Asset.status).where(Asset.status == AssetStatus.VACANT)
+            .order_by(Asset.created_at.desc(), Asset.id.desc()).limit(101)
+        ),
+        "asset cost history": (
+            select(CostEvent).where(CostEvent.asset_id == asset_id)
+            .order_by(CostEvent.date.desc())
+        ),
+        "cost events, last 90 days": (
+            select(CostEvent).join(Asset, CostEvent.asset_id == Asset.id)
+            .where(CostEvent.date >= today - timedelta(days=90), CostEvent.date <= today)
+            .order_by(CostEvent.date.desc())
+        ),
+    }
+
+
+def _explain(db, sql: str) -> str:
+    if engine.dialect.name == "postgresql":
+        rows = db.connection().exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {sql}").all()
+        return "\n".join(row[0] for row in rows)
+    if engine.dialect.name == "sqlite":
+        rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").all()
+        return "\n".join(row[-1] for row in rows)
+    return "(EXPLAIN not supported for this database)"
+
+
+def measure(db, name: str, stmt, repeat: int) -> dict:
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    db.execute(stmt).all()  # warm the cache before timing
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = db.execute(stmt).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "query": name,
+        "sql": sql,
+        "rows": len(rows),
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "plan": _explain(db, sql),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record query plans and timings for listing queries")
+    parser.add_argument("--seed", action="store_true",
+                        help="Fill an empty database with synthetic data first")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--files-per-user", type=int, default=100)
+    parser.add_argument("--assets", type=int, default=2000)
+    parser.add_argument("--cost-events", type=int, default=200_000)
+    parser.add_argument("--activity", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--output", default="query_plans.json", help="Where to write the report")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            seed(db, args.users, args.files_per_user, args.assets, args.cost_events, args.activity)
+
+        results = [
+            measure(db, name, stmt, args.repeat)
+            for name, stmt in build_queries(db).items()
+        ]
+    finally:
+        db.close()
+
+    report = {
+        "database": engine.dialect.name,
+        "recorded_at": datetime.utcnow().isoformat(),
+        "results": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+    width = max(len(r["query"]) for r in results)
+    for r in results:
+        print(f"{r['query']:<{width}}  median {r['median_ms']:>9.3f} ms  "
+              f"max {r['max_ms']:>9.3f} ms  rows {r['rows']}")
+    print(f"Plans written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Rebuild the stored asset detail documents from the asset tables.
+
+    python -m scripts.rebuild_asset_details               # every asset
+    python -m scripts.rebuild_asset_details --asset-id 7  # one asset
+
+Run once after upgrading to fill in documents for existing assets. The
+rebuild runs in one transaction, so readers see either the old documents
+or the new ones.
+"""
+import argparse
+
+from app.database import SessionLocal
+from app.services.asset_details import rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild stored asset detail documents")
+    parser.add_argument("--asset-id", type=int, help="Only rebuild this asset's document")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild(db, asset_id=args.asset_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    scope = f"asset {args.asset_id}" if args.asset_id is not None else "all assets"
+    print(f"Rebuilt {rows} detail documents for {scope}")
+
+
+if __name__ == "__main__":
+    main()
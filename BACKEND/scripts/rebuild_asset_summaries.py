@@ -0,0 +1,37 @@
+"""
+Recompute the asset summary columns from units, equipment, documents, the
+condition log and cost events.
+
+    python -m scripts.rebuild_asset_summaries               # every asset
+    python -m scripts.rebuild_asset_summaries --asset-id 7  # one asset
+
+Year-to-date costs are recomputed for the current year. The rebuild runs in
+one transaction, so readers see either the old values or the new ones.
+"""
+import argparse
+
+from app.database import SessionLocal
+from app.services.asset_summaries import rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute asset summary columns")
+    parser.add_argument("--asset-id", type=int, help="Only rebuild this asset's summary")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild(db, asset_id=args.asset_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    scope = f"asset {args.asset_id}" if args.asset_id is not None else "all assets"
+    print(f"Rebuilt summaries of {rows} assets ({scope})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Recompute the cost_rollups table from cost_events.
+
+    python -m scripts.rebuild_cost_rollups               # every asset
+    python -m scripts.rebuild_cost_rollups --asset-id 7  # one asset
+
+The rebuild runs in one transaction, so readers see either the old rows or
+the new ones.
+"""
+import argparse
+
+from app.database import SessionLocal
+from app.services.cost_rollups import rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute cost rollups from cost events")
+    parser.add_argument("--asset-id", type=int, help="Only rebuild this asset's rollups")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild(db, asset_id=args.asset_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    scope = f"asset {args.asset_id}" if args.asset_id is not None else "all assets"
+    print(f"Rebuilt {rows} rollup rows for {scope}")
+
+
+if __name__ == "__main__":
+    main()
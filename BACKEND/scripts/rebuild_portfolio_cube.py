@@ -0,0 +1,29 @@
+"""
+Recompute the portfolio_cube table behind the dashboard from assets.
+
+    python -m scripts.rebuild_portfolio_cube
+
+The rebuild runs in one transaction, so readers see either the old cells or
+the new ones. Running app workers keep serving cached stats until their
+cache entries expire.
+"""
+from app.database import SessionLocal
+from app.services.dashboard import rebuild_cube
+
+
+def main():
+    db = SessionLocal()
+    try:
+        cells = rebuild_cube(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"Rebuilt {cells} portfolio cube cells")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Re-score cost event history for anomalies.
+
+    python -m scripts.rescore_cost_anomalies                          # report only
+    python -m scripts.rescore_cost_anomalies --since 2026-01-01 --alert
+
+With ``--alert`` each anomaly is also written to the activity log as a
+SYSTEM_ALERT entry, as the cost routes do for new events.
+"""
+import argparse
+from datetime import date
+
+from app.analytics.anomalies import COST_ANOMALY_WINDOW_MONTHS, COST_ANOMALY_Z, Score, alert_entry, rescore
+from app.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score cost events for anomalies")
+    parser.add_argument("--asset-id", type=int, help="Only score this asset's events")
+    parser.add_argument("--since", type=date.fromisoformat, help="Only report events on or after this date")
+    parser.add_argument("--window-months", type=int, default=COST_ANOMALY_WINDOW_MONTHS)
+    parser.add_argument("--z", type=float, default=COST_ANOMALY_Z)
+    parser.add_argument("--alert", action="store_true", help="Write SYSTEM_ALERT activity entries")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = rescore(db, args.asset_id, since=args.since, window_months=args.window_months, z_threshold=args.z)
+        for anomaly in report["anomalies"]:
+            print(
+                f"{anomaly['date']}  {anomaly['asset_name']}  {anomaly['category'].value}  "
+                f"{anomaly['amount']}  mean {anomaly['window_mean']}  z {anomaly['z']}"
+            )
+            if args.alert:
+                score = Score(anomaly["window_events"], anomaly["window_mean"], anomaly["z"])
+                db.add(alert_entry(
+                    anomaly["asset_id"], anomaly["asset_name"], anomaly["category"], anomaly["amount"], score,
+                    args.window_months,
+                ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"Scored {report['scored']} events, {len(report['anomalies'])} anomalies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# Settings are read at import time; never point the tests at a real database
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models.base import Base
+
+
+@pytest.fixture
+def db():
+    """A session on a fresh in-memory SQLite database with every table."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
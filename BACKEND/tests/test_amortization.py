@@ -0,0 +1,53 @@
+import numpy as np
+
+from app.analytics.amortization import _balance_after, _months_to_payoff
+
+
+def _loop_balance(balance, payment, rate, months):
+    for _ in range(months):
+        balance = balance * (1 + rate) - payment
+    return balance
+
+
+def test_zero_rate_pays_off_linearly():
+    assert _months_to_payoff(np.array([1200.0]), np.array([100.0]), np.array([0.0]))[0] == 12
+    assert _months_to_payoff(np.array([1250.0]), np.array([100.0]), np.array([0.0]))[0] == 13
+    assert _balance_after(1200.0, 100.0, np.array(0.0), 6) == 600.0
+    assert _balance_after(1200.0, 100.0, np.array(0.0), 12) == 0.0
+
+
+def test_payment_not_covering_interest_never_pays_off():
+    balance = np.array([100000.0, 100000.0])
+    rate = np.array([0.01, 0.01])
+    # Below the monthly interest, and exactly equal to it
+    payoff = _months_to_payoff(balance, np.array([500.0, 1000.0]), rate)
+    assert np.isinf(payoff).all()
+    # The balance grows, or stays put, instead of falling
+    assert _balance_after(100000.0, 500.0, np.array(0.01), 12) > 100000.0
+    assert np.isclose(_balance_after(100000.0, 1000.0, np.array(0.01), 12), 100000.0)
+
+
+def test_annuity_payment_pays_off_in_its_term():
+    balance, rate, term = 250000.0, 0.08 / 12, 360
+    payment = balance * rate / (1 - (1 + rate) ** -term)
+    assert _months_to_payoff(np.array([balance]), np.array([payment]), np.array([rate]))[0] == term
+    assert abs(_balance_after(balance, payment, np.array(rate), term)) < 1e-6
+
+
+def test_balance_after_matches_stepping_month_by_month():
+    for rate in (0.0, 0.005, 0.02):
+        for months in (1, 7, 60):
+            expected = _loop_balance(50000.0, 900.0, rate, months)
+            assert np.isclose(_balance_after(50000.0, 900.0, np.array(rate), months), expected)
+
+
+def test_mixed_rates_are_handled_elementwise():
+    payoff = _months_to_payoff(
+        np.array([1200.0, 10000.0, 10000.0]),
+        np.array([100.0, 100.0, 200.0]),
+        np.array([0.0, 0.01, 0.01]),
+    )
+    assert payoff[0] == 12
+    assert np.isinf(payoff[1])
+    # The last payment is a partial one
+    assert payoff[2] == np.ceil(-np.log1p(-10000 * 0.01 / 200) / np.log1p(0.01))
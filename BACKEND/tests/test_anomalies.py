@@ -0,0 +1,105 @@
+import math
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.analytics import anomalies
+from app.analytics.anomalies import _z, rescore, score_cost
+from app.models.asset import Asset, AssetType, CostCategory, CostEvent
+from app.services import cost_rollups
+
+
+def test_z_is_nan_without_spread():
+    # Six zero-amount events: no mean to floor the spread at
+    mean, z = _z(100.0, 6.0, 0.0, 0.0)
+    assert mean == 0.0
+    assert math.isnan(z)
+    assert not anomalies.Score(6, float(mean), float(z)).is_anomaly
+
+
+def test_z_is_nan_for_an_empty_window():
+    _, z = _z(100.0, 0.0, 0.0, 0.0)
+    assert math.isnan(z)
+
+
+def test_z_floors_the_spread_at_a_share_of_the_mean():
+    # Six identical 100 bills: the spread is floored at 10% of the mean
+    mean, z = _z(np.array([100.0, 200.0]), 6.0, 600.0, 60000.0)
+    assert mean == 100.0
+    assert z[0] == 0.0
+    assert z[1] == pytest.approx(100.0 / (100.0 * anomalies.COST_ANOMALY_MIN_SPREAD))
+
+
+def test_z_uses_the_standard_deviation():
+    amounts = np.array([90.0, 110.0, 90.0, 110.0])
+    mean, z = _z(130.0, len(amounts), amounts.sum(), (amounts ** 2).sum())
+    assert mean == 100.0
+    assert z == pytest.approx(3.0)
+
+
+@pytest.fixture
+def asset_id(db):
+    asset = Asset(name="Harbour View", type=AssetType.RESIDENTIAL, street="1 Port Road", parish="Kingston")
+    db.add(asset)
+    db.flush()
+    return asset.id
+
+
+def _add(db, asset_id, day, amount, category=CostCategory.INSURANCE_PREMIUM):
+    event = CostEvent(asset_id=asset_id, date=day, category=category, amount=Decimal(amount), description="")
+    db.add(event)
+    db.flush()
+    cost_rollups.record_cost(db, asset_id, category, day, Decimal(amount))
+    return event.id
+
+
+def _windows(db, asset_id, window_months):
+    report = rescore(db, asset_id, window_months=window_months, z_threshold=-math.inf)
+    return {hit["cost_event_id"]: hit["window_events"] for hit in report["anomalies"]}
+
+
+def test_rescore_window_starts_on_the_first_of_its_first_month(db, asset_id, monkeypatch):
+    monkeypatch.setattr(anomalies, "COST_ANOMALY_MIN_EVENTS", 1)
+    _add(db, asset_id, date(2025, 1, 31), "100")
+    _add(db, asset_id, date(2025, 2, 1), "100")
+    _add(db, asset_id, date(2025, 3, 15), "100")
+    april = _add(db, asset_id, date(2025, 4, 30), "100")
+
+    # Three months back from April starts on 1 February, so 31 January is out
+    assert _windows(db, asset_id, window_months=3)[april] == 2
+    assert _windows(db, asset_id, window_months=4)[april] == 3
+
+
+def test_rescore_counts_only_earlier_events(db, asset_id, monkeypatch):
+    monkeypatch.setattr(anomalies, "COST_ANOMALY_MIN_EVENTS", 1)
+    first = _add(db, asset_id, date(2025, 5, 10), "100")
+    # Recorded later but dated earlier, and a same-day tie broken by id
+    earlier = _add(db, asset_id, date(2025, 5, 2), "100")
+    tie = _add(db, asset_id, date(2025, 5, 10), "100")
+    # Other categories are never in the window
+    _add(db, asset_id, date(2025, 5, 1), "100", CostCategory.PROPERTY_TAX)
+
+    windows = _windows(db, asset_id, window_months=12)
+    assert earlier not in windows  # nothing before it
+    assert windows[first] == 1
+    assert windows[tie] == 2
+
+
+def test_score_cost_matches_rescore(db, asset_id, monkeypatch):
+    monkeypatch.setattr(anomalies, "COST_ANOMALY_MIN_EVENTS", 1)
+    days = [date(2025, m, d) for m in (3, 4, 5) for d in (20, 5, 28, 12)]
+    ids = [_add(db, asset_id, day, str(100 + 13 * i % 40)) for i, day in enumerate(days)]
+    report = rescore(db, asset_id, window_months=2, z_threshold=-math.inf)
+    batch = {hit["cost_event_id"]: hit for hit in report["anomalies"]}
+
+    monkeypatch.setattr(anomalies, "COST_ANOMALY_WINDOW_MONTHS", 2)
+    for event_id in ids:
+        event = db.get(CostEvent, event_id)
+        score = score_cost(db, asset_id, event.category, event.date, event.amount, event.id)
+        if event_id in batch:
+            assert score.events == batch[event_id]["window_events"]
+            assert round(score.z, 2) == batch[event_id]["z"]
+        else:
+            assert score.events == 0
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+import numpy as np
+
+from app.analytics.cashflow import load_figures
+from app.models.asset import Asset, AssetStatus, AssetType, Unit
+
+
+def _asset(db, name, status=AssetStatus.OWNED, rental=None):
+    asset = Asset(
+        name=name, type=AssetType.RESIDENTIAL, street="1 Main Street", parish="Kingston", status=status,
+        has_rental=rental is not None, rental_monthly_income=rental,
+    )
+    db.add(asset)
+    db.flush()
+    return asset.id
+
+
+def _figures(db):
+    figures = load_figures(db)
+    return {asset_id: i for i, asset_id in enumerate(figures["asset_id"])}, figures
+
+
+def test_units_give_rent_roll_and_occupancy(db):
+    asset_id = _asset(db, "Block", rental=Decimal("5000"))
+    db.add_all([
+        Unit(asset_id=asset_id, name="1A", status=AssetStatus.TENANTED, monthly_rent=Decimal("1000")),
+        Unit(asset_id=asset_id, name="1B", status=AssetStatus.OWNED, monthly_rent=Decimal("800")),
+    ])
+    db.flush()
+
+    index, figures = _figures(db)
+    i = index[asset_id]
+    assert figures["units"][i] == 2
+    assert figures["let_units"][i] == 1
+    # The units replace the asset's own rental income
+    assert figures["rent_roll"][i] == 1800
+    assert figures["occupied_rent"][i] == 1000
+    assert figures["vacancy_loss"][i] == 800
+    assert figures["vacancy_rate"][i] == 0.5
+
+
+def test_assets_without_units_use_their_rental_income(db):
+    let = _asset(db, "Let house", rental=Decimal("1500"))
+    vacant = _asset(db, "Empty house", status=AssetStatus.VACANT, rental=Decimal("1200"))
+    no_rental = _asset(db, "Own use")
+
+    index, figures = _figures(db)
+    assert figures["units"][index[let]] == 0
+    assert figures["rent_roll"][index[let]] == 1500
+    assert figures["occupied_rent"][index[let]] == 1500
+    assert figures["vacancy_rate"][index[let]] == 0.0
+
+    assert figures["rent_roll"][index[vacant]] == 1200
+    assert figures["occupied_rent"][index[vacant]] == 0
+    assert figures["vacancy_rate"][index[vacant]] == 1.0
+
+    assert figures["rent_roll"][index[no_rental]] == 0
+    assert np.isnan(figures["vacancy_rate"][index[no_rental]])
+
+
+def test_disposed_assets_are_left_out(db):
+    kept = _asset(db, "Kept")
+    disposed = _asset(db, "Sold", status=AssetStatus.DISPOSED)
+
+    index, _ = _figures(db)
+    assert kept in index
+    assert disposed not in index
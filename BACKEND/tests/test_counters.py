@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.database.counters import increment
+from app.models.asset import AssetStatus, AssetType
+from app.models.portfolio_cube import PortfolioCell
+
+KEY = {"parish": "Kingston", "type": AssetType.RESIDENTIAL, "status": AssetStatus.OWNED, "owner": ""}
+
+
+def _add(db, count, value):
+    measures = {
+        "asset_count": count,
+        "portfolio_value": Decimal(value),
+        "mortgage_balance": Decimal("0"),
+        "rental_income": Decimal("0"),
+    }
+    increment(db, PortfolioCell, KEY, measures, "asset_count")
+
+
+def _cells(db):
+    return db.scalars(select(PortfolioCell)).all()
+
+
+def test_increment_inserts_then_adds(db):
+    _add(db, 1, "100")
+    _add(db, 1, "50")
+    [cell] = _cells(db)
+    assert cell.asset_count == 2
+    assert cell.portfolio_value == Decimal("150")
+
+
+def test_row_is_kept_while_the_count_is_positive(db):
+    _add(db, 2, "300")
+    _add(db, -1, "-100")
+    [cell] = _cells(db)
+    assert cell.asset_count == 1
+    assert cell.portfolio_value == Decimal("200")
+
+
+def test_row_is_deleted_when_the_count_reaches_zero(db):
+    _add(db, 1, "100")
+    _add(db, -1, "-100")
+    assert _cells(db) == []
+    # And comes back on the next increment
+    _add(db, 1, "40")
+    [cell] = _cells(db)
+    assert cell.asset_count == 1
+    assert cell.portfolio_value == Decimal("40")
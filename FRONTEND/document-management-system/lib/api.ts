@@ -191,12 +191,23 @@ api.interceptors.request.use((config) => {
   if (token) {
     config.headers.Authorization = `Bearer ${token}`
   }
+  // Send back the pin from our last write so our reads see it
+  const writePin = sessionStorage.getItem("readYourWritesPin")
+  if (writePin) {
+    config.headers["X-Read-Your-Writes"] = writePin
+  }
   return config
 })
 
 // Add response interceptor for error handling
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const writePin = response.headers["x-read-your-writes"]
+    if (writePin) {
+      sessionStorage.setItem("readYourWritesPin", writePin)
+    }
+    return response
+  },
   (error) => {
     // Handle authentication errors
     if (error.response && error.response.status === 401) {
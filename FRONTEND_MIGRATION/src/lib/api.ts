@@ -10,11 +10,18 @@ const client = axios.create({ baseURL: '/api' });
 client.interceptors.request.use((config) => {
   const token = localStorage.getItem('brims_token');
   if (token) config.headers.Authorization = `Bearer ${token}`;
+  // Send back the pin from our last write so our reads see it
+  const writePin = sessionStorage.getItem('readYourWritesPin');
+  if (writePin) config.headers['X-Read-Your-Writes'] = writePin;
   return config;
 });
 
 client.interceptors.response.use(
-  (res) => res,
+  (res) => {
+    const writePin = res.headers['x-read-your-writes'];
+    if (writePin) sessionStorage.setItem('readYourWritesPin', writePin);
+    return res;
+  },
   (err) => {
     if (err.response?.status === 401) {
       localStorage.removeItem('brims_token');
@@ -25,6 +32,13 @@ client.interceptors.response.use(
   }
 );
 
+// Cursor-paginated list responses
+type Page<T> = {
+  items: T[];
+  next_cursor: string | null;
+  total: number | null;
+};
+
 // ---------------------------------------------------------------------------
 // Field mapping helpers (API snake_case → frontend camelCase)
 // ---------------------------------------------------------------------------
@@ -53,6 +67,7 @@ export function mapAsset(d: any): Asset {
           lender: d.mortgage.lender,
           balance: d.mortgage.balance,
           monthlyPayment: d.mortgage.monthly_payment,
+          interestRate: d.mortgage.interest_rate ?? undefined,
         }
       : undefined,
     hasRental: d.has_rental,
@@ -145,9 +160,17 @@ export const users = {
 // ---------------------------------------------------------------------------
 
 export const assets = {
-  list: async (): Promise<Asset[]> => {
-    const res = await client.get('/assets/');
-    return res.data.map(mapAsset);
+  list: async (params?: { type?: string; status?: string; parish?: string; owner?: string; sort?: string; order?: 'asc' | 'desc' }): Promise<Asset[]> => {
+    // The endpoint is cursor-paginated; follow next_cursor to collect every asset.
+    const rows: Asset[] = [];
+    let cursor: string | null = null;
+    do {
+      const res = await client.get('/assets/', { params: { ...params, limit: 500, cursor: cursor ?? undefined } });
+      const page = res.data as Page<any>;
+      rows.push(...page.items.map(mapAsset));
+      cursor = page.next_cursor;
+    } while (cursor);
+    return rows;
   },
 
   get: async (id: string): Promise<Asset> => {
@@ -270,19 +293,29 @@ export const dashboard = {
 // Cost events (global)
 // ---------------------------------------------------------------------------
 
+type CostEventRow = {
+  id: number;
+  asset_id: number;
+  asset_name: string;
+  date: string;
+  category: string;
+  description: string;
+  amount: string;
+  created_at: string;
+};
+
 export const costEvents = {
   list: async (params?: { asset_id?: number; category?: string; start_date?: string; end_date?: string }) => {
-    const res = await client.get('/cost-events/', { params });
-    return res.data as Array<{
-      id: number;
-      asset_id: number;
-      asset_name: string;
-      date: string;
-      category: string;
-      description: string;
-      amount: string;
-      created_at: string;
-    }>;
+    // The endpoint is cursor-paginated; follow next_cursor to collect every event.
+    const rows: CostEventRow[] = [];
+    let cursor: string | null = null;
+    do {
+      const res = await client.get('/cost-events/', { params: { ...params, limit: 500, cursor: cursor ?? undefined } });
+      const page = res.data as Page<CostEventRow>;
+      rows.push(...page.items);
+      cursor = page.next_cursor;
+    } while (cursor);
+    return rows;
   },
 };
 
@@ -291,9 +324,9 @@ export const costEvents = {
 // ---------------------------------------------------------------------------
 
 export const activity = {
-  list: async (params?: { limit?: number; offset?: number; event_type?: string }) => {
+  list: async (params?: { limit?: number; cursor?: string; event_type?: string }) => {
     const res = await client.get('/activity-feed/', { params });
-    return res.data as Array<{
+    const page = res.data as Page<{
       id: number;
       event_type: string;
       user_email: string;
@@ -303,6 +336,7 @@ export const activity = {
       status: string;
       created_at: string;
     }>;
+    return page.items;
   },
 };
 
@@ -330,7 +364,12 @@ function buildAssetBody(data: Partial<Asset>) {
   if (data.hasMortgage !== undefined) body.has_mortgage = data.hasMortgage;
   if (data.mortgage !== undefined) {
     body.mortgage = data.mortgage
-      ? { lender: data.mortgage.lender, balance: data.mortgage.balance, monthly_payment: data.mortgage.monthlyPayment }
+      ? {
+          lender: data.mortgage.lender,
+          balance: data.mortgage.balance,
+          monthly_payment: data.mortgage.monthlyPayment,
+          interest_rate: data.mortgage.interestRate || null,
+        }
       : null;
   }
   if (data.hasRental !== undefined) body.has_rental = data.hasRental;
@@ -64,6 +64,7 @@ export interface Asset {
     lender: string;
     balance: string;
     monthlyPayment: string;
+    interestRate?: string;
   };
   hasRental: boolean;
   rental?: {